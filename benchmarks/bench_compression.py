@@ -0,0 +1,112 @@
+"""Compressão dos CSVs do data lake: tamanho, tempo de escrita/leitura e (opcional) upload S3.
+
+Para cada modo (none, gzip, zstd) grava as mesmas fixtures e jogadores pelos escritores do
+pipeline e mede bytes em disco, escrita, leitura com pandas e, com --s3, o envio. Tabelas
+CSV no Athena leem o objeto inteiro, então os bytes escaneados por consulta são os bytes
+do objeto no S3 (`athena_scan_kib`, listados do bucket depois do envio).
+
+Uso: python benchmarks/bench_compression.py [--items 20000] [--repeat 3] [--s3]
+     (--s3 usa S3_BUCKET_NAME + AWS_ENDPOINT_URL local, ver benchmarks/docker-compose.yml)
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+BENCH_DIR = Path(__file__).resolve().parent
+for path in (SRC_DIR, BENCH_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import pandas as pd
+
+from bench_parsing import make_fixtures, make_players
+from libs.batch_parsing import FixtureBatch, PlayerBatch
+from libs.utils import CSV_COMPRESSIONS, FixturePartitionStream, PlayersCSVStream, list_csv, open_csv
+
+S3_PREFIX = "benchmarks/compression/"
+
+
+def _best_of(func: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _uploader(compression: str):
+    from bench_pipeline import _ensure_bucket
+    from libs.storage import S3Uploader
+
+    uploader = S3Uploader(compression=compression)
+    _ensure_bucket(uploader.bucket_name)
+    return uploader
+
+
+def run(items: int = 20_000, repeat: int = 3, verbose: bool = True, s3: bool = False) -> Dict[str, float]:
+    fixture_batch = FixtureBatch.from_response(make_fixtures(items))
+    player_batch = PlayerBatch.from_response(make_players(items), "topscorers")
+
+    metrics: Dict[str, float] = {}
+    for mode, suffix in CSV_COMPRESSIONS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            seasons_dir = Path(tmp) / "seasons"
+            players_dir = Path(tmp) / "players"
+            seasons_dir.mkdir()
+            players_dir.mkdir()
+
+            def write() -> None:
+                with FixturePartitionStream(str(seasons_dir), compression=mode) as writer:
+                    writer.write_batch(fixture_batch)
+                with PlayersCSVStream(str(players_dir / f"top_scorers_league_71_season_2024.csv{suffix}")) as writer:
+                    writer.write_batch(player_batch)
+
+            metrics[f"compression.{mode}.write_ms"] = _best_of(write, repeat) * 1000
+            files = list_csv(seasons_dir, "*") + list_csv(players_dir, "*")
+
+            def read() -> None:
+                for csv_file in files:
+                    with open_csv(csv_file) as f:
+                        pd.read_csv(f)
+
+            metrics[f"compression.{mode}.read_ms"] = _best_of(read, repeat) * 1000
+            metrics[f"compression.{mode}.size_kib"] = sum(csv_file.stat().st_size for csv_file in files) / 1024
+
+            if s3:
+                uploader = _uploader(mode)
+                prefix = f"{S3_PREFIX}{mode}/"
+
+                def upload() -> None:
+                    for csv_file in files:
+                        uploader.upload_file(csv_file, uploader.csv_key(prefix, csv_file))
+
+                metrics[f"compression.{mode}.upload_ms"] = _best_of(upload, repeat) * 1000
+                metrics[f"compression.{mode}.athena_scan_kib"] = sum(uploader.list_objects(prefix).values()) / 1024
+
+    baseline = metrics["compression.none.size_kib"]
+    for mode in CSV_COMPRESSIONS:
+        metrics[f"compression.{mode}.ratio"] = baseline / metrics[f"compression.{mode}.size_kib"]
+    if verbose:
+        for name, value in metrics.items():
+            print(f"{name:<36} {value:>10.1f}")
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--s3", action="store_true", help="mede o upload (S3_BUCKET_NAME + AWS_ENDPOINT_URL)")
+    args = parser.parse_args()
+    print(f"{args.items} itens, melhor de {args.repeat} execuções")
+    run(args.items, args.repeat, s3=args.s3)
+
+
+if __name__ == "__main__":
+    main()
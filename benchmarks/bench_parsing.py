@@ -0,0 +1,155 @@
+"""Benchmark do parsing JSON → CSV/Parquet: modelos pydantic por item vs. lotes em colunas.
+
+Uso: python benchmarks/bench_parsing.py [--items 20000] [--repeat 5]
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pyarrow as pa
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from libs.api_football import MatchResultsService, TopScorersService
+from libs.batch_parsing import FixtureBatch, PlayerBatch
+from libs.utils import FIXTURE_FIELDNAMES, PLAYER_FIELDNAMES, CSVWriter, fixture_to_row
+
+
+def make_fixtures(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "fixture": {"id": 1_000_000 + i, "date": "2024-04-14T19:00:00+00:00", "status": {"short": "FT"}},
+            "league": {"id": 71, "name": "Serie A", "season": 2024},
+            "teams": {"home": {"id": i % 20, "name": f"Time {i % 20}"}, "away": {"id": (i + 7) % 20, "name": f"Time {(i + 7) % 20}"}},
+            "score": {"fulltime": {"home": i % 4, "away": i % 3}},
+        }
+        for i in range(count)
+    ]
+
+
+def make_players(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "player": {"id": 50_000 + i, "name": f"Jogador {i}"},
+            "statistics": [{
+                "team": {"id": i % 20, "name": f"Time {i % 20}"},
+                "games": {"appearences": 30, "minutes": 2500},
+                "goals": {"total": i % 25, "assists": i % 11},
+                "shots": {"total": 40},
+            }],
+        }
+        for i in range(count)
+    ]
+
+
+def fixtures_pydantic_csv(raw: Dict[str, Any]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIXTURE_FIELDNAMES)
+    writer.writeheader()
+    for result in MatchResultsService(None, batch_parsing=False)._parse_page(raw):
+        writer.writerow(fixture_to_row(result))
+    return out.getvalue()
+
+
+def fixtures_batch_csv(raw: Dict[str, Any]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(FIXTURE_FIELDNAMES)
+    writer.writerows(FixtureBatch.from_response(raw["response"]).filter_valid().rows(FIXTURE_FIELDNAMES))
+    return out.getvalue()
+
+
+def fixtures_pydantic_arrow(raw: Dict[str, Any]) -> pa.Table:
+    rows = [fixture_to_row(result) for result in MatchResultsService(None, batch_parsing=False)._parse_page(raw)]
+    return pa.Table.from_pylist(rows)
+
+
+def fixtures_batch_arrow(raw: Dict[str, Any]) -> pa.Table:
+    table, valid = FixtureBatch.from_response(raw["response"]).to_arrow()
+    return table.filter(valid)
+
+
+def players_pydantic_csv(raw: Dict[str, Any]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=PLAYER_FIELDNAMES)
+    writer.writeheader()
+    for player in TopScorersService(None, batch_parsing=False)._parse_page(raw, 71, 2024):
+        row = CSVWriter._model_to_dict(player)
+        row.pop("league_id", None)
+        row.pop("season", None)
+        writer.writerow(row)
+    return out.getvalue()
+
+
+def players_batch_csv(raw: Dict[str, Any]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(PLAYER_FIELDNAMES)
+    writer.writerows(PlayerBatch.from_response(raw["response"], "topscorers").filter_valid().rows(PLAYER_FIELDNAMES))
+    return out.getvalue()
+
+
+def measure(func: Callable[[Dict[str, Any]], Any], raw: Dict[str, Any], repeat: int) -> tuple[float, int]:
+    """Retorna (melhor tempo em s, pico de memória alocada em bytes)."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(raw)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(items: int = 20_000, repeat: int = 5, verbose: bool = True) -> Dict[str, float]:
+    """Executa os casos e retorna as métricas (tempos em ms, picos em KiB)."""
+    fixtures = {"response": make_fixtures(items)}
+    players = {"response": make_players(items)}
+    cases = [
+        ("fixtures_csv", fixtures, fixtures_pydantic_csv, fixtures_batch_csv),
+        ("fixtures_arrow", fixtures, fixtures_pydantic_arrow, fixtures_batch_arrow),
+        ("players_csv", players, players_pydantic_csv, players_batch_csv),
+    ]
+
+    # Os dois caminhos precisam gerar exatamente o mesmo CSV
+    assert fixtures_pydantic_csv(fixtures) == fixtures_batch_csv(fixtures)
+    assert players_pydantic_csv(players) == players_batch_csv(players)
+
+    metrics: Dict[str, float] = {}
+    if verbose:
+        print(f"{items} itens, melhor de {repeat} execuções")
+        print(f"{'caso':<18} {'caminho':<9} {'tempo (ms)':>11} {'pico (KiB)':>11} {'speedup':>8}")
+    for name, raw, pydantic_func, batch_func in cases:
+        base_time, base_peak = measure(pydantic_func, raw, repeat)
+        batch_time, batch_peak = measure(batch_func, raw, repeat)
+        metrics[f"parsing.{name}.pydantic_ms"] = base_time * 1000
+        metrics[f"parsing.{name}.batch_ms"] = batch_time * 1000
+        metrics[f"parsing.{name}.pydantic_peak_kib"] = base_peak / 1024
+        metrics[f"parsing.{name}.batch_peak_kib"] = batch_peak / 1024
+        if verbose:
+            print(f"{name:<18} {'pydantic':<9} {base_time * 1000:>11.1f} {base_peak / 1024:>11.0f} {'':>8}")
+            print(f"{name:<18} {'batch':<9} {batch_time * 1000:>11.1f} {batch_peak / 1024:>11.0f} {base_time / batch_time:>7.1f}x")
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
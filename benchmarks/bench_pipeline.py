@@ -0,0 +1,148 @@
+"""Throughput ponta a ponta de APIFootballExtractionPipeline.run contra o stub local.
+
+A extração fala com benchmarks/stub_server.py; S3 e PostgreSQL são opcionais e devem
+apontar para instâncias locais (ver benchmarks/docker-compose.yml):
+
+    docker compose -f benchmarks/docker-compose.yml up -d
+    AWS_ENDPOINT_URL=http://localhost:9000 AWS_ACCESS_KEY_ID=minio AWS_SECRET_ACCESS_KEY=minio123 \\
+    S3_BUCKET_NAME=bench DB_HOST=localhost DB_USER=bench DB_NAME=bench DB_PASSWORD=bench \\
+    python benchmarks/bench_pipeline.py --async --s3 --postgres
+
+Toda a saída vai para um diretório temporário (PIPELINE_DATA_DIR); data/ não é tocado.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+BENCH_DIR = Path(__file__).resolve().parent
+for path in (SRC_DIR, BENCH_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from stub_server import StubConfig, start_stub_server
+
+
+def _ensure_bucket(bucket_name: str) -> None:
+    import boto3
+    from botocore.exceptions import ClientError
+
+    s3_client = boto3.client("s3")
+    try:
+        s3_client.head_bucket(Bucket=bucket_name)
+    except ClientError:
+        s3_client.create_bucket(Bucket=bucket_name)
+
+
+def _count_rows(data_dir: Path) -> int:
+    from libs.utils import CSV_EXTENSIONS, open_csv
+
+    rows = 0
+    for csv_file in (data_dir / "sport").rglob("*.csv*"):
+        if not csv_file.name.endswith(CSV_EXTENSIONS):
+            continue
+        with open_csv(csv_file) as f:
+            rows += max(0, sum(1 for _ in f) - 1)
+    return rows
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    config = StubConfig(
+        latency=args.latency_ms / 1000,
+        rate_limit_every=args.rate_limit_every,
+        fixtures_per_season=args.fixtures_per_season,
+        player_pages=args.player_pages,
+    )
+    server, base_url = start_stub_server(config)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        (data_dir / "sport").mkdir(parents=True)
+        # Precisa valer antes do import de libs (DATA_DIR e defaults são lidos no import)
+        os.environ.update({
+            "PIPELINE_DATA_DIR": str(data_dir),
+            "API_FOOTBALL_KEY": os.getenv("API_FOOTBALL_KEY") or "benchmark",
+            "API_FOOTBALL_ALLOW_CUSTOM_BASE_URL": "1",
+            "API_FOOTBALL_RATE_LIMIT_DB": str(Path(tmp) / "rate_limit.sqlite"),
+            "API_FOOTBALL_CACHE_DIR": str(Path(tmp) / "cache"),
+        })
+        os.environ.pop("API_FOOTBALL_DAILY_QUOTA", None)
+
+        from libs.api_football import APIFootballClient
+        from libs.metrics import METRICS
+        from libs.pipeline import APIFootballExtractionPipeline
+
+        if args.s3:
+            _ensure_bucket(os.environ["S3_BUCKET_NAME"])
+
+        client = APIFootballClient(
+            base_url=base_url,
+            requests_per_minute=args.requests_per_minute,
+            enable_cache=False,
+        )
+        pipeline = APIFootballExtractionPipeline(
+            client=client,
+            data_dir=data_dir,
+            enable_s3=args.s3,
+            enable_postgres=args.postgres,
+            enable_glue=False,
+            async_extraction=args.async_extraction,
+            max_concurrency=args.max_concurrency,
+            enable_parquet=args.parquet,
+            csv_compression=args.csv_compression,
+        )
+
+        started = time.perf_counter()
+        pipeline.run()
+        elapsed = time.perf_counter() - started
+        rows = _count_rows(data_dir)
+        sleep_seconds = METRICS.sleep_seconds
+
+    server.shutdown()
+    mode = "async" if args.async_extraction else "sync"
+    return {
+        f"e2e.{mode}.wall_s": elapsed,
+        f"e2e.{mode}.rows": rows,
+        f"e2e.{mode}.rows_per_s": rows / elapsed if elapsed else 0.0,
+        f"e2e.{mode}.requests": config.stats["requests"],
+        f"e2e.{mode}.responses_429": config.stats["429"],
+        f"e2e.{mode}.response_mib": config.stats["bytes"] / 1024 / 1024,
+        f"e2e.{mode}.rate_limit_sleep_s": sleep_seconds,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--fixtures-per-season", type=int, default=380)
+    parser.add_argument("--player-pages", type=int, default=1)
+    parser.add_argument("--requests-per-minute", type=int, default=6000)
+    parser.add_argument("--async", dest="async_extraction", action="store_true")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--parquet", action="store_true")
+    parser.add_argument("--csv-compression", choices=["none", "gzip", "zstd"], default=None)
+    parser.add_argument("--s3", action="store_true", help="usa S3_BUCKET_NAME (+ AWS_ENDPOINT_URL local)")
+    parser.add_argument("--postgres", action="store_true", help="usa DB_HOST/DB_USER/DB_NAME/DB_PASSWORD")
+    parser.add_argument("--json", action="store_true", help="imprime só as métricas em JSON")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    metrics = run(args)
+    if args.json:
+        print(json.dumps(metrics))
+        return
+    for name, value in metrics.items():
+        print(f"{name:<28} {value:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Inicialização a frio da CLI (main.py): imports de cada subcomando medidos com -X importtime.
+
+Cada caso roda em um processo novo e soma o tempo cumulativo dos módulos de topo que o
+-X importtime lista; os backends pesados carregados (boto3, psycopg2...) são mostrados
+para conferir que cada subcomando só importa a própria etapa.
+
+Uso: python benchmarks/bench_startup.py [--repeat 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Set
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MAIN = PROJECT_ROOT / "main.py"
+
+CASES = {
+    "startup.help_ms": ["--help"],
+    "startup.report_ms": ["report"],
+    "startup.extract_dry_run_ms": ["extract", "--dry-run"],
+}
+BACKENDS = ("aiohttp", "boto3", "psycopg2", "pandas", "pyarrow", "requests", "pydantic", "tqdm")
+
+
+def _import_profile(args: List[str], env: Dict[str, str]) -> tuple[float, Set[str]]:
+    """(ms somados dos imports de topo, backends importados) de uma execução de main.py."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(MAIN), *args],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # cabeçalho
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, {backend for backend in BACKENDS if backend in modules}
+
+
+def run(repeat: int = 3, verbose: bool = True) -> Dict[str, float]:
+    metrics: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Saída e estado em diretório temporário; o .env do projeto não sobrescreve estas variáveis
+        env = {
+            **os.environ,
+            "PIPELINE_DATA_DIR": str(Path(tmp) / "data"),
+            "PIPELINE_METRICS_DIR": str(Path(tmp) / "metrics"),
+            "PIPELINE_JOURNAL_DB": str(Path(tmp) / "journal.sqlite"),
+            "ENTITY_STORE_DB": str(Path(tmp) / "entities.sqlite"),
+            "API_FOOTBALL_KEY": os.getenv("API_FOOTBALL_KEY") or "benchmark",
+            "API_FOOTBALL_RATE_LIMIT_DB": str(Path(tmp) / "rate_limit.sqlite"),
+            "API_FOOTBALL_CACHE_DIR": str(Path(tmp) / "cache"),
+        }
+        for name, args in CASES.items():
+            runs = [_import_profile(args, env) for _ in range(repeat)]
+            metrics[name] = min(elapsed for elapsed, _ in runs)
+            if verbose:
+                backends = ", ".join(sorted(runs[0][1])) or "-"
+                print(f"{name:<30} {metrics[name]:>8.1f} ms  ({backends})")
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
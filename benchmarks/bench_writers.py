@@ -0,0 +1,101 @@
+"""Microbenchmarks dos escritores: streams CSV (por item vs. em lote) e conversão Parquet.
+
+Uso: python benchmarks/bench_writers.py [--items 20000] [--repeat 3]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+BENCH_DIR = Path(__file__).resolve().parent
+for path in (SRC_DIR, BENCH_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from bench_parsing import make_fixtures, make_players
+from libs.api_football import MatchResultsService, TopScorersService
+from libs.batch_parsing import FixtureBatch, PlayerBatch
+from libs.parquet_writer import ParquetWriter
+from libs.utils import FixturePartitionStream, PlayersCSVStream
+
+
+def _best_of(func: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(items: int = 20_000, repeat: int = 3, verbose: bool = True) -> Dict[str, float]:
+    """Mede só a escrita: os itens já chegam parseados (modelos ou lotes)."""
+    fixtures_raw = {"response": make_fixtures(items)}
+    players_raw = {"response": make_players(items)}
+    fixture_models = list(MatchResultsService(None, batch_parsing=False)._parse_page(fixtures_raw))
+    player_models = list(TopScorersService(None, batch_parsing=False)._parse_page(players_raw, 71, 2024))
+    fixture_batch = FixtureBatch.from_response(fixtures_raw["response"])
+    player_batch = PlayerBatch.from_response(players_raw["response"], "topscorers")
+
+    metrics: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        seasons_dir = data_dir / "sport" / "seasons"
+        players_dir = data_dir / "sport" / "players"
+        seasons_dir.mkdir(parents=True)
+        players_dir.mkdir(parents=True)
+        players_csv = players_dir / "top_scorers_league_71_season_2024.csv"
+
+        def fixtures_per_item() -> None:
+            with FixturePartitionStream(str(seasons_dir)) as writer:
+                for result in fixture_models:
+                    writer.write(result)
+
+        def fixtures_batch() -> None:
+            with FixturePartitionStream(str(seasons_dir)) as writer:
+                writer.write_batch(fixture_batch)
+
+        def players_per_item() -> None:
+            with PlayersCSVStream(str(players_csv)) as writer:
+                for player in player_models:
+                    writer.write(player)
+
+        def players_batch() -> None:
+            with PlayersCSVStream(str(players_csv)) as writer:
+                writer.write_batch(player_batch)
+
+        def parquet() -> None:
+            # Força a reconversão: o ParquetWriter pula partições atualizadas
+            for parquet_file in (data_dir / "sport" / "parquet").rglob("*.parquet"):
+                parquet_file.unlink()
+            ParquetWriter.convert_sport_data(data_dir)
+
+        cases = {
+            "writers.fixtures_csv.per_item_ms": fixtures_per_item,
+            "writers.fixtures_csv.batch_ms": fixtures_batch,
+            "writers.players_csv.per_item_ms": players_per_item,
+            "writers.players_csv.batch_ms": players_batch,
+            "writers.parquet_convert_ms": parquet,
+        }
+        for name, func in cases.items():
+            metrics[name] = _best_of(func, repeat) * 1000
+            if verbose:
+                print(f"{name:<36} {metrics[name]:>10.1f} ms")
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{args.items} itens, melhor de {args.repeat} execuções")
+    run(args.items, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
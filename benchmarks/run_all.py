@@ -0,0 +1,121 @@
+"""Executa a suíte de benchmarks e registra os resultados para acompanhar regressões.
+
+Cada execução é anexada a benchmarks/results/history.jsonl (commit, data, métricas) e
+comparada com a anterior; métricas de tempo que pioram além da tolerância são listadas.
+
+Uso: python benchmarks/run_all.py [--quick] [--e2e-args "--async --postgres"] [--fail-on-regression]
+"""
+import argparse
+import json
+import platform
+import shlex
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+RESULTS_FILE = BENCH_DIR / "results" / "history.jsonl"
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import bench_compression
+import bench_parsing
+import bench_startup
+import bench_writers
+
+# Métricas onde maior é pior (tempos e memória)
+LOWER_IS_BETTER = ("_ms", "_s", "_kib")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_e2e(extra_args: str) -> Dict[str, float]:
+    """Roda o benchmark ponta a ponta em um processo separado (o ambiente é lido no import de libs)."""
+    result = subprocess.run(
+        [sys.executable, str(BENCH_DIR / "bench_pipeline.py"), "--json", *shlex.split(extra_args)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _previous_entry() -> Optional[Dict[str, Any]]:
+    if not RESULTS_FILE.exists():
+        return None
+    lines = [line for line in RESULTS_FILE.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def compare(previous: Dict[str, float], current: Dict[str, float], tolerance: float) -> list[str]:
+    """Lista as métricas de tempo/memória que pioraram mais que a tolerância (ex.: 0.10 = 10%)."""
+    regressions = []
+    for name, value in current.items():
+        before = previous.get(name)
+        if not before or not name.endswith(LOWER_IS_BETTER):
+            continue
+        change = (value - before) / before
+        if change > tolerance:
+            regressions.append(f"{name}: {before:.2f} -> {value:.2f} (+{change:.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="menos itens e repetições")
+    parser.add_argument("--e2e-args", default="", help="argumentos repassados a bench_pipeline.py")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--no-save", action="store_true", help="não grava em results/history.jsonl")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    items, repeat = (2_000, 2) if args.quick else (20_000, 5)
+    metrics: Dict[str, float] = {}
+    metrics.update(bench_parsing.run(items, repeat, verbose=False))
+    metrics.update(bench_writers.run(items, max(1, repeat - 2), verbose=False))
+    metrics.update(bench_compression.run(items, max(1, repeat - 2), verbose=False))
+    metrics.update(bench_startup.run(max(1, repeat - 2), verbose=False))
+    if not args.skip_e2e:
+        metrics.update(_run_e2e(args.e2e_args))
+
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "items": items,
+        "e2e_args": args.e2e_args,
+        "metrics": metrics,
+    }
+    previous = _previous_entry()
+
+    for name, value in metrics.items():
+        print(f"{name:<44} {value:>12.2f}")
+
+    regressions = []
+    if previous and previous.get("items") == items and previous.get("e2e_args") == args.e2e_args:
+        regressions = compare(previous["metrics"], metrics, args.tolerance)
+        print(f"\nComparado com {previous.get('commit')} ({previous.get('timestamp')}):")
+        print("\n".join(f"  REGRESSÃO {line}" for line in regressions) or "  sem regressões")
+
+    if not args.no_save:
+        RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"\nResultados anexados em {RESULTS_FILE.relative_to(PROJECT_ROOT)}")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""Servidor local que imita a API-Football para benchmarks e testes de carga.
+
+Gera payloads sintéticos no formato real (fixtures, fixtures?ids= com detalhes,
+players/topscorers, players/topassists),
+escaláveis por liga/temporada, com latência configurável e respostas 429 periódicas.
+
+Uso standalone: python benchmarks/stub_server.py --port 8765 --latency-ms 50 --rate-limit-every 25
+Em seguida: API_FOOTBALL_BASE_URL=http://127.0.0.1:8765/ API_FOOTBALL_ALLOW_CUSTOM_BASE_URL=1
+"""
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.0             # segundos por requisição
+    rate_limit_every: int = 0        # a cada N requisições responde 429 (0 = nunca)
+    retry_after: int = 1             # valor do header Retry-After nos 429
+    fixtures_per_season: int = 380   # 20 times, turno e returno
+    players_per_page: int = 20
+    player_pages: int = 1
+    squad_pages: int = 10            # páginas do endpoint players (elenco completo)
+    daily_limit: int = 7500
+    stats: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _fixture(fixture_id: int, league: int, season: int, index: int) -> Dict[str, Any]:
+    home = index % 20
+    away = (index * 7 + 3) % 20
+    return {
+        "fixture": {
+            "id": fixture_id,
+            "referee": "Árbitro Sintético",
+            "timezone": "UTC",
+            "date": f"{season}-{4 + index % 8:02d}-{1 + index % 28:02d}T19:00:00+00:00",
+            "timestamp": 1_700_000_000 + index * 3600,
+            "venue": {"id": 200 + home, "name": f"Estádio {home}", "city": "Cidade"},
+            "status": {"long": "Match Finished", "short": "FT", "elapsed": 90},
+        },
+        "league": {"id": league, "name": f"Liga {league}", "country": "Brazil", "season": season, "round": f"Regular Season - {1 + index // 10}"},
+        "teams": {
+            "home": {"id": 100 + home, "name": f"Time {home}", "logo": "", "winner": index % 3 == 0},
+            "away": {"id": 100 + away, "name": f"Time {away}", "logo": "", "winner": index % 3 == 1},
+        },
+        "goals": {"home": index % 4, "away": index % 3},
+        "score": {
+            "halftime": {"home": index % 2, "away": 0},
+            "fulltime": {"home": index % 4, "away": index % 3},
+            "extratime": {"home": None, "away": None},
+            "penalty": {"home": None, "away": None},
+        },
+    }
+
+
+def _fixture_details(fixture: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Estatísticas, eventos e escalações, como a API devolve em fixtures?ids=."""
+    teams = [fixture["teams"]["home"], fixture["teams"]["away"]]
+    statistics = [
+        {
+            "team": {"id": team["id"], "name": team["name"], "logo": ""},
+            "statistics": [
+                {"type": "Shots on Goal", "value": 3 + (index + side) % 5},
+                {"type": "Total Shots", "value": 10 + (index + side) % 7},
+                {"type": "Ball Possession", "value": f"{50 + (5 if side == 0 else -5)}%"},
+                {"type": "Yellow Cards", "value": None if index % 5 == 0 else 2},
+                {"type": "expected_goals", "value": f"{1 + (index % 10) / 10:.2f}"},
+            ],
+        }
+        for side, team in enumerate(teams)
+    ]
+    events = [
+        {
+            "time": {"elapsed": 10 + goal * 15, "extra": None},
+            "team": {"id": teams[goal % 2]["id"], "name": teams[goal % 2]["name"], "logo": ""},
+            "player": {"id": 5000 + goal, "name": f"Jogador {5000 + goal}"},
+            "assist": {"id": None, "name": None},
+            "type": "Goal",
+            "detail": "Normal Goal",
+            "comments": None,
+        }
+        for goal in range(fixture["goals"]["home"] + fixture["goals"]["away"])
+    ]
+    lineups = [
+        {
+            "team": {"id": team["id"], "name": team["name"], "logo": "", "colors": None},
+            "coach": {"id": 900 + team["id"], "name": f"Técnico {team['id']}", "photo": ""},
+            "formation": "4-3-3",
+            "startXI": [
+                {"player": {"id": team["id"] * 100 + number, "name": f"Jogador {team['id'] * 100 + number}",
+                            "number": number, "pos": "G" if number == 1 else "M", "grid": f"{1 + number // 4}:{1 + number % 4}"}}
+                for number in range(1, 12)
+            ],
+            "substitutes": [
+                {"player": {"id": team["id"] * 100 + number, "name": f"Jogador {team['id'] * 100 + number}",
+                            "number": number, "pos": "D", "grid": None}}
+                for number in range(12, 19)
+            ],
+        }
+        for team in teams
+    ]
+    return {**fixture, "events": events, "lineups": lineups, "statistics": statistics, "players": []}
+
+
+def _player(player_id: int, league: int, season: int, rank: int) -> Dict[str, Any]:
+    team = player_id % 20
+    return {
+        "player": {"id": player_id, "name": f"Jogador {player_id}", "age": 20 + rank % 15, "nationality": "Brazil"},
+        "statistics": [{
+            "team": {"id": 100 + team, "name": f"Time {team}"},
+            "league": {"id": league, "season": season},
+            "games": {"appearences": 38 - rank % 10, "minutes": 3000 - rank * 20, "position": "Attacker"},
+            "goals": {"total": max(0, 30 - rank), "assists": max(0, 15 - rank // 2)},
+            "shots": {"total": 80 - rank, "on": 40 - rank // 2},
+        }],
+    }
+
+
+def _squad_player(player_id: int, league: int, season: int, rank: int) -> Dict[str, Any]:
+    """Jogador do endpoint players: alguns trocaram de time ou também jogaram outra competição."""
+    item = _player(player_id, league, season, rank)
+    statistics = item["statistics"]
+    if player_id % 7 == 0:
+        transfer = (player_id + 5) % 20
+        statistics.append({**statistics[0], "team": {"id": 100 + transfer, "name": f"Time {transfer}"}})
+    if player_id % 11 == 0:
+        statistics.append({**statistics[0], "league": {"id": 13, "season": season}})
+    return item
+
+
+def build_payload(config: StubConfig, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+    league = int(params.get("league", 71))
+    season = int(params.get("season", 2024))
+    page = int(params.get("page", 1))
+    if path.endswith("fixtures"):
+        if "ids" in params:
+            ids = [int(value) for value in params["ids"].split("-") if value]
+            # ids gerados como league * 10_000_000 + season * 1000 + índice
+            response = [
+                _fixture_details(
+                    _fixture(fixture_id, fixture_id // 10_000_000, fixture_id % 10_000_000 // 1000, fixture_id % 1000),
+                    fixture_id % 1000,
+                )
+                for fixture_id in ids
+            ]
+        else:
+            base = league * 10_000_000 + season * 1000
+            response = [_fixture(base + index, league, season, index) for index in range(config.fixtures_per_season)]
+        paging = {"current": 1, "total": 1}
+    elif path.rstrip("/").endswith("teams"):
+        team_id = int(params.get("id", 100))
+        response = [{
+            "team": {"id": team_id, "name": f"Time {team_id - 100}", "code": f"T{team_id - 100:02d}",
+                     "country": "Brazil", "founded": 1900 + team_id % 100, "national": False},
+            "venue": {"id": 1000 + team_id, "name": f"Estádio {team_id - 100}", "city": "São Paulo", "capacity": 40000},
+        }]
+        paging = {"current": 1, "total": 1}
+    elif path.rstrip("/").endswith("profiles"):
+        player_id = int(params.get("player", 1))
+        response = [{"player": {"id": player_id, "name": f"Jogador {player_id}", "age": 25, "nationality": "Brazil"}}]
+        paging = {"current": 1, "total": 1}
+    elif path.rstrip("/").endswith("players"):
+        # Como na API real, a página seguinte às vezes repete o último jogador da anterior
+        offset = max(0, (page - 1) * config.players_per_page - 1)
+        response = [
+            _squad_player(league * 100_000 + offset + rank, league, season, offset + rank)
+            for rank in range(config.players_per_page)
+        ]
+        paging = {"current": page, "total": config.squad_pages}
+    else:
+        offset = (page - 1) * config.players_per_page
+        response = [
+            _player(league * 100_000 + offset + rank, league, season, offset + rank)
+            for rank in range(config.players_per_page)
+        ]
+        paging = {"current": page, "total": config.player_pages}
+    return {
+        "get": path.strip("/"),
+        "parameters": params,
+        "errors": [],
+        "results": len(response),
+        "paging": paging,
+        "response": response,
+    }
+
+
+def _make_handler(config: StubConfig) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            with config.lock:
+                config.stats["requests"] += 1
+                request_number = config.stats["requests"]
+            if config.latency:
+                time.sleep(config.latency)
+
+            if config.rate_limit_every and request_number % config.rate_limit_every == 0:
+                with config.lock:
+                    config.stats["429"] += 1
+                body = json.dumps({"message": "Too many requests"}).encode()
+                self.send_response(429)
+                self.send_header("Retry-After", str(config.retry_after))
+            else:
+                body = json.dumps(build_payload(config, url.path, params)).encode()
+                with config.lock:
+                    config.stats["bytes"] += len(body)
+                self.send_response(200)
+            remaining = max(0, config.daily_limit - request_number)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("x-ratelimit-requests-limit", str(config.daily_limit))
+            self.send_header("x-ratelimit-requests-remaining", str(remaining))
+            self.send_header("X-RateLimit-Limit", "6000")
+            self.send_header("X-RateLimit-Remaining", "5999")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def start_stub_server(config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Sobe o servidor em uma thread daemon; retorna (servidor, base_url)."""
+    config = config or StubConfig()
+    server = ThreadingHTTPServer((host, port), _make_handler(config))
+    server.daemon_threads = True
+    server.stub_config = config
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub local da API-Football")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--fixtures-per-season", type=int, default=380)
+    parser.add_argument("--player-pages", type=int, default=1)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency_ms / 1000,
+        rate_limit_every=args.rate_limit_every,
+        fixtures_per_season=args.fixtures_per_season,
+        player_pages=args.player_pages,
+    )
+    server, base_url = start_stub_server(config, port=args.port)
+    print(f"Stub da API-Football em {base_url} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,3 @@
-DROP TABLE IF EXISTS fixtures CASCADE;
-DROP TABLE IF EXISTS top_scorers CASCADE;
-DROP TABLE IF EXISTS top_assists CASCADE;
 CREATE TABLE IF NOT EXISTS fixtures (
     fixture_id INTEGER PRIMARY KEY,
     date TIMESTAMP,
@@ -12,7 +9,8 @@ CREATE TABLE IF NOT EXISTS fixtures (
     away_team_id INTEGER,
     away_team_name VARCHAR(255),
     fulltime_home INTEGER,
-    fulltime_away INTEGER
+    fulltime_away INTEGER,
+    status VARCHAR(10)
 );
 CREATE TABLE IF NOT EXISTS top_scorers (
     category VARCHAR(50),
@@ -44,10 +42,49 @@ CREATE TABLE IF NOT EXISTS top_assists (
     shots_total INTEGER,
     PRIMARY KEY (player_id, league_id, season)
 );
+-- Estatísticas de temporada de todos os jogadores (SquadStatsService)
+CREATE TABLE IF NOT EXISTS squad_stats (
+    category VARCHAR(50),
+    player_id INTEGER NOT NULL,
+    player_name VARCHAR(255),
+    team_id INTEGER NOT NULL,
+    team_name VARCHAR(255),
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    appearences INTEGER,
+    minutes INTEGER,
+    goals INTEGER,
+    assists INTEGER,
+    shots_total INTEGER,
+    PRIMARY KEY (player_id, team_id, league_id, season)
+);
+-- Bancos criados antes da coluna status
+ALTER TABLE fixtures ADD COLUMN IF NOT EXISTS status VARCHAR(10);
+-- Hash do conteúdo de cada partição carregada (carga incremental)
+CREATE TABLE IF NOT EXISTS load_manifest (
+    table_name VARCHAR(50) NOT NULL,
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    source_file VARCHAR(255),
+    content_hash CHAR(64) NOT NULL,
+    row_count INTEGER,
+    loaded_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (table_name, league_id, season)
+);
+-- Nomes de clube (normalizados) -> team_id da API-Football, do TeamIdentityIndex
+CREATE TABLE IF NOT EXISTS team_identity (
+    name_key VARCHAR(255) PRIMARY KEY,
+    team_id INTEGER NOT NULL,
+    team_name VARCHAR(255)
+);
 CREATE INDEX IF NOT EXISTS idx_fixtures_season ON fixtures(season);
 CREATE INDEX IF NOT EXISTS idx_fixtures_league ON fixtures(league_id);
 CREATE INDEX IF NOT EXISTS idx_fixtures_date ON fixtures(date);
 CREATE INDEX IF NOT EXISTS idx_scorers_goals ON top_scorers(goals DESC);
 CREATE INDEX IF NOT EXISTS idx_assists_assists ON top_assists(assists DESC);
 CREATE INDEX IF NOT EXISTS idx_scorers_season ON top_scorers(season);
-CREATE INDEX IF NOT EXISTS idx_assists_season ON top_assists(season);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_assists_season ON top_assists(season);
+CREATE INDEX IF NOT EXISTS idx_squad_team_season ON squad_stats(team_id, season);
+CREATE INDEX IF NOT EXISTS idx_fixtures_home_team ON fixtures(home_team_id);
+CREATE INDEX IF NOT EXISTS idx_fixtures_away_team ON fixtures(away_team_id);
+CREATE INDEX IF NOT EXISTS idx_team_identity_team ON team_identity(team_id);
\ No newline at end of file
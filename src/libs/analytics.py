@@ -0,0 +1,157 @@
+"""Consultas locais (DuckDB) sobre data/sport e data/financial, equivalentes às do Athena.
+
+Monta as mesmas tabelas do Glue Data Catalog (seasons, top_scorers, top_assists, squad_stats, *_parquet,
+transfers_typed, balances_typed), com as colunas de partição season/league, e executa
+data/sql/athena_views.sql para criar transfers_parsed/balances_parsed. Uma consulta
+exploratória roda em milissegundos, sem S3 nem Athena.
+
+Requer o extra `analytics` (duckdb).
+"""
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+
+from .financial import FinancialNormalizer
+from .parquet_writer import FIXTURES_SCHEMA, PLAYERS_SCHEMA, ParquetWriter
+from .utils import BASE_DIR, DATA_DIR, csv_stem, list_csv, setup_logger
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - dependência opcional
+    duckdb = None
+
+logger = setup_logger(__name__)
+
+ATHENA_VIEWS_SQL = Path(BASE_DIR) / "data" / "sql" / "athena_views.sql"
+PLAYER_TABLES = ("top_scorers", "top_assists", "squad_stats")
+
+# Como na tabela Glue `seasons`: date fica como string (ISO 8601 com fuso)
+FIXTURES_CSV_SCHEMA = FIXTURES_SCHEMA.set(
+    FIXTURES_SCHEMA.get_field_index("date"), pa.field("date", pa.string())
+)
+
+_FIXTURES_FILE = re.compile(r"season_(\d+)_league_(\d+)_results$")
+_PLAYERS_FILE = re.compile(r"(\w+?)_league_(\d+)_season_(\d+)$")
+
+
+def _with_partitions(table: pa.Table, partitions: Dict[str, int]) -> pa.Table:
+    for name, value in partitions.items():
+        table = table.append_column(name, pa.array([value] * table.num_rows, pa.int32()))
+    return table
+
+
+def _empty(schema: pa.Schema, partition_names: Sequence[str]) -> pa.Table:
+    for name in partition_names:
+        schema = schema.append(pa.field(name, pa.int32()))
+    return schema.empty_table()
+
+
+def _concat(tables: List[pa.Table], schema: pa.Schema, partition_names: Sequence[str]) -> pa.Table:
+    return pa.concat_tables(tables) if tables else _empty(schema, partition_names)
+
+
+class LocalAnalytics:
+    """Banco DuckDB em memória com as tabelas e views do data lake local.
+
+    As tabelas CSV e financeiras são lidas para Arrow em refresh() (consultas repetidas
+    não relêem disco); as *_parquet são views sobre read_parquet com hive partitioning.
+    """
+
+    def __init__(self, data_dir: str | Path | None = None, database: str = ":memory:", threads: Optional[int] = None):
+        if duckdb is None:
+            raise ImportError("duckdb não instalado: instale o extra `analytics` (uv sync --extra analytics)")
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.conn = duckdb.connect(database)
+        if threads:
+            self.conn.execute(f"SET threads = {int(threads)}")
+        # Mantém as tabelas Arrow vivas enquanto registradas no DuckDB
+        self._arrow_tables: Dict[str, pa.Table] = {}
+        self.refresh()
+
+    def __enter__(self) -> "LocalAnalytics":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _register(self, name: str, table: pa.Table) -> None:
+        if name in self._arrow_tables:
+            self.conn.unregister(name)
+        else:
+            # Uma view read_parquet anterior com o mesmo nome
+            self.conn.execute(f"DROP VIEW IF EXISTS {name}")
+        self._arrow_tables[name] = table
+        self.conn.register(name, table)
+
+    def _load_seasons(self) -> pa.Table:
+        tables = []
+        for csv_file in list_csv(self.data_dir / "sport" / "seasons", "season_*_league_*_results"):
+            match = _FIXTURES_FILE.match(csv_stem(csv_file))
+            if match is None:
+                continue
+            table = ParquetWriter._read_csv(csv_file, FIXTURES_CSV_SCHEMA)
+            tables.append(_with_partitions(table, {"season": int(match[1]), "league": int(match[2])}))
+        return _concat(tables, FIXTURES_CSV_SCHEMA, ("season", "league"))
+
+    def _load_players(self, stat_type: str) -> pa.Table:
+        tables = []
+        for csv_file in list_csv(self.data_dir / "sport" / "players", f"{stat_type}_league_*_season_*"):
+            match = _PLAYERS_FILE.match(csv_stem(csv_file))
+            if match is None or match[1] != stat_type:
+                continue
+            table = ParquetWriter._read_csv(csv_file, PLAYERS_SCHEMA)
+            tables.append(_with_partitions(table, {"league": int(match[2]), "season": int(match[3])}))
+        return _concat(tables, PLAYERS_SCHEMA, ("league", "season"))
+
+    def _register_parquet(self, name: str, directory: Path, schema: pa.Schema, partition_names: Sequence[str]) -> None:
+        if not any(directory.rglob("*.parquet")):
+            self._register(name, _empty(schema, partition_names))
+            return
+        if name in self._arrow_tables:
+            self.conn.unregister(name)
+            del self._arrow_tables[name]
+        columns = ", ".join(f'"{field.name}"' for field in schema)
+        partitions = ", ".join(f"CAST({partition} AS INTEGER) AS {partition}" for partition in partition_names)
+        pattern = (directory / "**" / "*.parquet").as_posix().replace("'", "''")
+        self.conn.execute(
+            f"CREATE OR REPLACE VIEW {name} AS SELECT {columns}, {partitions} "
+            f"FROM read_parquet('{pattern}', hive_partitioning = true)"
+        )
+
+    def refresh(self) -> None:
+        """(Re)monta tabelas e views a partir dos arquivos atuais em data_dir."""
+        self._register("seasons", self._load_seasons())
+        for stat_type in PLAYER_TABLES:
+            self._register(stat_type, self._load_players(stat_type))
+
+        parquet_dir = self.data_dir / "sport" / "parquet"
+        self._register_parquet("fixtures_parquet", parquet_dir / "seasons", FIXTURES_SCHEMA, ("season", "league"))
+        for stat_type in PLAYER_TABLES:
+            self._register_parquet(
+                f"{stat_type}_parquet", parquet_dir / "players" / stat_type, PLAYERS_SCHEMA, ("league", "season")
+            )
+
+        self._register("transfers_typed", FinancialNormalizer.load_dataset(self.data_dir, "transfers"))
+        self._register("balances_typed", FinancialNormalizer.load_dataset(self.data_dir, "balances"))
+
+        # Mesmas views do Athena, a partir do mesmo arquivo SQL
+        self.conn.execute(ATHENA_VIEWS_SQL.read_text(encoding="utf-8"))
+        logger.info(f"Analytics local: {len(self.tables())} tabelas/views sobre {self.data_dir}")
+
+    def tables(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT table_name FROM information_schema.tables ORDER BY 1").fetchall()]
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """Executa uma consulta e devolve um DataFrame."""
+        return self.conn.execute(sql, params or []).df()
+
+    def arrow(self, sql: str, params: Optional[Sequence[Any]] = None) -> pa.Table:
+        """Como query(), mas devolve uma tabela Arrow (sem conversão para pandas)."""
+        return self.conn.execute(sql, params or []).arrow()
@@ -1,10 +1,12 @@
+import asyncio
 import os
 import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, List
 
 import requests
-from dotenv import load_dotenv
 
 from pydantic import ValidationError
 from .api_football_models import (
@@ -12,11 +14,55 @@ from .api_football_models import (
 	FixtureTeam,
 	PlayerSummary,
 )
-from .utils import ConfigLoader, CSVWriter, setup_logger
+from .cache import ResponseCache
+from .entities import PLAYERS, TEAMS, EntityStore
+from .env import load_env
+from .metrics import METRICS
+from .planner import STATE_FRESH, STATE_LOCAL, STATE_MISSING, STATE_OUT_OF_TARGETS, STATE_STALE
+from .rate_limit import QuotaExhaustedError, QuotaRateLimiter
+from .utils import DATA_DIR, ConfigLoader, CSVWriter, fixture_to_row, resolve_csv, setup_logger
+
+if TYPE_CHECKING:
+	import aiohttp
 
 EXPECTED_BASE_URL = "https://v3.football.api-sports.io/"
 
-load_dotenv()
+# Status (fixture.status.short) de partidas que não mudam mais de resultado
+FINAL_STATUSES = ("FT", "AET", "PEN", "AWD", "WO", "CANC")
+# Limite da API para o filtro `ids` de fixtures
+MAX_IDS_PER_REQUEST = 20
+# Acima deste número de chamadas por `ids`, o delta usa uma janela from/to
+DELTA_MAX_IDS_REQUESTS = 3
+# Dias à frente cobertos pela janela do delta (partidas novas e remarcadas)
+DELTA_LOOKAHEAD_DAYS = 14
+# Estimativa para planejar os detalhes de uma temporada cuja partição ainda não existe
+ESTIMATED_FIXTURES_PER_SEASON = 380
+# Páginas (20 jogadores) de `players` por liga-temporada quando ainda não há resposta em cache
+ESTIMATED_SQUAD_PAGES = 30
+# Caracteres da resposta incluídos no log quando uma extração volta vazia
+LOGGED_PAYLOAD_CHARS = 500
+# fixtures?ids= -> colunas do CSV de estatísticas por time
+STATISTIC_COLUMNS = {
+	'Shots on Goal': 'shots_on_goal',
+	'Shots off Goal': 'shots_off_goal',
+	'Total Shots': 'total_shots',
+	'Blocked Shots': 'blocked_shots',
+	'Shots insidebox': 'shots_insidebox',
+	'Shots outsidebox': 'shots_outsidebox',
+	'Fouls': 'fouls',
+	'Corner Kicks': 'corner_kicks',
+	'Offsides': 'offsides',
+	'Ball Possession': 'ball_possession',
+	'Yellow Cards': 'yellow_cards',
+	'Red Cards': 'red_cards',
+	'Goalkeeper Saves': 'goalkeeper_saves',
+	'Total passes': 'total_passes',
+	'Passes accurate': 'passes_accurate',
+	'Passes %': 'passes_pct',
+	'expected_goals': 'expected_goals',
+}
+
+load_env()
 
 logger = setup_logger(__name__)
 
@@ -30,35 +76,140 @@ def load_target_leagues(path: Optional[str] = None) -> List[int]:
 	return ConfigLoader.load_leagues(path)
 
 
+def _resolve_credentials(api_key: Optional[str], base_url: Optional[str]) -> tuple[str, str]:
+	"""Resolve e valida a chave e a URL base da API."""
+	api_key = api_key or os.getenv("API_FOOTBALL_KEY")
+	base_url = base_url or os.getenv("API_FOOTBALL_BASE_URL", EXPECTED_BASE_URL)
+	if not api_key:
+		raise ValueError("API_FOOTBALL_KEY nao configurada no ambiente.")
+	if base_url.rstrip("/") != EXPECTED_BASE_URL.rstrip("/"):
+		# Escape hatch para servidores locais (benchmarks/stub_server.py); nunca usar em produção
+		if os.getenv("API_FOOTBALL_ALLOW_CUSTOM_BASE_URL") != "1":
+			raise ValueError("Base URL da API deve ser https://v3.football.api-sports.io/ conforme documentacao.")
+		logger.warning(f"Usando base URL customizada da API: {base_url}")
+	return api_key, base_url
+
+
+def _body_rate_limit(data: Any) -> tuple[Optional[str], Any]:
+	"""Identifica erros de limite no corpo da resposta (a API responde 200 com `errors`)."""
+	if not isinstance(data, dict):
+		return None, None
+	if 'rateLimit' in data:
+		return 'rateLimit', data['rateLimit']
+	errors = data.get('errors')
+	if isinstance(errors, dict):
+		for key in ('rateLimit', 'requests'):
+			if key in errors:
+				return key, errors[key]
+	return None, None
+
+
+def _next_page(data: Dict[str, Any], page: int) -> Optional[int]:
+	"""Retorna a próxima página segundo `paging.current/total`, ou None na última."""
+	paging = data.get('paging') or {}
+	try:
+		current = int(paging.get('current') or page)
+		total = int(paging.get('total') or current)
+	except (TypeError, ValueError):
+		return None
+	return current + 1 if current < total else None
+
+
+def _payload_excerpt(raw: Any) -> str:
+	"""Início da resposta para o log (uma página de `players` inteira não cabe em uma linha)."""
+	text = repr(raw)
+	return text if len(text) <= LOGGED_PAYLOAD_CHARS else f"{text[:LOGGED_PAYLOAD_CHARS]}... ({len(text)} caracteres)"
+
+
+def _cache_lookup(cache: Optional[ResponseCache], endpoint: str, params: Optional[Dict[str, Any]]) -> Any:
+	if cache is None:
+		return None
+	cached = cache.get(endpoint, params)
+	if cached is not None:
+		params_str = f" | Params: {params}" if params else ""
+		logger.info(f"Cache HIT: {endpoint}{params_str}")
+		METRICS.record_cache_hit(endpoint)
+	return cached
+
+
+def _cache_store(cache: Optional[ResponseCache], endpoint: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+	# Respostas com `errors` (parâmetros inválidos, plano sem acesso...) não são reaproveitáveis
+	if cache is not None and isinstance(data, dict) and not data.get('errors'):
+		cache.put(endpoint, params, data)
+
+
+def _journal_lookup(journal: Any, endpoint: str, params: Optional[Dict[str, Any]]) -> Any:
+	"""Resposta já recebida na execução retomada (RunJournal), sem nova chamada."""
+	if journal is None:
+		return None
+	data = journal.get_response(endpoint, params)
+	if data is not None:
+		params_str = f" | Params: {params}" if params else ""
+		logger.info(f"Diário: {endpoint}{params_str} já recebido nesta execução")
+	return data
+
+
+def _journal_store(journal: Any, endpoint: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+	if journal is not None and isinstance(data, dict) and not data.get('errors'):
+		journal.put_response(endpoint, params, data)
+
+
+def _cache_fallback(
+	cache: Optional[ResponseCache], endpoint: str, params: Optional[Dict[str, Any]], exc: Exception
+) -> Any:
+	"""Serve a última resposta conhecida quando a API falha; sem ela, propaga `exc`."""
+	stale = cache.get(endpoint, params, allow_stale=True) if cache is not None else None
+	if stale is None:
+		raise exc
+	logger.warning(f"API indisponível para {endpoint} {params}; servindo resposta expirada do cache")
+	return stale
+
+
 class APIFootballClient:
-	def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, requests_per_minute: int = 10):
-		self.api_key = api_key or os.getenv("API_FOOTBALL_KEY")
-		self.base_url = base_url or os.getenv("API_FOOTBALL_BASE_URL", EXPECTED_BASE_URL)
+	def __init__(
+		self,
+		api_key: Optional[str] = None,
+		base_url: Optional[str] = None,
+		requests_per_minute: int = 10,
+		rate_limiter: Optional[QuotaRateLimiter] = None,
+		cache: Optional[ResponseCache] = None,
+		enable_cache: bool = True,
+		entities: Optional[EntityStore] = None,
+		enable_entities: bool = True,
+	):
+		self.api_key, self.base_url = _resolve_credentials(api_key, base_url)
 		self.requests_per_minute = requests_per_minute
-		self.min_interval = 60.0 / requests_per_minute  # Intervalo mínimo entre requests em segundos
-		self.last_request_time = 0.0
+		self.rate_limiter = rate_limiter or QuotaRateLimiter(requests_per_minute=requests_per_minute)
+		self.cache = (cache or ResponseCache()) if enable_cache else None
+		# Cadastro de jogadores/times alimentado pelos serviços a cada página
+		self.entities = (entities or EntityStore()) if enable_entities else None
+		# RunJournal da execução corrente (anexado pelo pipeline)
+		self.journal = None
 		
-		if not self.api_key:
-			raise ValueError("API_FOOTBALL_KEY nao configurada no ambiente.")
-		if self.base_url.rstrip("/") != EXPECTED_BASE_URL.rstrip("/"):
-			raise ValueError("Base URL da API deve ser https://v3.football.api-sports.io/ conforme documentacao.")
 		self.session = requests.Session()
 		self.session.headers.clear()
 		self.session.headers.update({"x-apisports-key": self.api_key})
 
 	def _wait_if_needed(self) -> None:
-		"""Aguarda o tempo necessário para respeitar o rate limit."""
-		current_time = time.time()
-		time_since_last_request = current_time - self.last_request_time
-		
-		if time_since_last_request < self.min_interval:
-			sleep_time = self.min_interval - time_since_last_request
-			logger.info(f"Rate limit: aguardando {sleep_time:.2f}s")
-			time.sleep(sleep_time)
-		
-		self.last_request_time = time.time()
+		"""Aguarda um token do rate limiter compartilhado entre processos."""
+		METRICS.add_sleep(self.rate_limiter.acquire())
 
 	def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3) -> Any:
+		cached = _cache_lookup(self.cache, endpoint, params)
+		if cached is not None:
+			return cached
+		journaled = _journal_lookup(self.journal, endpoint, params)
+		if journaled is not None:
+			return journaled
+		try:
+			data = self._request(endpoint, params, max_retries)
+		except Exception as e:
+			return _cache_fallback(self.cache, endpoint, params, e)
+		_cache_store(self.cache, endpoint, params, data)
+		_journal_store(self.journal, endpoint, params, data)
+		return data
+
+	def _request(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3) -> Any:
 		url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
 		params_str = f" | Params: {params}" if params else ""
 		logger.info(f"API Call: {endpoint}{params_str}")
@@ -66,23 +217,29 @@ class APIFootballClient:
 		for attempt in range(max_retries):
 			self._wait_if_needed()
 			
+			started = time.perf_counter()
 			response = self.session.get(url, params=params)
+			METRICS.observe_request(endpoint, response.status_code, time.perf_counter() - started, len(response.content))
 			logger.info(f"Status: {response.status_code}")
+			self.rate_limiter.update_from_headers(response.headers)
 			
 			# Verifica se há rate limit na resposta
 			if response.status_code == 429:
 				retry_after = int(response.headers.get('Retry-After', 60))
 				logger.warning(f"Rate limit atingido. Tentativa {attempt + 1}/{max_retries}. Aguardando {retry_after}s")
-				time.sleep(retry_after)
+				self.rate_limiter.block_for(retry_after)
 				continue
 			
 			response.raise_for_status()
 			data = response.json()
 			
 			# Verifica se há mensagem de rate limit no corpo da resposta
-			if isinstance(data, dict) and 'rateLimit' in data:
-				logger.warning(f"Rate limit detectado: {data['rateLimit']}. Tentativa {attempt + 1}/{max_retries}. Aguardando 60s")
-				time.sleep(60)
+			kind, message = _body_rate_limit(data)
+			if kind == 'requests':
+				raise QuotaExhaustedError(f"Cota diária esgotada: {message}")
+			if kind == 'rateLimit':
+				logger.warning(f"Rate limit detectado: {message}. Tentativa {attempt + 1}/{max_retries}. Aguardando 60s")
+				self.rate_limiter.block_for(60)
 				continue
 			
 			response_count = len(data.get('response', []))
@@ -91,78 +248,571 @@ class APIFootballClient:
 		
 		raise Exception(f"Falha após {max_retries} tentativas devido a rate limit")
 
+	def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+		"""Percorre todas as páginas do endpoint, uma resposta por vez."""
+		params = dict(params or {})
+		page: Optional[int] = int(params.get('page', 1))
+		while page is not None:
+			# O parâmetro `page` só é enviado quando a API anuncia mais de uma página
+			if page > 1:
+				params['page'] = page
+			data = self._get(endpoint, params)
+			yield data
+			page = _next_page(data, page)
+
+
+class AsyncAPIFootballClient:
+	"""Cliente assíncrono que mantém várias requisições em voo sob o mesmo rate limit."""
+
+	def __init__(
+		self,
+		api_key: Optional[str] = None,
+		base_url: Optional[str] = None,
+		requests_per_minute: int = 10,
+		max_concurrency: int = 4,
+		rate_limiter: Optional[QuotaRateLimiter] = None,
+		cache: Optional[ResponseCache] = None,
+		enable_cache: bool = True,
+		entities: Optional[EntityStore] = None,
+		enable_entities: bool = True,
+	):
+		self.api_key, self.base_url = _resolve_credentials(api_key, base_url)
+		self.requests_per_minute = requests_per_minute
+		self.rate_limiter = rate_limiter or QuotaRateLimiter(requests_per_minute=requests_per_minute)
+		self.cache = (cache or ResponseCache()) if enable_cache else None
+		self.entities = (entities or EntityStore()) if enable_entities else None
+		self.max_concurrency = max_concurrency
+		self.journal = None
+		self.session: Optional["aiohttp.ClientSession"] = None
+		self._semaphore: Optional[asyncio.Semaphore] = None
+
+	async def __aenter__(self) -> "AsyncAPIFootballClient":
+		await self.open()
+		return self
+
+	async def __aexit__(self, *exc_info: Any) -> None:
+		await self.close()
+
+	async def open(self) -> None:
+		"""Abre a sessão HTTP com pool de conexões keep-alive."""
+		if self.session is not None and not self.session.closed:
+			return
+		# aiohttp só é importado por quem usa o cliente assíncrono
+		import aiohttp
+
+		connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+		self.session = aiohttp.ClientSession(
+			headers={"x-apisports-key": self.api_key},
+			connector=connector,
+		)
+		self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+	async def close(self) -> None:
+		if self.session is not None:
+			await self.session.close()
+			self.session = None
+
+	async def _wait_if_needed(self) -> None:
+		"""Aguarda um token do rate limiter; requisições já em voo não bloqueiam a espera."""
+		METRICS.add_sleep(await self.rate_limiter.acquire_async())
+
+	async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3) -> Any:
+		cached = _cache_lookup(self.cache, endpoint, params)
+		if cached is not None:
+			return cached
+		journaled = _journal_lookup(self.journal, endpoint, params)
+		if journaled is not None:
+			return journaled
+		try:
+			data = await self._request(endpoint, params, max_retries)
+		except Exception as e:
+			return _cache_fallback(self.cache, endpoint, params, e)
+		_cache_store(self.cache, endpoint, params, data)
+		_journal_store(self.journal, endpoint, params, data)
+		return data
+
+	async def _request(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3) -> Any:
+		if self.session is None:
+			await self.open()
+		url = self.base_url.rstrip("/") + "/" + endpoint.lstrip("/")
+		query = {key: str(value) for key, value in (params or {}).items()}
+		params_str = f" | Params: {params}" if params else ""
+		logger.info(f"API Call: {endpoint}{params_str}")
+
+		for attempt in range(max_retries):
+			await self._wait_if_needed()
+
+			async with self._semaphore:
+				started = time.perf_counter()
+				async with self.session.get(url, params=query) as response:
+					body = await response.read()
+					METRICS.observe_request(endpoint, response.status, time.perf_counter() - started, len(body))
+					logger.info(f"Status: {response.status} | {endpoint}{params_str}")
+					self.rate_limiter.update_from_headers(response.headers)
+
+					if response.status == 429:
+						retry_after = int(response.headers.get('Retry-After', 60))
+						logger.warning(f"Rate limit atingido. Tentativa {attempt + 1}/{max_retries}. Aguardando {retry_after}s")
+						self.rate_limiter.block_for(retry_after)
+						continue
+
+					response.raise_for_status()
+					data = await response.json()
+
+			kind, message = _body_rate_limit(data)
+			if kind == 'requests':
+				raise QuotaExhaustedError(f"Cota diária esgotada: {message}")
+			if kind == 'rateLimit':
+				logger.warning(f"Rate limit detectado: {message}. Tentativa {attempt + 1}/{max_retries}. Aguardando 60s")
+				self.rate_limiter.block_for(60)
+				continue
+
+			response_count = len(data.get('response', []))
+			logger.info(f"Response Count: {response_count} items")
+			return data
+
+		raise Exception(f"Falha após {max_retries} tentativas devido a rate limit")
+
+	async def aiter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+		"""Versão assíncrona de APIFootballClient.iter_pages."""
+		params = dict(params or {})
+		page: Optional[int] = int(params.get('page', 1))
+		while page is not None:
+			if page > 1:
+				params['page'] = page
+			data = await self._get(endpoint, params)
+			yield data
+			page = _next_page(data, page)
+
 
 class BaseService:
 	"""Classe base para todos os serviços."""
 	
-	def __init__(self, client: APIFootballClient):
+	def __init__(self, client: APIFootballClient | AsyncAPIFootballClient, batch_parsing: bool = True):
 		self.client = client
+		# Exportação página a página em colunas (FixtureBatch/PlayerBatch), sem um modelo pydantic por item
+		self.batch_parsing = batch_parsing
 	
-	def _check_file_cache(self, file_path: Path) -> bool:
+	def _keeps_local_file(self, file_path: Path, endpoint: str, params: Dict[str, Any]) -> bool:
+		"""CSV já gravado que dispensa a requisição.
+
+		Com o cache de respostas ativo, o CSV da temporada corrente é regenerado a partir
+		dele (sem custo de cota) para seguir o TTL; o de temporadas encerradas (TTL None)
+		não muda mais e fica intacto, com o mtime que a conversão Parquet compara.
+		"""
+		if not file_path.exists():
+			return False
+		cache = getattr(self.client, 'cache', None)
+		return cache is None or cache.ttl_for(endpoint, params) is None
+
+	def _check_file_cache(self, file_path: Path, endpoint: str, params: Dict[str, Any]) -> bool:
 		"""Verifica se arquivo existe no cache."""
-		if file_path.exists():
+		if self._keeps_local_file(file_path, endpoint, params):
 			logger.info(f"Cache: {file_path.name} já existe, pulando chamada API")
 			return True
 		return False
 
+	def _plan_state(self, endpoint: str, params: Dict[str, Any], local_path: Optional[Path]) -> tuple[str, int]:
+		"""Estado local da requisição e chamadas estimadas para atendê-la, sem efeitos colaterais."""
+		if local_path is not None and self._keeps_local_file(local_path, endpoint, params):
+			return STATE_LOCAL, 0
+		cache = getattr(self.client, 'cache', None)
+		if cache is not None:
+			entry = cache.peek(endpoint, params)
+			if entry is None:
+				return STATE_MISSING, 1
+			if cache.is_entry_fresh(entry, endpoint, params):
+				return STATE_FRESH, 0
+			# A resposta expirada informa quantas páginas a requisição rende
+			paging = (entry.get('payload') or {}).get('paging') or {}
+			try:
+				pages = max(1, int(paging.get('total') or 1))
+			except (TypeError, ValueError):
+				pages = 1
+			return STATE_STALE, pages
+		return STATE_MISSING, 1
+
+	def _remember_entities(self, raw: Optional[Dict[str, Any]]) -> None:
+		"""Registra no cadastro do cliente os jogadores e times da página (só o que mudou é gravado)."""
+		entities = getattr(self.client, 'entities', None)
+		if entities is not None and raw:
+			entities.remember_page(raw)
+
 
 class MatchResultsService(BaseService):
-	def get_fixtures(self, **params) -> List[FixtureResult]:
+	def _cache_path(self, params: Dict[str, Any]) -> Optional[Path]:
 		season = params.get('season')
 		league = params.get('league')
 		
 		if season and league:
-			data_dir = Path(__file__).parent.parent.parent / 'data' / 'sport' / 'seasons'
-			filename = f'season_{season}_league_{league}_results.csv'
-			if self._check_file_cache(data_dir / filename):
-				return []
-		
-		raw = self.client._get("fixtures", params)
-		response_data = raw.get('response', [])
+			return Path(CSVWriter.fixture_partition_path(season, league))
+		return None
+
+	def _is_cached(self, params: Dict[str, Any]) -> bool:
+		cache_path = self._cache_path(params)
+		return cache_path is not None and self._check_file_cache(cache_path, "fixtures", params)
+
+	def plan_state(self, **params) -> tuple[str, int]:
+		"""Estado de cache da extração e chamadas estimadas (ver planner.build_plan)."""
+		return self._plan_state("fixtures", params, self._cache_path(params))
+
+	def needs_fetch(self, **params) -> bool:
+		"""Indica, sem efeitos colaterais, se get_fixtures chamaria a API."""
+		return self.plan_state(**params)[1] > 0
+
+	def _parse_fixture(self, item: Dict[str, Any]) -> Optional[FixtureResult]:
+		"""Converte um item da resposta de fixtures em FixtureResult."""
+		fixture_info = item.get('fixture') or {}
+		league_info = item.get('league') or {}
+		teams_info = item.get('teams') or {}
+		score_info = (item.get('score') or {}).get('fulltime') or {}
+
+		home_team_data = teams_info.get('home') or {}
+		away_team_data = teams_info.get('away') or {}
+
+		try:
+			return FixtureResult(
+				fixture_id=fixture_info.get('id'),
+				date=fixture_info.get('date'),
+				league_id=league_info.get('id'),
+				league_name=league_info.get('name'),
+				season=league_info.get('season'),
+				home_team=FixtureTeam(
+					id=home_team_data.get('id'),
+					name=home_team_data.get('name'),
+				),
+				away_team=FixtureTeam(
+					id=away_team_data.get('id'),
+					name=away_team_data.get('name'),
+				),
+				fulltime_home=score_info.get('home'),
+				fulltime_away=score_info.get('away'),
+				status=(fixture_info.get('status') or {}).get('short'),
+			)
+		except ValidationError as e:
+			logger.warning(f"Erro de validação Fixture: {e}")
+			return None
+
+	def _parse_page(self, raw: Dict[str, Any]) -> Iterator[FixtureResult]:
+		for item in raw.get('response', []):
+			if (result := self._parse_fixture(item)) is not None:
+				yield result
 
-		if not response_data:
-			logger.error(f"Nenhum fixture retornado para os parâmetros: {params}")
-			print(raw)
+	def _raise_if_empty(self, count: int, raw: Optional[Dict[str, Any]], params: Dict[str, Any]) -> None:
+		if count == 0:
+			logger.error(f"Nenhum fixture retornado para os parâmetros: {params}; resposta: {_payload_excerpt(raw)}")
 			raise ValueError(f"Nenhum fixture retornado para os parâmetros: {params}")
-		
-		results: List[FixtureResult] = []
-		for item in response_data:
-			fixture_info = item.get('fixture') or {}
-			league_info = item.get('league') or {}
-			teams_info = item.get('teams') or {}
-			score_info = (item.get('score') or {}).get('fulltime') or {}
 
-			home_team_data = teams_info.get('home') or {}
-			away_team_data = teams_info.get('away') or {}
+	def iter_fixtures(self, **params) -> Iterator[FixtureResult]:
+		"""Gera os fixtures página a página, sem acumular a temporada em memória."""
+		count = 0
+		raw = None
+		for raw in self.client.iter_pages("fixtures", params):
+			self._remember_entities(raw)
+			for result in self._parse_page(raw):
+				count += 1
+				yield result
+		self._raise_if_empty(count, raw, params)
 
-			try:
-				results.append(
-					FixtureResult(
-						fixture_id=fixture_info.get('id'),
-						date=fixture_info.get('date'),
-						league_id=league_info.get('id'),
-						league_name=league_info.get('name'),
-						season=league_info.get('season'),
-						home_team=FixtureTeam(
-							id=home_team_data.get('id'),
-							name=home_team_data.get('name'),
-						),
-						away_team=FixtureTeam(
-							id=away_team_data.get('id'),
-							name=away_team_data.get('name'),
-						),
-						fulltime_home=score_info.get('home'),
-						fulltime_away=score_info.get('away'),
-					)
-				)
-			except ValidationError as e:
-				logger.warning(f"Erro de validação Fixture: {e}")
-		CSVWriter.write_fixtures(results)
+	def _write_page(self, writer: Any, raw: Dict[str, Any]) -> int:
+		"""Grava uma página no escritor de partições; retorna os itens válidos."""
+		self._remember_entities(raw)
+		if self.batch_parsing:
+			from .batch_parsing import FixtureBatch
+
+			batch = FixtureBatch.from_response(raw.get('response', [])).filter_valid()
+			writer.write_batch(batch)
+			return len(batch)
+		count = 0
+		for result in self._parse_page(raw):
+			count += 1
+			writer.write(result)
+		return count
+
+	def export_fixtures(self, **params) -> int:
+		"""Grava os fixtures em streaming nas partições CSV; retorna o total de linhas."""
+		if self._is_cached(params):
+			return 0
+		count = 0
+		raw = None
+		with CSVWriter.open_fixtures() as writer:
+			for raw in self.client.iter_pages("fixtures", params):
+				count += self._write_page(writer, raw)
+		self._raise_if_empty(count, raw, params)
+		return writer.rows_written
+
+	async def aexport_fixtures(self, **params) -> int:
+		"""Versão assíncrona de export_fixtures; requer AsyncAPIFootballClient."""
+		if self._is_cached(params):
+			return 0
+		count = 0
+		raw = None
+		with CSVWriter.open_fixtures() as writer:
+			async for raw in self.client.aiter_pages("fixtures", params):
+				count += self._write_page(writer, raw)
+		self._raise_if_empty(count, raw, params)
+		return writer.rows_written
+
+	def get_fixtures(self, **params) -> List[FixtureResult]:
+		if self._is_cached(params):
+			return []
+		results: List[FixtureResult] = []
+		with CSVWriter.open_fixtures() as writer:
+			for result in self.iter_fixtures(**params):
+				writer.write(result)
+				results.append(result)
 		return results
 
+	@staticmethod
+	def _is_final(row: Dict[str, Any]) -> bool:
+		status = (row.get('status') or '').strip()
+		if status:
+			return status in FINAL_STATUSES
+		# Partições gravadas antes da coluna status: placar preenchido = encerrada
+		return bool((row.get('fulltime_home') or '').strip() and (row.get('fulltime_away') or '').strip())
+
+	@staticmethod
+	def _parse_kickoff(value: Optional[str]) -> Optional[datetime]:
+		try:
+			kickoff = datetime.fromisoformat(value) if value else None
+		except ValueError:
+			return None
+		if kickoff is not None and kickoff.tzinfo is None:
+			kickoff = kickoff.replace(tzinfo=timezone.utc)
+		return kickoff
+
+	def _plan_delta(self, league: int, season: int) -> tuple[Dict[int, Dict[str, Any]], List[Dict[str, Any]]]:
+		"""Lê a partição e monta as requisições do refresh incremental.
+
+		Uma janela from/to vai da última partida já iniciada até DELTA_LOOKAHEAD_DAYS à
+		frente: traz partidas que a API acrescentou depois da primeira extração (fases
+		eliminatórias) e as remarcadas. Fixtures iniciados antes da janela e ainda não
+		finalizados (adiados, suspensos) são pedidos por `ids`; se forem muitos, a janela
+		começa no mais antigo deles.
+		"""
+		rows = CSVWriter.read_fixture_partition(season, league)
+		now = datetime.now(timezone.utc)
+		kickoffs = {fixture_id: self._parse_kickoff(row.get('date')) for fixture_id, row in rows.items()}
+		started = [kickoff for kickoff in kickoffs.values() if kickoff is not None and kickoff <= now]
+		window_from: Optional[date] = max(started).date() if started else now.date()
+		pending: Dict[int, Optional[datetime]] = {
+			fixture_id: kickoff for fixture_id, kickoff in kickoffs.items()
+			if not self._is_final(rows[fixture_id]) and (kickoff is None or kickoff.date() < window_from)
+		}
+
+		ids = sorted(pending)
+		requests_params: List[Dict[str, Any]] = []
+		if len(ids) <= MAX_IDS_PER_REQUEST * DELTA_MAX_IDS_REQUESTS:
+			requests_params = [
+				{'ids': '-'.join(str(fixture_id) for fixture_id in ids[i:i + MAX_IDS_PER_REQUEST])}
+				for i in range(0, len(ids), MAX_IDS_PER_REQUEST)
+			]
+		elif all(kickoff is not None for kickoff in pending.values()):
+			window_from = min(pending.values()).date()
+		else:
+			window_from = None  # pendentes sem data: a temporada inteira
+		# Sem filtro de status na janela: adiados, suspensos e ao vivo também precisam voltar,
+		# senão continuam pendentes e são pedidos de novo a cada execução (a mescla é por fixture_id)
+		window: Dict[str, Any] = {'league': league, 'season': season}
+		if window_from is not None:
+			window['from'] = window_from.isoformat()
+			window['to'] = (now.date() + timedelta(days=DELTA_LOOKAHEAD_DAYS)).isoformat()
+		requests_params.append(window)
+		logger.info(f"Delta league={league} season={season}: {len(ids)} fixtures pendentes fora da janela, {len(requests_params)} chamada(s)")
+		return rows, requests_params
+
+	def _apply_delta(self, league: int, season: int, rows: Dict[int, Dict[str, Any]], results: List[FixtureResult]) -> int:
+		"""Mescla os fixtures atualizados na partição e a regrava."""
+		updated = 0
+		for result in results:
+			if result.league_id != league or result.season != season:
+				continue
+			rows[result.fixture_id] = fixture_to_row(result)
+			updated += 1
+		CSVWriter.write_fixture_partition(season, league, list(rows.values()))
+		return updated
+
+	def refresh_fixtures(self, league: int, season: int) -> int:
+		"""Atualiza os fixtures não finalizados e acrescenta os novos (ver _plan_delta); retorna quantos foram mesclados.
+
+		Sem partição local, cai na extração completa da temporada.
+		"""
+		if not os.path.exists(CSVWriter.fixture_partition_path(season, league)):
+			return self.export_fixtures(league=league, season=season)
+		rows, requests_params = self._plan_delta(league, season)
+		results: List[FixtureResult] = []
+		for params in requests_params:
+			for raw in self.client.iter_pages("fixtures", params):
+				self._remember_entities(raw)
+				results.extend(self._parse_page(raw))
+		return self._apply_delta(league, season, rows, results)
+
+	async def arefresh_fixtures(self, league: int, season: int) -> int:
+		"""Versão assíncrona de refresh_fixtures; requer AsyncAPIFootballClient."""
+		if not os.path.exists(CSVWriter.fixture_partition_path(season, league)):
+			return await self.aexport_fixtures(league=league, season=season)
+		rows, requests_params = self._plan_delta(league, season)
+		results: List[FixtureResult] = []
+		for params in requests_params:
+			async for raw in self.client.aiter_pages("fixtures", params):
+				self._remember_entities(raw)
+				results.extend(self._parse_page(raw))
+		return self._apply_delta(league, season, rows, results)
+
+
+class FixtureDetailsService(BaseService):
+	"""Estatísticas por time, eventos e escalações de cada partida.
+
+	Usa a forma multi-id `fixtures?ids=a-b-c` (até 20 partidas por chamada), que já traz
+	statistics/events/lineups de cada fixture. Os ids vêm da partição de fixtures da
+	temporada; só partidas encerradas e ainda sem detalhes gravados são buscadas, então
+	uma temporada de 380 jogos custa 19 chamadas, e as seguintes só as rodadas novas.
+	"""
+
+	def pending_ids(self, league: int, season: int) -> List[int]:
+		"""Partidas encerradas da partição que ainda não têm os detalhes gravados."""
+		rows = CSVWriter.read_fixture_partition(season, league)
+		fetched = CSVWriter.fetched_fixture_details(season, league)
+		return sorted(
+			fixture_id for fixture_id, row in rows.items()
+			if fixture_id not in fetched and MatchResultsService._is_final(row)
+		)
+
+	@staticmethod
+	def _requests_params(ids: List[int]) -> List[Dict[str, Any]]:
+		return [
+			{'ids': '-'.join(str(fixture_id) for fixture_id in ids[i:i + MAX_IDS_PER_REQUEST])}
+			for i in range(0, len(ids), MAX_IDS_PER_REQUEST)
+		]
+
+	def plan_state(self, **params) -> tuple[str, int]:
+		"""Estado e chamadas estimadas (ver planner.build_plan), sem chamar a API."""
+		league, season = int(params['league']), int(params['season'])
+		if not os.path.exists(CSVWriter.fixture_partition_path(season, league)):
+			# A partição sai da unidade de fixtures desta mesma execução
+			return STATE_MISSING, -(-ESTIMATED_FIXTURES_PER_SEASON // MAX_IDS_PER_REQUEST)
+		calls = len(self._requests_params(self.pending_ids(league, season)))
+		return (STATE_MISSING, calls) if calls else (STATE_LOCAL, 0)
+
+	def needs_fetch(self, **params) -> bool:
+		return self.plan_state(**params)[1] > 0
+
+	@staticmethod
+	def _statistic_value(value: Any) -> Any:
+		# "55%" -> 55; "1.23" (expected_goals) e inteiros ficam como vieram
+		if isinstance(value, str) and value.endswith('%'):
+			return value[:-1]
+		return value
+
+	def _parse_details(self, item: Dict[str, Any], fixture_id: int) -> Dict[str, List[Dict[str, Any]]]:
+		"""Converte um item de fixtures?ids= nas linhas de statistics, events e lineups."""
+		statistics = []
+		for entry in item.get('statistics') or []:
+			team = entry.get('team') or {}
+			row: Dict[str, Any] = {'fixture_id': fixture_id, 'team_id': team.get('id'), 'team_name': team.get('name')}
+			for stat in entry.get('statistics') or []:
+				column = STATISTIC_COLUMNS.get(stat.get('type'))
+				if column is not None:
+					row[column] = self._statistic_value(stat.get('value'))
+			statistics.append(row)
+
+		events = []
+		for event in item.get('events') or []:
+			event_time = event.get('time') or {}
+			team = event.get('team') or {}
+			player = event.get('player') or {}
+			assist = event.get('assist') or {}
+			events.append({
+				'fixture_id': fixture_id,
+				'elapsed': event_time.get('elapsed'),
+				'extra': event_time.get('extra'),
+				'team_id': team.get('id'),
+				'team_name': team.get('name'),
+				'player_id': player.get('id'),
+				'player_name': player.get('name'),
+				'assist_id': assist.get('id'),
+				'assist_name': assist.get('name'),
+				'type': event.get('type'),
+				'detail': event.get('detail'),
+				'comments': event.get('comments'),
+			})
+
+		lineups = []
+		for lineup in item.get('lineups') or []:
+			team = lineup.get('team') or {}
+			coach = lineup.get('coach') or {}
+			base = {
+				'fixture_id': fixture_id,
+				'team_id': team.get('id'),
+				'team_name': team.get('name'),
+				'formation': lineup.get('formation'),
+				'coach_id': coach.get('id'),
+				'coach_name': coach.get('name'),
+			}
+			for starter, key in ((True, 'startXI'), (False, 'substitutes')):
+				for entry in lineup.get(key) or []:
+					player = entry.get('player') or {}
+					lineups.append({
+						**base,
+						'player_id': player.get('id'),
+						'player_name': player.get('name'),
+						'number': player.get('number'),
+						'position': player.get('pos'),
+						'grid': player.get('grid'),
+						'starter': starter,
+					})
+		return {'statistics': statistics, 'events': events, 'lineups': lineups}
+
+	def _write_page(self, league: int, season: int, raw: Dict[str, Any]) -> int:
+		"""Acrescenta às partições os detalhes das partidas da resposta; retorna quantas foram gravadas."""
+		self._remember_entities(raw)
+		fixture_ids: List[int] = []
+		details: Dict[str, List[Dict[str, Any]]] = {'statistics': [], 'events': [], 'lineups': []}
+		for item in raw.get('response', []):
+			fixture_id = (item.get('fixture') or {}).get('id')
+			if fixture_id is None:
+				continue
+			fixture_ids.append(int(fixture_id))
+			for kind, rows in self._parse_details(item, int(fixture_id)).items():
+				details[kind].extend(rows)
+		if fixture_ids:
+			CSVWriter.write_fixture_details(season, league, fixture_ids, details)
+		return len(fixture_ids)
+
+	def _plan_requests(self, league: int, season: int) -> List[Dict[str, Any]]:
+		ids = self.pending_ids(league, season)
+		requests_params = self._requests_params(ids)
+		if requests_params:
+			logger.info(f"Detalhes league={league} season={season}: {len(ids)} partidas em {len(requests_params)} chamada(s)")
+		else:
+			logger.info(f"Detalhes league={league} season={season}: nenhuma partida pendente")
+		return requests_params
+
+	def export_details(self, league: int, season: int) -> int:
+		"""Busca e grava os detalhes das partidas pendentes; retorna quantas foram gravadas."""
+		written = 0
+		for params in self._plan_requests(league, season):
+			for raw in self.client.iter_pages("fixtures", params):
+				written += self._write_page(league, season, raw)
+		return written
+
+	async def aexport_details(self, league: int, season: int) -> int:
+		"""Versão assíncrona de export_details: os lotes de ids vão em paralelo."""
+		async def fetch(params: Dict[str, Any]) -> int:
+			written = 0
+			async for raw in self.client.aiter_pages("fixtures", params):
+				written += self._write_page(league, season, raw)
+			return written
+
+		return sum(await asyncio.gather(*(fetch(params) for params in self._plan_requests(league, season))))
+
 
 class BasePlayerService(BaseService):
 	"""Classe base para serviços de estatísticas de jogadores."""
+
+	endpoint: str = ""
+	category: str = ""
+	file_prefix: str = ""
 	
 	def _parse_params(self, params: Dict[str, Any]) -> tuple[Optional[int], Optional[int]]:
 		"""Extrai e valida league_id e season dos parâmetros."""
@@ -186,22 +836,52 @@ class BasePlayerService(BaseService):
 			return False
 		return True
 	
+	def _cache_path(self, category: str, league_int: int, season_int: int) -> Path:
+		data_dir = Path(DATA_DIR) / 'sport' / 'players'
+		return Path(resolve_csv(data_dir, f"{category}_league_{league_int}_season_{season_int}", CSVWriter.compression))
+
 	def _check_cache(self, category: str, league_int: int, season_int: int) -> bool:
 		"""Verifica se o arquivo já existe no cache."""
-		data_dir = Path(__file__).parent.parent.parent / 'data' / 'sport' / 'players'
-		filename = f"{category}_league_{league_int}_season_{season_int}.csv"
-		return self._check_file_cache(data_dir / filename)
+		return self._check_file_cache(
+			self._cache_path(category, league_int, season_int), self.endpoint, {'league': league_int, 'season': season_int}
+		)
+
+	def plan_state(self, **params) -> tuple[str, int]:
+		"""Estado de cache da extração e chamadas estimadas (ver planner.build_plan)."""
+		league_int, season_int = self._parse_params(params)
+		if not self._check_targets(league_int, season_int):
+			return STATE_OUT_OF_TARGETS, 0
+		local_path = None
+		if league_int is not None and season_int is not None:
+			local_path = self._cache_path(self.file_prefix, league_int, season_int)
+		return self._plan_state(self.endpoint, params, local_path)
+
+	def needs_fetch(self, **params) -> bool:
+		"""Indica, sem efeitos colaterais, se a chamada à API seria feita."""
+		return self.plan_state(**params)[1] > 0
+
+	def _should_fetch(self, league_int: Optional[int], season_int: Optional[int]) -> bool:
+		"""Indica se a chamada à API é necessária (dentro dos targets e fora do cache)."""
+		if not self._check_targets(league_int, season_int):
+			return False
+		if league_int is not None and season_int is not None:
+			if self._check_cache(self.file_prefix, league_int, season_int):
+				return False
+		return True
 	
 	def _parse_player_data(self, item: Dict[str, Any], category: str, league_int: int, season_int: int) -> Optional[PlayerSummary]:
 		"""Extrai dados de um jogador da resposta da API."""
-		player_data = item.get('player') or {}
 		statistics = (item.get('statistics') or [])
 		primary_stat = statistics[0] if statistics else {}
+		return self._summary(item.get('player') or {}, primary_stat, category, league_int, season_int)
 
-		games = primary_stat.get('games') or {}
-		goals = primary_stat.get('goals') or {}
-		shots = primary_stat.get('shots') or {}
-		team = primary_stat.get('team') or {}
+	def _summary(self, player_data: Dict[str, Any], stat: Dict[str, Any], category: str,
+				 league_int: Optional[int], season_int: Optional[int]) -> Optional[PlayerSummary]:
+		"""Monta o PlayerSummary de uma entrada de `statistics` do jogador."""
+		games = stat.get('games') or {}
+		goals = stat.get('goals') or {}
+		shots = stat.get('shots') or {}
+		team = stat.get('team') or {}
 
 		try:
 			return PlayerSummary(
@@ -222,58 +902,311 @@ class BasePlayerService(BaseService):
 			logger.warning(f"Erro de validação PlayerSummary ({category}): {e}")
 			return None
 
+	def _log_empty_response(self, league_int: Optional[int], season_int: Optional[int]) -> None:
+		logger.warning(f"Nenhum registro de {self.category} retornado para league={league_int}, season={season_int}")
 
-class TopScorersService(BasePlayerService):
-	def get_topscorers(self, **params) -> List[PlayerSummary]:
+	def _parse_page(self, raw: Dict[str, Any], league_int: Optional[int], season_int: Optional[int]) -> Iterator[PlayerSummary]:
+		for item in raw.get('response', []):
+			if (player := self._parse_player_data(item, self.category, league_int, season_int)) is not None:
+				yield player
+
+	def _filename(self, league_int: Optional[int], season_int: Optional[int]) -> str:
+		if league_int and season_int:
+			return f"{self.file_prefix}_league_{league_int}_season_{season_int}.csv"
+		return f'{self.file_prefix}.csv'
+
+	def _check_empty(self, count: int, raw: Optional[Dict[str, Any]], league_int: Optional[int], season_int: Optional[int]) -> None:
+		if count == 0:
+			self._log_empty_response(league_int, season_int)
+			logger.debug(f"Resposta vazia de {self.endpoint}: {_payload_excerpt(raw)}")
+
+	def iter_players(self, **params) -> Iterator[PlayerSummary]:
+		"""Gera os jogadores página a página."""
 		league_int, season_int = self._parse_params(params)
-		
-		if not self._check_targets(league_int, season_int):
-			return []
-		
-		if league_int is not None and season_int is not None:
-			if self._check_cache("top_scorers", league_int, season_int):
-				return []
+		count = 0
+		raw = None
+		for raw in self.client.iter_pages(self.endpoint, params):
+			self._remember_entities(raw)
+			for player in self._parse_page(raw, league_int, season_int):
+				count += 1
+				yield player
+		self._check_empty(count, raw, league_int, season_int)
 
-		raw = self.client._get("players/topscorers", params)
-		response_data = raw.get('response', [])
-		
-		if not response_data:
-			logger.error(f"Nenhum top scorer retornado para league={league_int}, season={season_int}")
-			print(raw)
-		
-		results = [
-			player for item in response_data
-			if (player := self._parse_player_data(item, "topscorers", league_int, season_int)) is not None
-		]
-		
-		filename = f"top_scorers_league_{league_int}_season_{season_int}.csv" if league_int and season_int else 'top_scorers.csv'
-		CSVWriter.write_players(filename, results)
+	def _write_page(self, writer: Any, raw: Dict[str, Any], league_int: Optional[int], season_int: Optional[int],
+					collect: Optional[List[PlayerSummary]] = None) -> int:
+		"""Grava uma página no CSV; com collect os modelos pydantic também são devolvidos."""
+		self._remember_entities(raw)
+		if self.batch_parsing and collect is None:
+			from .batch_parsing import PlayerBatch
+
+			batch = PlayerBatch.from_response(raw.get('response', []), self.category).filter_valid()
+			writer.write_batch(batch)
+			return len(batch)
+		count = 0
+		for player in self._parse_page(raw, league_int, season_int):
+			count += 1
+			writer.write(player)
+			if collect is not None:
+				collect.append(player)
+		return count
+
+	def _export(self, params: Dict[str, Any], collect: Optional[List[PlayerSummary]] = None) -> int:
+		league_int, season_int = self._parse_params(params)
+		if not self._should_fetch(league_int, season_int):
+			return 0
+		count = 0
+		raw = None
+		with CSVWriter.open_players(self._filename(league_int, season_int)) as writer:
+			for raw in self.client.iter_pages(self.endpoint, params):
+				count += self._write_page(writer, raw, league_int, season_int, collect)
+		self._check_empty(count, raw, league_int, season_int)
+		return writer.rows_written
+
+	async def _aexport(self, params: Dict[str, Any]) -> int:
+		league_int, season_int = self._parse_params(params)
+		if not self._should_fetch(league_int, season_int):
+			return 0
+		count = 0
+		raw = None
+		with CSVWriter.open_players(self._filename(league_int, season_int)) as writer:
+			async for raw in self.client.aiter_pages(self.endpoint, params):
+				count += self._write_page(writer, raw, league_int, season_int)
+		self._check_empty(count, raw, league_int, season_int)
+		return writer.rows_written
+
+	def _fetch(self, params: Dict[str, Any]) -> List[PlayerSummary]:
+		results: List[PlayerSummary] = []
+		self._export(params, collect=results)
 		return results
 
 
+class TopScorersService(BasePlayerService):
+	endpoint = "players/topscorers"
+	category = "topscorers"
+	file_prefix = "top_scorers"
+
+	def _log_empty_response(self, league_int: Optional[int], season_int: Optional[int]) -> None:
+		logger.error(f"Nenhum top scorer retornado para league={league_int}, season={season_int}")
+
+	def get_topscorers(self, **params) -> List[PlayerSummary]:
+		return self._fetch(params)
+
+	def export_topscorers(self, **params) -> int:
+		"""Grava os artilheiros em streaming; retorna o total de linhas."""
+		return self._export(params)
+
+	async def aexport_topscorers(self, **params) -> int:
+		"""Versão assíncrona de export_topscorers; requer AsyncAPIFootballClient."""
+		return await self._aexport(params)
+
+
 class TopAssistsService(BasePlayerService):
+	endpoint = "players/topassists"
+	category = "topassists"
+	file_prefix = "top_assists"
+
+	def _log_empty_response(self, league_int: Optional[int], season_int: Optional[int]) -> None:
+		logger.warning(f"Nenhum top assist retornado para league={league_int}, season={season_int}")
+
 	def get_topassists(self, **params) -> List[PlayerSummary]:
+		return self._fetch(params)
+
+	def export_topassists(self, **params) -> int:
+		"""Grava as assistências em streaming; retorna o total de linhas."""
+		return self._export(params)
+
+	async def aexport_topassists(self, **params) -> int:
+		"""Versão assíncrona de export_topassists; requer AsyncAPIFootballClient."""
+		return await self._aexport(params)
+
+
+class SquadStatsService(BasePlayerService):
+	"""Estatísticas de temporada de todos os jogadores da liga (endpoint paginado `players`).
+
+	A primeira página informa o total de páginas. O cliente síncrono busca as demais em
+	sequência (sessão, cache e journal não são compartilháveis entre threads); com o
+	AsyncAPIFootballClient elas ficam em voo juntas, disputando os tokens do rate limiter
+	como qualquer outra chamada. Cada entrada de
+	`statistics` da liga vira uma linha (quem trocou de time na temporada aparece uma vez
+	por time); entradas de outras ligas ficam na partição da própria liga e jogadores
+	repetidos entre páginas são descartados.
+	"""
+
+	endpoint = "players"
+	category = "squad"
+	file_prefix = "squad_stats"
+
+	def plan_state(self, **params) -> tuple[str, int]:
+		"""Sem resposta em cache o total de páginas é desconhecido: usa a estimativa."""
+		state, calls = super().plan_state(**params)
+		if state == STATE_MISSING:
+			return state, ESTIMATED_SQUAD_PAGES
+		return state, calls
+
+	@staticmethod
+	def _total_pages(raw: Optional[Dict[str, Any]]) -> int:
+		paging = (raw or {}).get('paging') or {}
+		try:
+			return max(1, int(paging.get('total') or 1))
+		except (TypeError, ValueError):
+			return 1
+
+	@staticmethod
+	def _page_params(params: Dict[str, Any], page: int) -> Dict[str, Any]:
+		page_params = dict(params)
+		# Mesmo formato de iter_pages: `page` só a partir da segunda página (mesma chave de cache)
+		if page > 1:
+			page_params['page'] = page
+		return page_params
+
+	def _parse_squad_page(self, raw: Optional[Dict[str, Any]], league_int: Optional[int], season_int: Optional[int],
+						  seen: set) -> Iterator[PlayerSummary]:
+		for item in (raw or {}).get('response', []):
+			player_data = item.get('player') or {}
+			for stat in item.get('statistics') or []:
+				stat_league = (stat.get('league') or {}).get('id')
+				if league_int is not None and stat_league is not None and stat_league != league_int:
+					continue
+				key = (player_data.get('id'), (stat.get('team') or {}).get('id'))
+				if key in seen:
+					continue
+				seen.add(key)
+				if (player := self._summary(player_data, stat, self.category, league_int, season_int)) is not None:
+					yield player
+
+	def _write_squad_page(self, writer: Any, raw: Optional[Dict[str, Any]], league_int: Optional[int],
+						  season_int: Optional[int], seen: set, collect: Optional[List[PlayerSummary]]) -> int:
+		self._remember_entities(raw)
+		count = 0
+		for player in self._parse_squad_page(raw, league_int, season_int, seen):
+			writer.write(player)
+			count += 1
+			if collect is not None:
+				collect.append(player)
+		return count
+
+	def _export_squad(self, params: Dict[str, Any], collect: Optional[List[PlayerSummary]] = None) -> int:
 		league_int, season_int = self._parse_params(params)
-		
-		if not self._check_targets(league_int, season_int):
-			return []
-		
-		if league_int is not None and season_int is not None:
-			if self._check_cache("top_assists", league_int, season_int):
-				return []
+		if not self._should_fetch(league_int, season_int):
+			return 0
+		first = self.client._get(self.endpoint, params)
+		pages = self._total_pages(first)
+		logger.info(f"Elencos league={league_int} season={season_int}: {pages} página(s)")
+		seen: set = set()
+		with CSVWriter.open_players(self._filename(league_int, season_int)) as writer:
+			count = self._write_squad_page(writer, first, league_int, season_int, seen, collect)
+			for page in range(2, pages + 1):
+				raw = self.client._get(self.endpoint, self._page_params(params, page))
+				count += self._write_squad_page(writer, raw, league_int, season_int, seen, collect)
+		self._check_empty(count, first, league_int, season_int)
+		return writer.rows_written
 
-		raw = self.client._get("players/topassists", params)
-		response_data = raw.get('response', [])
-		
-		if not response_data:
-			logger.warning(f"Nenhum top assist retornado para league={league_int}, season={season_int}")
-			print(raw)
-		
-		results = [
-			player for item in response_data
-			if (player := self._parse_player_data(item, "topassists", league_int, season_int)) is not None
-		]
-		
-		filename = f"top_assists_league_{league_int}_season_{season_int}.csv" if league_int and season_int else 'top_assists.csv'
-		CSVWriter.write_players(filename, results)
-		return results
\ No newline at end of file
+	async def _aexport_squad(self, params: Dict[str, Any]) -> int:
+		league_int, season_int = self._parse_params(params)
+		if not self._should_fetch(league_int, season_int):
+			return 0
+		first = await self.client._get(self.endpoint, params)
+		pages = self._total_pages(first)
+		logger.info(f"Elencos league={league_int} season={season_int}: {pages} página(s)")
+		# Janela de max_concurrency páginas em voo, gravadas na ordem assim que chegam: no
+		# máximo uma janela fica em memória, como na exportação página a página
+		window = max(1, getattr(self.client, 'max_concurrency', 1))
+		remaining_pages = iter(range(2, pages + 1))
+		in_flight: deque = deque()
+
+		def schedule() -> None:
+			for page in remaining_pages:
+				in_flight.append(asyncio.create_task(self.client._get(self.endpoint, self._page_params(params, page))))
+				if len(in_flight) >= window:
+					break
+
+		seen: set = set()
+		try:
+			with CSVWriter.open_players(self._filename(league_int, season_int)) as writer:
+				count = self._write_squad_page(writer, first, league_int, season_int, seen, None)
+				schedule()
+				while in_flight:
+					raw = await in_flight.popleft()
+					schedule()
+					count += self._write_squad_page(writer, raw, league_int, season_int, seen, None)
+		finally:
+			for task in in_flight:
+				task.cancel()
+		self._check_empty(count, first, league_int, season_int)
+		return writer.rows_written
+
+	def get_squad_stats(self, **params) -> List[PlayerSummary]:
+		results: List[PlayerSummary] = []
+		self._export_squad(params, collect=results)
+		return results
+
+	def export_squad_stats(self, **params) -> int:
+		"""Grava as estatísticas de todos os jogadores da liga-temporada; retorna o total de linhas."""
+		return self._export_squad(params)
+
+	async def aexport_squad_stats(self, **params) -> int:
+		"""Versão assíncrona de export_squad_stats; requer AsyncAPIFootballClient."""
+		return await self._aexport_squad(params)
+
+
+class ProfileService(BaseService):
+	"""Perfis de jogadores (`players/profiles`) e times (`teams`) por id.
+
+	Consulta primeiro o cadastro do cliente (EntityStore): jogadores vistos em qualquer
+	endpoint de players já têm o perfil completo e não gastam chamada; times vistos só em
+	fixtures têm nome e escudo, e a primeira consulta completa o perfil (país, fundação, estádio).
+	"""
+
+	def _entities(self) -> Optional[EntityStore]:
+		return getattr(self.client, 'entities', None)
+
+	def _known(self, kind: str, entity_id: int) -> Optional[Dict[str, Any]]:
+		entities = self._entities()
+		if entities is not None and entities.has_profile(kind, entity_id):
+			return entities.get(kind, entity_id)
+		return None
+
+	def _store_team(self, raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+		response = (raw or {}).get('response') or []
+		if not response:
+			return None
+		item = response[0]
+		profile = {**(item.get('team') or {}), 'venue': item.get('venue')}
+		if (entities := self._entities()) is not None:
+			entities.remember(TEAMS, [profile], complete=True)
+			return entities.get(TEAMS, profile.get('id'))
+		return profile
+
+	def _store_player(self, raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+		response = (raw or {}).get('response') or []
+		if not response:
+			return None
+		profile = response[0].get('player') or {}
+		if (entities := self._entities()) is not None:
+			entities.remember(PLAYERS, [profile], complete=True)
+			return entities.get(PLAYERS, profile.get('id'))
+		return profile
+
+	def get_team(self, team_id: int) -> Optional[Dict[str, Any]]:
+		"""Perfil do time, do cadastro quando completo; senão de uma chamada a `teams?id=`."""
+		if (profile := self._known(TEAMS, team_id)) is not None:
+			return profile
+		return self._store_team(self.client._get("teams", {'id': team_id}))
+
+	def get_player(self, player_id: int) -> Optional[Dict[str, Any]]:
+		"""Perfil do jogador, do cadastro quando completo; senão de `players/profiles?player=`."""
+		if (profile := self._known(PLAYERS, player_id)) is not None:
+			return profile
+		return self._store_player(self.client._get("players/profiles", {'player': player_id}))
+
+	async def aget_team(self, team_id: int) -> Optional[Dict[str, Any]]:
+		"""Versão assíncrona de get_team; requer AsyncAPIFootballClient."""
+		if (profile := self._known(TEAMS, team_id)) is not None:
+			return profile
+		return self._store_team(await self.client._get("teams", {'id': team_id}))
+
+	async def aget_player(self, player_id: int) -> Optional[Dict[str, Any]]:
+		"""Versão assíncrona de get_player; requer AsyncAPIFootballClient."""
+		if (profile := self._known(PLAYERS, player_id)) is not None:
+			return profile
+		return self._store_player(await self.client._get("players/profiles", {'player': player_id}))
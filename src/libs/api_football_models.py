@@ -18,6 +18,7 @@ class FixtureResult(BaseModel):
 	away_team: FixtureTeam
 	fulltime_home: Optional[int]
 	fulltime_away: Optional[int]
+	status: Optional[str] = None
 
 
 class PlayerSummary(BaseModel):
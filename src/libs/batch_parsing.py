@@ -0,0 +1,180 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .utils import FIXTURE_FIELDNAMES, PLAYER_FIELDNAMES, setup_logger
+
+logger = setup_logger(__name__)
+
+_INVALID = object()
+
+
+def _coerce_int(value: Any) -> Any:
+    """Coerção tolerante (mesmas regras práticas do pydantic em modo lax); _INVALID se falhar."""
+    if value is None or type(value) is int:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return _INVALID
+    return _INVALID
+
+
+def _int_array(values: List[Any]) -> tuple[pa.Array, Optional[List[bool]]]:
+    """Converte uma coluna para int64; retorna também a máscara de inválidos, se houver.
+
+    O caminho comum (só int/None) é uma única conversão em C; apenas colunas com
+    tipos inesperados passam pela coerção item a item.
+    """
+    try:
+        return pa.array(values, type=pa.int64()), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        coerced = [_coerce_int(value) for value in values]
+        invalid = [value is _INVALID for value in coerced]
+        return pa.array([None if value is _INVALID else value for value in coerced], type=pa.int64()), invalid
+
+
+def _str_array(values: List[Any]) -> tuple[pa.Array, Optional[List[bool]]]:
+    try:
+        return pa.array(values, type=pa.string()), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        invalid = [value is not None and not isinstance(value, str) for value in values]
+        return pa.array([None if bad else value for value, bad in zip(values, invalid)], type=pa.string()), invalid
+
+
+class ColumnBatch:
+    """Página da API em colunas (uma lista por campo), sem um objeto por item.
+
+    Subclasses definem os campos, seus tipos e os obrigatórios; a validação é feita
+    coluna a coluna via pyarrow e devolve uma máscara de linhas válidas.
+    """
+
+    __slots__ = ("columns",)
+
+    int_fields: Sequence[str] = ()
+    str_fields: Sequence[str] = ()
+    required_fields: Sequence[str] = ()
+
+    def __init__(self, columns: Dict[str, List[Any]]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def to_arrow(self) -> tuple[pa.Table, pa.BooleanArray]:
+        """Retorna a tabela tipada e a máscara de validade (tipos corretos e obrigatórios presentes)."""
+        arrays: Dict[str, pa.Array] = {}
+        valid = pa.array([True] * len(self), type=pa.bool_())
+        for name in self.columns:
+            converter = _int_array if name in self.int_fields else _str_array
+            array, invalid = converter(self.columns[name])
+            arrays[name] = array
+            if invalid is not None:
+                valid = pc.and_(valid, pc.invert(pa.array(invalid, type=pa.bool_())))
+            if name in self.required_fields:
+                valid = pc.and_(valid, pc.is_valid(array))
+        return pa.table(arrays), valid
+
+    def valid_mask(self) -> pa.BooleanArray:
+        return self.to_arrow()[1]
+
+    def filter_valid(self) -> "ColumnBatch":
+        """Descarta as linhas inválidas (o equivalente ao ValidationError do caminho pydantic)."""
+        table, valid = self.to_arrow()
+        invalid_count = len(self) - pc.sum(valid).as_py() if len(self) else 0
+        if not invalid_count:
+            return self
+        logger.warning(f"{type(self).__name__}: {invalid_count} itens descartados na validação")
+        return type(self)(table.filter(valid).to_pydict())
+
+    def rows(self, fieldnames: Sequence[str]) -> Iterator[tuple]:
+        """Linhas como tuplas na ordem de fieldnames (prontas para csv.writer)."""
+        return zip(*(self.columns[name] for name in fieldnames))
+
+
+class FixtureBatch(ColumnBatch):
+    __slots__ = ()
+
+    int_fields = (
+        'fixture_id', 'league_id', 'season', 'home_team_id', 'away_team_id',
+        'fulltime_home', 'fulltime_away',
+    )
+    str_fields = ('date', 'league_name', 'home_team_name', 'away_team_name', 'status')
+    required_fields = ('fixture_id', 'date')
+
+    @classmethod
+    def from_response(cls, response: List[Dict[str, Any]]) -> "FixtureBatch":
+        """Converte o array `response` de /fixtures em colunas, num único passe."""
+        columns: Dict[str, List[Any]] = {name: [] for name in FIXTURE_FIELDNAMES + ['league_id', 'season']}
+        fixture_id, date, status = columns['fixture_id'].append, columns['date'].append, columns['status'].append
+        league_id, league_name, season = columns['league_id'].append, columns['league_name'].append, columns['season'].append
+        home_id, home_name = columns['home_team_id'].append, columns['home_team_name'].append
+        away_id, away_name = columns['away_team_id'].append, columns['away_team_name'].append
+        ft_home, ft_away = columns['fulltime_home'].append, columns['fulltime_away'].append
+
+        for item in response:
+            fixture_info = item.get('fixture') or {}
+            league_info = item.get('league') or {}
+            teams_info = item.get('teams') or {}
+            home = teams_info.get('home') or {}
+            away = teams_info.get('away') or {}
+            fulltime = (item.get('score') or {}).get('fulltime') or {}
+
+            fixture_id(fixture_info.get('id'))
+            date(fixture_info.get('date'))
+            status((fixture_info.get('status') or {}).get('short'))
+            league_id(league_info.get('id'))
+            league_name(league_info.get('name'))
+            season(league_info.get('season'))
+            home_id(home.get('id'))
+            home_name(home.get('name'))
+            away_id(away.get('id'))
+            away_name(away.get('name'))
+            ft_home(fulltime.get('home'))
+            ft_away(fulltime.get('away'))
+        return cls(columns)
+
+
+class PlayerBatch(ColumnBatch):
+    __slots__ = ()
+
+    int_fields = (
+        'player_id', 'team_id', 'appearences', 'minutes', 'goals', 'assists', 'shots_total',
+    )
+    str_fields = ('category', 'player_name', 'team_name')
+    required_fields = ('category',)
+
+    @classmethod
+    def from_response(cls, response: List[Dict[str, Any]], category: str) -> "PlayerBatch":
+        """Converte o array `response` de players/top* em colunas (primeira estatística de cada jogador)."""
+        columns: Dict[str, List[Any]] = {name: [] for name in PLAYER_FIELDNAMES}
+        player_id, player_name = columns['player_id'].append, columns['player_name'].append
+        team_id, team_name = columns['team_id'].append, columns['team_name'].append
+        appearences, minutes = columns['appearences'].append, columns['minutes'].append
+        goals, assists, shots = columns['goals'].append, columns['assists'].append, columns['shots_total'].append
+
+        for item in response:
+            player = item.get('player') or {}
+            statistics = item.get('statistics') or []
+            primary_stat = statistics[0] if statistics else {}
+            games = primary_stat.get('games') or {}
+            goal_stats = primary_stat.get('goals') or {}
+            team = primary_stat.get('team') or {}
+
+            player_id(player.get('id'))
+            player_name(player.get('name'))
+            team_id(team.get('id'))
+            team_name(team.get('name'))
+            appearences(games.get('appearences'))
+            minutes(games.get('minutes'))
+            goals(goal_stats.get('total'))
+            assists(goal_stats.get('assists'))
+            shots((primary_stat.get('shots') or {}).get('total'))
+        columns['category'] = [category] * len(columns['player_id'])
+        return cls(columns)
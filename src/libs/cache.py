@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .utils import DATA_DIR, ConfigLoader, setup_logger, write_json_gz
+
+logger = setup_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'responses')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# TTL (segundos) de respostas da temporada corrente; temporadas encerradas não expiram
+DEFAULT_LIVE_TTLS: Dict[str, float] = {
+    "fixtures": 10 * 60,
+    "players/topscorers": 60 * 60,
+    "players/topassists": 60 * 60,
+}
+DEFAULT_LIVE_TTL = 30 * 60
+
+
+def _normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    return {str(key): str(value) for key, value in sorted((params or {}).items()) if value is not None}
+
+
+class ResponseCache:
+    """Cache em disco (JSON gzip) das respostas da API, endereçado por endpoint + parâmetros.
+
+    Um acerto devolve o payload já decodificado, então reprocessar dados de temporadas
+    encerradas não consome cota. Respostas da temporada corrente expiram pelo TTL do
+    endpoint e, se a API falhar, a última versão pode ser servida como fallback.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        current_season: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        live_ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.cache_dir = Path(cache_dir or os.getenv("API_FOOTBALL_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        if current_season is None:
+            seasons = ConfigLoader.load_seasons()
+            current_season = max(seasons) if seasons else None
+        self.current_season = current_season
+        if max_bytes is None:
+            max_mb = os.getenv("API_FOOTBALL_CACHE_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+        self.live_ttls = {**DEFAULT_LIVE_TTLS, **(live_ttls or {})}
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Chave estável: mesma requisição lógica → mesma chave, independente da ordem dos params."""
+        payload = json.dumps(
+            {"endpoint": endpoint.strip("/"), "params": _normalize_params(params)},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def ttl_for(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """TTL da entrada em segundos; None significa que nunca expira."""
+        season = (params or {}).get("season")
+        try:
+            season = int(season) if season is not None else None
+        except (TypeError, ValueError):
+            season = None
+        if season is not None and self.current_season is not None and season < self.current_season:
+            return None
+        return self.live_ttls.get(endpoint.strip("/"), DEFAULT_LIVE_TTL)
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, allow_stale: bool = False) -> Optional[Any]:
+        """Retorna o payload em cache, ou None se ausente (ou expirado, salvo allow_stale)."""
+        path = self._path(self.make_key(endpoint, params))
+        if not path.exists():
+            return None
+        entry = self._read(path)
+        if entry is None:
+            return None
+
+        ttl = self.ttl_for(endpoint, params)
+        if not allow_stale and ttl is not None and time.time() - entry.get("stored_at", 0) > ttl:
+            return None
+
+        # mtime marca o último acesso, usado na remoção por tamanho
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("payload")
+
+    def peek(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Lê a entrada (stored_at, payload) sem checar TTL nem marcar acesso; para planejamento."""
+        path = self._path(self.make_key(endpoint, params))
+        if not path.exists():
+            return None
+        return self._read(path)
+
+    def is_entry_fresh(self, entry: Dict[str, Any], endpoint: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Aplica o TTL do endpoint a uma entrada obtida por peek."""
+        ttl = self.ttl_for(endpoint, params)
+        return ttl is None or time.time() - entry.get("stored_at", 0) <= ttl
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], payload: Any) -> None:
+        """Armazena o payload comprimido (escrita atômica) e aplica o limite de tamanho."""
+        path = self._path(self.make_key(endpoint, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "stored_at": time.time(),
+            "endpoint": endpoint.strip("/"),
+            "params": _normalize_params(params),
+            "payload": payload,
+        }
+        previous_size = path.stat().st_size if path.exists() else 0
+        write_json_gz(path, entry)
+
+        if self._total_bytes is not None:
+            self._total_bytes += path.stat().st_size - previous_size
+        self._evict_if_needed()
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_if_needed(self) -> None:
+        """Remove as entradas menos usadas recentemente até ficar abaixo de 90% do limite."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        logger.info(f"Cache de respostas: {removed} entradas removidas ({total / 1024 / 1024:.1f} MB restantes)")
@@ -0,0 +1,223 @@
+"""Linha de comando do pipeline: extract, upload, load, register-partitions e report.
+
+Cada subcomando importa só o backend da própria etapa: `extract` não carrega boto3 nem
+psycopg2, `load` não carrega o SDK da AWS e `report` só lê o último relatório de métricas.
+Sem subcomando, roda o pipeline completo (extração → S3 → Glue), como antes.
+
+Tempo de inicialização por módulo: python -X importtime main.py report 2> importtime.log
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .env import load_env
+
+CSV_COMPRESSION_CHOICES = ("none", "gzip", "zstd")
+PROFILE_STAGE_CHOICES = ("extract", "parquet", "financial", "s3", "postgres", "glue")
+
+
+def _data_dir() -> Path:
+    from .utils import DATA_DIR
+
+    return Path(DATA_DIR).resolve()
+
+
+def _build_pipeline(args: argparse.Namespace, **stages: bool) -> Any:
+    from .pipeline import APIFootballExtractionPipeline
+
+    return APIFootballExtractionPipeline(
+        fixture_details=args.fixture_details,
+        squad_stats=args.squad_stats,
+        csv_compression=args.csv_compression,
+        async_extraction=args.async_extraction,
+        delta_refresh=args.delta,
+        enable_parquet=args.parquet,
+        resume=not args.no_resume,
+        metrics_dir=args.metrics_dir,
+        profile_stage=args.profile_stage,
+        **stages,
+    )
+
+
+def _run_pipeline(pipeline: Any, dry_run: bool) -> int:
+    if dry_run:
+        pipeline.dry_run()
+    else:
+        pipeline.run()
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """Pipeline completo. Para analytics, S3 + Athena bastam (PostgreSQL desabilitado)."""
+    pipeline = _build_pipeline(args, enable_s3=True, enable_postgres=False, enable_glue=True)
+    return _run_pipeline(pipeline, args.dry_run)
+
+
+def cmd_extract(args: argparse.Namespace) -> int:
+    """Só a extração da API (com --parquet, também a conversão Parquet e o financeiro tipado), sem S3/Glue/PostgreSQL."""
+    pipeline = _build_pipeline(args, enable_s3=False, enable_postgres=False, enable_glue=False)
+    return _run_pipeline(pipeline, args.dry_run)
+
+
+def _register_keys(s3_keys: List[str], wait: bool) -> None:
+    """Registra as partições no Glue; sem GLUE_DATABASE_NAME (ou se falhar), usa os crawlers, como o pipeline."""
+    import os
+
+    from .storage import GlueCrawlerRunner, GluePartitionRegistrar
+    from .utils import setup_logger
+
+    if os.getenv("GLUE_DATABASE_NAME"):
+        try:
+            GluePartitionRegistrar().register_keys(s3_keys, wait=wait)
+            return
+        except Exception as e:
+            setup_logger(__name__).error(f"Erro ao registrar partições no Glue, usando crawler: {e}")
+    GlueCrawlerRunner().start_all_crawlers()
+
+
+def cmd_upload(args: argparse.Namespace) -> int:
+    """Normaliza os CSVs financeiros e sincroniza sport/ e financial/ com o S3.
+
+    Com --register, registra as partições de tudo o que está em sport/ no S3 (não só do que
+    mudou neste envio): partições inalteradas que nunca foram registradas também aparecem.
+    """
+    from .financial import FinancialNormalizer
+    from .storage import S3Uploader
+
+    data_dir = _data_dir()
+    FinancialNormalizer.convert_financial_data(data_dir)
+    uploader = S3Uploader(compression=args.csv_compression)
+    uploader.sync_sport_data(data_dir, include_parquet=args.parquet)
+    uploader.sync_financial_data(data_dir, include_parquet=True)
+    if args.register:
+        _register_keys(list(uploader.list_objects("sport/")), args.wait)
+    return 0
+
+
+def cmd_load(args: argparse.Namespace) -> int:
+    """Cria o schema e carrega os CSVs locais no PostgreSQL."""
+    from .storage import PostgresLoader
+
+    loader = PostgresLoader()
+    loader.create_schema()
+    loader.load_all_data(_data_dir(), incremental=not args.full_reload)
+    return 0
+
+
+def cmd_register_partitions(args: argparse.Namespace) -> int:
+    """Registra no Glue as partições de todas as chaves já presentes em sport/ no S3."""
+    from .storage import S3Uploader
+
+    _register_keys(list(S3Uploader().list_objects("sport/")), args.wait)
+    return 0
+
+
+def format_report(report: dict) -> str:
+    """Resumo legível de um relatório de métricas (run_<timestamp>.json)."""
+    lines = [f"Execução de {report.get('started_at')}: {report.get('wall_seconds', 0):.1f}s"]
+    for key, stage in (report.get("stages") or {}).items():
+        status = f"  ERRO: {stage['error']}" if stage.get("error") else ""
+        lines.append(f"  {key:<10} {stage.get('label', key):<28} {stage.get('seconds', 0):>8.1f}s{status}")
+    api = report.get("api") or {}
+    endpoints = api.get("endpoints") or {}
+    calls = sum(endpoint.get("calls", 0) for endpoint in endpoints.values())
+    cache_hits = sum(endpoint.get("cache_hits", 0) for endpoint in endpoints.values())
+    lines.append(
+        f"API: {calls} chamadas, {cache_hits} do cache, "
+        f"{api.get('rate_limit_sleep_seconds', 0):.1f}s de espera no rate limit, "
+        f"cota restante {api.get('quota_remaining', '?')}"
+    )
+    for endpoint, stats in sorted(endpoints.items()):
+        latency = stats.get("latency") or {}
+        p95 = latency.get("p95_seconds")
+        lines.append(
+            f"  {endpoint:<22} {stats.get('calls', 0):>6} chamadas"
+            + (f", p95 {p95:.3f}s" if p95 is not None else "")
+        )
+    if report.get("rows"):
+        lines.append("Linhas: " + ", ".join(f"{kind}={rows}" for kind, rows in sorted(report["rows"].items())))
+    return "\n".join(lines)
+
+
+def cmd_report(args: argparse.Namespace) -> int:
+    """Imprime o relatório da última execução (data/.state/metrics ou PIPELINE_METRICS_DIR)."""
+    from .metrics import latest_report, resolve_metrics_dir
+
+    report = latest_report(args.metrics_dir)
+    if report is None:
+        print(f"Nenhum relatório em {resolve_metrics_dir(args.metrics_dir)}")
+        return 1
+    print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_report(report))
+    return 0
+
+
+def _add_extraction_args(parser: argparse.ArgumentParser, **defaults: Any) -> None:
+    """Opções da extração; nos subcomandos vão com default=SUPPRESS (ver build_parser)."""
+    parser.add_argument("--dry-run", action="store_true", help="imprime o plano de extração sem gastar cota", **defaults)
+    parser.add_argument("--fixture-details", action="store_true",
+                        help="extrai estatísticas, eventos e escalações das partidas encerradas (20 por chamada)",
+                        **defaults)
+    parser.add_argument("--squad-stats", action="store_true",
+                        help="extrai as estatísticas de temporada de todos os jogadores de cada liga", **defaults)
+    parser.add_argument("--csv-compression", choices=CSV_COMPRESSION_CHOICES,
+                        help="compressão dos CSVs gravados e enviados ao S3 (padrão: PIPELINE_CSV_COMPRESSION ou none)",
+                        **defaults)
+    parser.add_argument("--delta", action="store_true",
+                        help="na temporada corrente, rebusca só as partidas não finalizadas", **defaults)
+    parser.add_argument("--async", dest="async_extraction", action="store_true",
+                        help="várias requisições em voo sob o mesmo rate limit", **defaults)
+    parser.add_argument("--parquet", action="store_true", help="converte as partições alteradas em Parquet", **defaults)
+    parser.add_argument("--no-resume", action="store_true", help="ignora a execução interrompida e começa do zero",
+                        **defaults)
+    parser.add_argument("--profile-stage", choices=PROFILE_STAGE_CHOICES,
+                        help="anexa cProfile/tracemalloc à etapa (padrão: PIPELINE_PROFILE_STAGE)", **defaults)
+    parser.add_argument("--metrics-dir", type=Path,
+                        help="diretório dos relatórios de métricas (padrão: PIPELINE_METRICS_DIR)", **defaults)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Pipeline de extração API-Football",
+        epilog="Sem subcomando, executa o pipeline completo (extração, upload S3 e catálogo Glue).",
+    )
+    _add_extraction_args(parser)
+    parser.set_defaults(func=cmd_run)
+    subparsers = parser.add_subparsers(title="subcomandos")
+    # Opções repetidas nos subcomandos não têm default: senão o default do subcomando
+    # sobrescreveria o valor dado antes dele (main.py --async extract)
+    inherited = {"default": argparse.SUPPRESS}
+
+    extract = subparsers.add_parser("extract", help="extrai da API para data/sport (sem S3/Glue)")
+    _add_extraction_args(extract, **inherited)
+    extract.set_defaults(func=cmd_extract)
+
+    upload = subparsers.add_parser("upload", help="sincroniza data/ com o S3")
+    upload.add_argument("--csv-compression", choices=CSV_COMPRESSION_CHOICES,
+                        help="compressão aplicada no envio dos CSVs sem compressão", **inherited)
+    upload.add_argument("--parquet", action="store_true", help="inclui sport/parquet", **inherited)
+    upload.add_argument("--register", action="store_true", help="registra no Glue as partições enviadas")
+    upload.add_argument("--wait", action="store_true", help="com --register, aguarda as partições no catálogo")
+    upload.set_defaults(func=cmd_upload)
+
+    load = subparsers.add_parser("load", help="carrega data/sport no PostgreSQL")
+    load.add_argument("--full-reload", action="store_true", help="TRUNCATE + recarga em vez do incremental")
+    load.set_defaults(func=cmd_load)
+
+    register = subparsers.add_parser("register-partitions", help="registra no Glue as partições presentes no S3")
+    register.add_argument("--wait", action="store_true", help="aguarda as partições aparecerem no catálogo")
+    register.set_defaults(func=cmd_register_partitions)
+
+    report = subparsers.add_parser("report", help="resume o relatório de métricas da última execução")
+    report.add_argument("--json", action="store_true", help="imprime o relatório JSON completo")
+    report.add_argument("--metrics-dir", type=Path, help="diretório dos relatórios (padrão: PIPELINE_METRICS_DIR)",
+                        **inherited)
+    report.set_defaults(func=cmd_report)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Antes de qualquer outro módulo de libs: utils lê PIPELINE_DATA_DIR no import
+    load_env()
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,213 @@
+"""Eficiência dos clubes: resultados em campo × gasto em transferências e folha.
+
+Por clube e temporada: pontos, saldo de gols e pontos/gols por milhão (R$) gasto em
+contratações ou na folha. Tudo em operações colunares (pandas/NumPy). O resultado de
+cada partição season_*_league_* fica em cache (Parquet) e só é recalculado quando o
+hash das entradas (partição de fixtures + CSVs financeiros) muda.
+"""
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .financial import FinancialNormalizer
+from .standings import team_match_rows
+from .teams import TeamIdentityIndex, normalize_club_name
+from .utils import DATA_DIR, csv_stem, list_csv, open_csv, resolve_csv, setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_EFFICIENCY_CACHE_DIR = os.path.join(DATA_DIR, '.cache', 'efficiency')
+# Linhas do balanço tratadas como folha salarial (tipo ou classificação)
+DEFAULT_PAYROLL_PATTERN = r"folha|sal[aá]rio|pessoal|payroll"
+# Muda quando o cálculo muda, invalidando o cache
+ENGINE_VERSION = "2"
+MILLION = 1_000_000.0
+
+_FIXTURES_FILE = re.compile(r"season_(\d+)_league_(\d+)_results$")
+_CACHE_METADATA_KEY = b"input_hash"
+
+
+def team_season_results(fixtures: pd.DataFrame) -> pd.DataFrame:
+    """Agrega a partição por time: jogos, V/E/D, pontos, gols pró/contra e saldo."""
+    rows = team_match_rows(fixtures)
+    results = rows.groupby("team_id", sort=False).agg(
+        team_name=("team_name", "last"),
+        matches=("points", "size"),
+        wins=("win", "sum"),
+        draws=("draw", "sum"),
+        losses=("loss", "sum"),
+        points=("points", "sum"),
+        goals_for=("goals_for", "sum"),
+        goals_against=("goals_against", "sum"),
+    ).reset_index()
+    results["goal_diff"] = results["goals_for"] - results["goals_against"]
+    return results
+
+
+def _safe_ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    denominator = denominator.where(denominator > 0)
+    return numerator / denominator
+
+
+class EfficiencyEngine:
+    """Calcula e mantém em cache as métricas de eficiência por partição (season, league)."""
+
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        cache_dir: str | Path | None = None,
+        payroll_pattern: str = DEFAULT_PAYROLL_PATTERN,
+    ):
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.cache_dir = Path(cache_dir or os.getenv("EFFICIENCY_CACHE_DIR") or DEFAULT_EFFICIENCY_CACHE_DIR)
+        self.payroll_pattern = payroll_pattern
+        self.identity = TeamIdentityIndex(self.data_dir)
+        self._financial_hash: Optional[str] = None
+        self._spending: Optional[pd.DataFrame] = None
+        self._payroll: Optional[pd.DataFrame] = None
+
+    def _financial_files(self) -> List[Path]:
+        financial_dir = self.data_dir / "financial"
+        return sorted(path for dataset in ("transfers", "balances") for path in (financial_dir / dataset).glob("*.csv"))
+
+    def financial_hash(self) -> str:
+        """Hash das entradas financeiras, calculado uma vez por instância."""
+        if self._financial_hash is None:
+            digest = hashlib.sha256(f"{ENGINE_VERSION}|{self.payroll_pattern}|{self.identity.content_hash}".encode("utf-8"))
+            for path in self._financial_files():
+                digest.update(path.name.encode("utf-8"))
+                digest.update(path.read_bytes())
+            self._financial_hash = digest.hexdigest()
+        return self._financial_hash
+
+    def _input_hash(self, fixtures_path: Path) -> str:
+        digest = hashlib.sha256(self.financial_hash().encode("ascii"))
+        digest.update(fixtures_path.read_bytes())
+        return digest.hexdigest()
+
+    def spending(self) -> pd.DataFrame:
+        """Gasto em contratações por clube (team_id resolvido) e ano, em R$.
+
+        Entradas são as transferências com destino = clube; saídas, com origem = clube.
+        Usa real_value (corrigido pelo IPCA) e cai para fee_brl quando ausente.
+        """
+        if self._spending is not None:
+            return self._spending
+        transfers = FinancialNormalizer.load_dataset(self.data_dir, "transfers", self.identity).to_pandas()
+        if transfers.empty:
+            self._spending = pd.DataFrame(columns=["team_id", "season", "spend_brl", "net_spend_brl"])
+            return self._spending
+
+        value = transfers["real_value"].fillna(transfers["fee_brl"]).fillna(0.0)
+        year = pd.to_datetime(transfers["date"], errors="coerce").dt.year
+        year = year.fillna(pd.to_numeric(transfers["date_ano_mes"].astype("string").str[:4], errors="coerce"))
+        club = normalize_club_name(transfers["team"])
+        incoming = (normalize_club_name(transfers["to"]) == club).to_numpy()
+        outgoing = (normalize_club_name(transfers["from"]) == club).to_numpy()
+
+        frame = pd.DataFrame({
+            "team_id": transfers["team_id"],
+            "season": year,
+            "spend_brl": np.where(incoming, value, 0.0),
+            "net_spend_brl": np.where(incoming, value, 0.0) - np.where(outgoing, value, 0.0),
+        }).dropna(subset=["team_id", "season"])
+        frame = frame.astype({"team_id": "int64", "season": "int64"})
+        self._spending = frame.groupby(["team_id", "season"], as_index=False).sum()
+        return self._spending
+
+    def payroll(self) -> pd.DataFrame:
+        """Folha salarial por clube (team_id resolvido) e ano, a partir das colunas ano_YYYY do balanço."""
+        if self._payroll is not None:
+            return self._payroll
+        balances = FinancialNormalizer.load_dataset(self.data_dir, "balances", self.identity).to_pandas()
+        label = balances["tipo"].fillna("") + " " + balances["classificacao"].fillna("")
+        balances = balances.loc[label.str.contains(self.payroll_pattern, case=False, regex=True)]
+        year_columns = [column for column in balances.columns if column.startswith("ano_")]
+        frame = balances.dropna(subset=["team_id"]).astype({"team_id": "int64"}).melt(
+            id_vars="team_id", value_vars=year_columns, var_name="season", value_name="payroll_brl"
+        )
+        frame["season"] = frame["season"].str[4:].astype("int64")
+        # Despesas podem vir negativas no balanço: a folha é o valor absoluto
+        frame["payroll_brl"] = frame["payroll_brl"].abs()
+        self._payroll = frame.dropna(subset=["payroll_brl"]).groupby(["team_id", "season"], as_index=False).sum()
+        return self._payroll
+
+    def compute(self, fixtures: pd.DataFrame, season: int, league: int) -> pd.DataFrame:
+        """Métricas de uma partição (sem cache)."""
+        results = team_season_results(fixtures)
+        results.insert(0, "season", season)
+        results.insert(1, "league", league)
+        results["team_id"] = results["team_id"].astype("int64")
+
+        merged = results.merge(self.spending(), on=["team_id", "season"], how="left")
+        merged = merged.merge(self.payroll(), on=["team_id", "season"], how="left")
+        spend_mi = merged["spend_brl"] / MILLION
+        payroll_mi = merged["payroll_brl"] / MILLION
+        merged["spend_brl_mi"] = spend_mi.round(3)
+        merged["net_spend_brl_mi"] = (merged["net_spend_brl"] / MILLION).round(3)
+        merged["payroll_brl_mi"] = payroll_mi.round(3)
+        merged["points_per_mi_spent"] = _safe_ratio(merged["points"], spend_mi)
+        merged["goals_per_mi_spent"] = _safe_ratio(merged["goals_for"], spend_mi)
+        merged["points_per_mi_payroll"] = _safe_ratio(merged["points"], payroll_mi)
+        merged["goals_per_mi_payroll"] = _safe_ratio(merged["goals_for"], payroll_mi)
+        merged = merged.drop(columns=["spend_brl", "net_spend_brl", "payroll_brl"])
+        return merged.sort_values(["points", "goal_diff", "goals_for"], ascending=False, ignore_index=True)
+
+    def _cache_path(self, season: int, league: int) -> Path:
+        return self.cache_dir / f"season_{season}_league_{league}.parquet"
+
+    def _read_cached(self, path: Path, input_hash: str) -> Optional[pd.DataFrame]:
+        if not path.exists():
+            return None
+        try:
+            table = pq.read_table(path)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        if (table.schema.metadata or {}).get(_CACHE_METADATA_KEY) != input_hash.encode("ascii"):
+            return None
+        return table.to_pandas()
+
+    def _write_cached(self, path: Path, frame: pd.DataFrame, input_hash: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_METADATA_KEY: input_hash.encode("ascii")})
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def partition(self, season: int, league: int) -> pd.DataFrame:
+        """Métricas da partição, do cache quando as entradas não mudaram."""
+        fixtures_path = Path(resolve_csv(self.data_dir / "sport" / "seasons", f"season_{season}_league_{league}_results"))
+        input_hash = self._input_hash(fixtures_path)
+        cache_path = self._cache_path(season, league)
+        cached = self._read_cached(cache_path, input_hash)
+        if cached is not None:
+            return cached
+        with open_csv(fixtures_path) as f:
+            fixtures = pd.read_csv(f, dtype={"status": "string"}, keep_default_na=True)
+        frame = self.compute(fixtures, season, league)
+        self._write_cached(cache_path, frame, input_hash)
+        logger.info(f"Eficiência season={season} league={league}: {len(frame)} clubes recalculados")
+        return frame
+
+    def compute_all(self, seasons: Optional[List[int]] = None, leagues: Optional[List[int]] = None) -> pd.DataFrame:
+        """Métricas de todas as partições locais (opcionalmente filtradas)."""
+        frames: List[pd.DataFrame] = []
+        for csv_file in list_csv(self.data_dir / "sport" / "seasons", "season_*_league_*_results"):
+            match = _FIXTURES_FILE.match(csv_stem(csv_file))
+            if match is None:
+                continue
+            season, league = int(match[1]), int(match[2])
+            if (seasons and season not in seasons) or (leagues and league not in leagues):
+                continue
+            frames.append(self.partition(season, league))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,220 @@
+"""Cadastro de jogadores e times (team_id/player_id da API-Football), compartilhado entre ligas e temporadas.
+
+O mesmo clube aparece no Brasileirão (71) e nas continentais (11, 13), e o mesmo jogador
+em artilheiros, garçons, elencos e escalações. Os atributos de perfil (nome, foto,
+nacionalidade, país, fundação...) ficam uma vez só em SQLite, e as consultas passam por um
+LRU em memória. Serviços que buscam perfis consultam o cadastro antes de gastar uma chamada.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .utils import DATA_DIR, setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_ENTITY_DB = os.path.join(DATA_DIR, '.state', 'entities.sqlite')
+DEFAULT_ENTITY_CACHE_SIZE = 10_000
+
+PLAYERS = "players"
+TEAMS = "teams"
+ENTITY_KINDS = (PLAYERS, TEAMS)
+# Atributos que mudam a cada temporada/partida não fazem parte do perfil
+VOLATILE_ATTRIBUTES = {
+    PLAYERS: {"injured"},
+    TEAMS: {"winner"},
+}
+# Limite de variáveis por consulta do SQLite (versões antigas: 999)
+_SQLITE_MAX_VARIABLES = 900
+
+
+class _LRU:
+    """Dicionário com limite de itens que descarta o usado há mais tempo."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class EntityStore:
+    """Perfis de jogadores e times por id da API (SQLite + LRU em memória).
+
+    `remember()` mescla os atributos novos sobre os já conhecidos (valores nulos não apagam
+    nada) e só grava o que mudou. `complete` marca perfis vindos do endpoint de perfil
+    (ou de um payload equivalente), que dispensam nova chamada em `has_profile()`.
+    """
+
+    def __init__(self, db_path: str | Path | None = None, cache_size: int = DEFAULT_ENTITY_CACHE_SIZE):
+        self.db_path = Path(db_path or os.getenv("ENTITY_STORE_DB") or DEFAULT_ENTITY_DB)
+        self._lru = _LRU(cache_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for kind in ENTITY_KINDS:
+                conn.execute(
+                    f"""CREATE TABLE IF NOT EXISTS {kind} (
+                           id INTEGER PRIMARY KEY,
+                           name TEXT,
+                           attributes TEXT NOT NULL,
+                           complete INTEGER NOT NULL DEFAULT 0,
+                           updated_at REAL NOT NULL
+                       )"""
+                )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _check_kind(kind: str) -> None:
+        if kind not in ENTITY_KINDS:
+            raise ValueError(f"Tipo de entidade desconhecido: {kind} (use {', '.join(ENTITY_KINDS)})")
+
+    def _load(self, kind: str, ids: List[int]) -> Dict[int, tuple[Dict[str, Any], bool]]:
+        """Entradas (atributos, completo) de vários ids: LRU primeiro, o resto do SQLite de uma vez."""
+        found: Dict[int, tuple[Dict[str, Any], bool]] = {}
+        missing: List[int] = []
+        with self._lock:
+            for entity_id in ids:
+                entry = self._lru.get((kind, entity_id))
+                if entry is None:
+                    missing.append(entity_id)
+                else:
+                    found[entity_id] = entry
+            self.hits += len(found)
+            self.misses += len(missing)
+        if not missing:
+            return found
+        conn = self._connect()
+        try:
+            for start in range(0, len(missing), _SQLITE_MAX_VARIABLES):
+                chunk = missing[start:start + _SQLITE_MAX_VARIABLES]
+                rows = conn.execute(
+                    f"SELECT id, attributes, complete FROM {kind} WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for entity_id, attributes, complete in rows:
+                    found[entity_id] = (json.loads(attributes), bool(complete))
+        finally:
+            conn.close()
+        with self._lock:
+            for entity_id in missing:
+                if entity_id in found:
+                    self._lru.put((kind, entity_id), found[entity_id])
+        return found
+
+    def get(self, kind: str, entity_id: int) -> Optional[Dict[str, Any]]:
+        """Atributos conhecidos da entidade (cópia), ou None se nunca vista."""
+        self._check_kind(kind)
+        entry = self._load(kind, [int(entity_id)]).get(int(entity_id))
+        return dict(entry[0]) if entry is not None else None
+
+    def player(self, player_id: int) -> Optional[Dict[str, Any]]:
+        return self.get(PLAYERS, player_id)
+
+    def team(self, team_id: int) -> Optional[Dict[str, Any]]:
+        return self.get(TEAMS, team_id)
+
+    def has_profile(self, kind: str, entity_id: int) -> bool:
+        """Indica se o perfil completo já está no cadastro (dispensa a chamada à API)."""
+        self._check_kind(kind)
+        entry = self._load(kind, [int(entity_id)]).get(int(entity_id))
+        return entry is not None and entry[1]
+
+    def remember(self, kind: str, records: Iterable[Dict[str, Any]], complete: bool = False) -> int:
+        """Mescla e grava os registros (dicts com `id`) que trazem algo novo; retorna quantos mudaram."""
+        self._check_kind(kind)
+        volatile = VOLATILE_ATTRIBUTES[kind]
+        incoming: Dict[int, Dict[str, Any]] = {}
+        for record in records:
+            try:
+                entity_id = int(record.get("id"))
+            except (TypeError, ValueError):
+                continue
+            attributes = incoming.setdefault(entity_id, {})
+            attributes.update({key: value for key, value in record.items() if value is not None and key not in volatile})
+        if not incoming:
+            return 0
+
+        current = self._load(kind, list(incoming))
+        changed: Dict[int, tuple[Dict[str, Any], bool]] = {}
+        for entity_id, attributes in incoming.items():
+            known, known_complete = current.get(entity_id, ({}, False))
+            merged = {**known, **attributes}
+            if merged != known or (complete and not known_complete):
+                changed[entity_id] = (merged, complete or known_complete)
+        if not changed:
+            return 0
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                f"""INSERT INTO {kind} (id, name, attributes, complete, updated_at) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET name = excluded.name, attributes = excluded.attributes,
+                        complete = excluded.complete, updated_at = excluded.updated_at""",
+                [
+                    (entity_id, attributes.get("name"), json.dumps(attributes, ensure_ascii=False, sort_keys=True), int(is_complete), now)
+                    for entity_id, (attributes, is_complete) in changed.items()
+                ],
+            )
+        finally:
+            conn.close()
+        with self._lock:
+            for entity_id, entry in changed.items():
+                self._lru.put((kind, entity_id), entry)
+        return len(changed)
+
+    def remember_page(self, raw: Optional[Dict[str, Any]]) -> int:
+        """Registra jogadores e times de uma página de fixtures ou players."""
+        players: List[Dict[str, Any]] = []
+        teams: List[Dict[str, Any]] = []
+        for item in (raw or {}).get("response") or []:
+            # fixtures / fixtures?ids=: times mandante e visitante
+            sides = item.get("teams")
+            if isinstance(sides, dict):
+                teams.extend(side for side in sides.values() if isinstance(side, dict))
+            # players, players/topscorers...: perfil do jogador e times das estatísticas
+            if isinstance(item.get("player"), dict):
+                players.append(item["player"])
+                for stat in item.get("statistics") or []:
+                    if isinstance(stat.get("team"), dict):
+                        teams.append(stat["team"])
+        # O objeto `player` desses endpoints já é o perfil completo
+        return self.remember(PLAYERS, players, complete=True) + self.remember(TEAMS, teams)
+
+    def count(self, kind: str) -> int:
+        self._check_kind(kind)
+        conn = self._connect()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,14 @@
+"""Carga do .env, uma vez por processo.
+
+Fica fora de utils porque utils lê PIPELINE_DATA_DIR no import: a CLI carrega o .env
+antes de importar qualquer outro módulo de libs.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> bool:
+    """Carrega o .env do projeto (as chamadas seguintes não releem o arquivo)."""
+    from dotenv import load_dotenv
+
+    return load_dotenv()
@@ -0,0 +1,171 @@
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .parquet_writer import ParquetWriter
+from .teams import TeamIdentityIndex
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+TRANSFERS_NUMERIC_COLUMNS = ("fee_eur", "fee_brl", "ipca_rate", "real_value")
+BALANCES_NUMERIC_COLUMNS = ("ano_2022", "ano_2023", "ano_2024")
+
+# Tipos espelham as tabelas transfers_typed/balances_typed de terraform/glue.tf
+# Valores monetários ficam em unidades (não em milhões); a escala é aplicada nas views
+# team_id é o id da API-Football resolvido pelo TeamIdentityIndex (nulo se não resolvido)
+TRANSFERS_SCHEMA = pa.schema([
+    ("team", pa.string()),
+    ("player", pa.string()),
+    ("from", pa.string()),
+    ("to", pa.string()),
+    ("type", pa.string()),
+    ("date", pa.date32()),
+    ("date_ano_mes", pa.string()),
+    ("fee_eur", pa.float64()),
+    ("fee_brl", pa.float64()),
+    ("ipca_rate", pa.float64()),
+    ("real_value", pa.float64()),
+    ("team_id", pa.int32()),
+])
+
+BALANCES_SCHEMA = pa.schema([
+    ("time", pa.string()),
+    ("tipo", pa.string()),
+    ("classificacao", pa.string()),
+    ("ano_2022", pa.float64()),
+    ("ano_2023", pa.float64()),
+    ("ano_2024", pa.float64()),
+    ("team_id", pa.int32()),
+])
+
+# Metadado dos Parquet financeiros: hash do índice de times usado para resolver team_id
+_TEAM_INDEX_METADATA_KEY = b"team_index"
+
+
+def parse_brl_numbers(values: pd.Series) -> pd.Series:
+    """Converte números no formato brasileiro ("83.000.000,00") para float, vetorizado.
+
+    Vazios e valores inválidos viram NaN.
+    """
+    cleaned = (
+        values.astype("string")
+        .str.strip()
+        .str.replace('"', '', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+    )
+    return pd.to_numeric(cleaned.mask(cleaned == ''), errors='coerce').astype("float64")
+
+
+class FinancialNormalizer:
+    """Normaliza os CSVs financeiros (formato brasileiro) em Parquet tipado, uma vez na ingestão."""
+
+    @staticmethod
+    def _read_csv(csv_path: Path) -> pd.DataFrame:
+        return pd.read_csv(csv_path, dtype=str, keep_default_na=False, encoding='utf-8')
+
+    @staticmethod
+    def _to_table(frame: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+        # Colunas ausentes no CSV viram nulos
+        frame = frame.reindex(columns=schema.names)
+        for field in schema:
+            if pa.types.is_string(field.type):
+                frame[field.name] = frame[field.name].astype("string").mask(frame[field.name].isna() | (frame[field.name] == ''))
+        return pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+    @staticmethod
+    def _with_team_id(frame: pd.DataFrame, name_column: str, identity: TeamIdentityIndex | None) -> pd.DataFrame:
+        if identity is not None and name_column in frame:
+            frame["team_id"] = identity.resolve(frame[name_column])
+        return frame
+
+    @staticmethod
+    def normalize_transfers(csv_path: Path, identity: TeamIdentityIndex | None = None) -> pa.Table:
+        frame = FinancialNormalizer._read_csv(csv_path)
+        for column in TRANSFERS_NUMERIC_COLUMNS:
+            if column in frame:
+                frame[column] = parse_brl_numbers(frame[column])
+        if "date" in frame:
+            frame["date"] = pd.to_datetime(frame["date"], errors='coerce', format='ISO8601').dt.date
+        frame = FinancialNormalizer._with_team_id(frame, "team", identity)
+        return FinancialNormalizer._to_table(frame, TRANSFERS_SCHEMA)
+
+    @staticmethod
+    def normalize_balances(csv_path: Path, identity: TeamIdentityIndex | None = None) -> pa.Table:
+        frame = FinancialNormalizer._read_csv(csv_path)
+        for column in BALANCES_NUMERIC_COLUMNS:
+            if column in frame:
+                frame[column] = parse_brl_numbers(frame[column])
+        frame = FinancialNormalizer._with_team_id(frame, "time", identity)
+        return FinancialNormalizer._to_table(frame, BALANCES_SCHEMA)
+
+    @staticmethod
+    def _is_current(csv_path: Path, parquet_path: Path, identity: TeamIdentityIndex) -> bool:
+        """Parquet mais novo que o CSV e resolvido com o mesmo índice de times."""
+        if not ParquetWriter._is_up_to_date(csv_path, parquet_path):
+            return False
+        try:
+            metadata = pq.read_schema(parquet_path).metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return False
+        return metadata.get(_TEAM_INDEX_METADATA_KEY) == identity.content_hash.encode("ascii")
+
+    @staticmethod
+    def _tag(table: pa.Table, identity: TeamIdentityIndex) -> pa.Table:
+        return table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), _TEAM_INDEX_METADATA_KEY: identity.content_hash.encode("ascii")}
+        )
+
+    @staticmethod
+    def load_dataset(data_dir: Path, dataset: str, identity: TeamIdentityIndex | None = None) -> pa.Table:
+        """Tabela tipada de um dataset (transfers/balances) sem escrever em disco.
+
+        Usa o Parquet normalizado quando atualizado; senão normaliza o CSV em memória.
+        """
+        identity = identity or TeamIdentityIndex(data_dir)
+        normalize, schema = {
+            "transfers": (FinancialNormalizer.normalize_transfers, TRANSFERS_SCHEMA),
+            "balances": (FinancialNormalizer.normalize_balances, BALANCES_SCHEMA),
+        }[dataset]
+        parquet_dir = data_dir / "financial" / "parquet" / dataset
+        tables = []
+        for csv_file in sorted((data_dir / "financial" / dataset).glob("*.csv")):
+            parquet_path = parquet_dir / f"{csv_file.stem}.parquet"
+            if FinancialNormalizer._is_current(csv_file, parquet_path, identity):
+                tables.append(pq.read_table(parquet_path, schema=schema))
+            else:
+                tables.append(normalize(csv_file, identity))
+        return pa.concat_tables(tables) if tables else schema.empty_table()
+
+    @staticmethod
+    def convert_financial_data(
+        data_dir: Path,
+        output_dir: Path | None = None,
+        compression: str = "snappy",
+        identity: TeamIdentityIndex | None = None,
+    ) -> List[Path]:
+        """Converte financial/{transfers,balances}/*.csv para financial/parquet/<tipo>/; retorna os arquivos (re)escritos.
+
+        Arquivos resolvidos com outro índice de times são reescritos mesmo sem mudança no CSV.
+        """
+        identity = identity or TeamIdentityIndex(data_dir)
+        financial_dir = data_dir / "financial"
+        output_dir = output_dir or financial_dir / "parquet"
+        normalizers = {
+            "transfers": FinancialNormalizer.normalize_transfers,
+            "balances": FinancialNormalizer.normalize_balances,
+        }
+        written: List[Path] = []
+        for dataset, normalize in normalizers.items():
+            for csv_file in sorted((financial_dir / dataset).glob("*.csv")):
+                parquet_path = output_dir / dataset / f"{csv_file.stem}.parquet"
+                if FinancialNormalizer._is_current(csv_file, parquet_path, identity):
+                    continue
+                ParquetWriter._write(FinancialNormalizer._tag(normalize(csv_file, identity), identity), parquet_path, compression)
+                written.append(parquet_path)
+        logger.info(f"Financeiro ({compression}): {len(written)} arquivos normalizados")
+        return written
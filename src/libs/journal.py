@@ -0,0 +1,225 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .cache import ResponseCache
+from .planner import WorkUnit
+from .utils import DATA_DIR, setup_logger, write_json_gz
+
+logger = setup_logger(__name__)
+
+DEFAULT_JOURNAL_DB = os.path.join(DATA_DIR, '.state', 'journal.sqlite')
+# Execuções inacabadas mais antigas que isso não são retomadas (os dados já envelheceram)
+DEFAULT_RESUME_MAX_AGE = 24 * 60 * 60
+# Execuções concluídas mantidas no diário para consulta
+KEEP_FINISHED_RUNS = 20
+
+
+class RunJournal:
+    """Diário da execução (SQLite): unidades concluídas, respostas recebidas e etapas.
+
+    Se o processo morre, a próxima execução com a mesma assinatura retoma o mesmo
+    run_id: unidades e etapas concluídas são puladas e as páginas já recebidas são
+    servidas do diário, sem gastar cota de novo. Os payloads ficam em
+    `<db>/../journal/<run_id>/` e são apagados quando a execução termina.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        resume_max_age: float = DEFAULT_RESUME_MAX_AGE,
+    ):
+        self.db_path = Path(db_path or os.getenv("PIPELINE_JOURNAL_DB") or DEFAULT_JOURNAL_DB)
+        self.payload_root = self.db_path.parent / "journal"
+        self.resume_max_age = resume_max_age
+        self.run_id: Optional[str] = None
+        self.resumed = False
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS runs (
+                       run_id TEXT PRIMARY KEY,
+                       signature TEXT NOT NULL,
+                       started_at REAL NOT NULL,
+                       finished_at REAL
+                   )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS units (
+                       run_id TEXT NOT NULL,
+                       endpoint TEXT NOT NULL,
+                       league INTEGER NOT NULL,
+                       season INTEGER NOT NULL,
+                       finished_at REAL NOT NULL,
+                       PRIMARY KEY (run_id, endpoint, league, season)
+                   )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS stages (
+                       run_id TEXT NOT NULL,
+                       stage TEXT NOT NULL,
+                       finished_at REAL NOT NULL,
+                       PRIMARY KEY (run_id, stage)
+                   )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       run_id TEXT NOT NULL,
+                       key TEXT NOT NULL,
+                       endpoint TEXT NOT NULL,
+                       params TEXT NOT NULL,
+                       received_at REAL NOT NULL,
+                       PRIMARY KEY (run_id, key)
+                   )"""
+            )
+        finally:
+            conn.close()
+
+    def _require_run(self) -> str:
+        if self.run_id is None:
+            raise RuntimeError("RunJournal.start() não foi chamado")
+        return self.run_id
+
+    def start(self, signature: str, resume: bool = True) -> str:
+        """Retoma a última execução inacabada com a mesma assinatura ou abre uma nova."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT run_id, started_at FROM runs WHERE finished_at IS NULL AND signature = ? "
+                "ORDER BY started_at DESC LIMIT 1",
+                (signature,),
+            ).fetchone()
+            if resume and row is not None and time.time() - row[1] <= self.resume_max_age:
+                self.run_id, self.resumed = row[0], True
+                units = conn.execute("SELECT COUNT(*) FROM units WHERE run_id = ?", (self.run_id,)).fetchone()[0]
+                responses = conn.execute("SELECT COUNT(*) FROM responses WHERE run_id = ?", (self.run_id,)).fetchone()[0]
+                logger.info(
+                    f"Retomando execução {self.run_id}: {units} unidades concluídas, {responses} respostas no diário"
+                )
+                return self.run_id
+
+            # Execuções inacabadas que não serão retomadas são encerradas e seus payloads descartados
+            abandoned = [run_id for (run_id,) in conn.execute("SELECT run_id FROM runs WHERE finished_at IS NULL")]
+            conn.execute("UPDATE runs SET finished_at = ? WHERE finished_at IS NULL", (time.time(),))
+            for run_id in abandoned:
+                shutil.rmtree(self.payload_root / run_id, ignore_errors=True)
+
+            self.run_id, self.resumed = uuid.uuid4().hex[:12], False
+            conn.execute(
+                "INSERT INTO runs (run_id, signature, started_at) VALUES (?, ?, ?)",
+                (self.run_id, signature, time.time()),
+            )
+            return self.run_id
+        finally:
+            conn.close()
+
+    def finish(self) -> None:
+        """Marca a execução como concluída e libera os payloads guardados."""
+        run_id = self._require_run()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id))
+            conn.execute("DELETE FROM responses WHERE run_id = ?", (run_id,))
+            old_runs = [
+                old_run_id for (old_run_id,) in conn.execute(
+                    "SELECT run_id FROM runs WHERE finished_at IS NOT NULL ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+                    (KEEP_FINISHED_RUNS,),
+                )
+            ]
+            for table in ("units", "stages", "responses", "runs"):
+                conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", [(old,) for old in old_runs])
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        shutil.rmtree(self.payload_root / run_id, ignore_errors=True)
+
+    def done_units(self) -> Set[WorkUnit]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT endpoint, league, season FROM units WHERE run_id = ?", (self._require_run(),)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {WorkUnit(endpoint, league, season) for endpoint, league, season in rows}
+
+    def mark_unit_done(self, unit: WorkUnit) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO units (run_id, endpoint, league, season, finished_at) VALUES (?, ?, ?, ?, ?)",
+                (self._require_run(), unit.endpoint, unit.league, unit.season, time.time()),
+            )
+        finally:
+            conn.close()
+
+    def is_stage_done(self, stage: str) -> bool:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM stages WHERE run_id = ? AND stage = ?", (self._require_run(), stage)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+
+    def mark_stage_done(self, stage: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO stages (run_id, stage, finished_at) VALUES (?, ?, ?)",
+                (self._require_run(), stage, time.time()),
+            )
+        finally:
+            conn.close()
+
+    def _payload_path(self, key: str) -> Path:
+        return self.payload_root / self._require_run() / f"{key}.json.gz"
+
+    def get_response(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Resposta já recebida nesta execução (None se ainda não chegou)."""
+        if self.run_id is None:
+            return None
+        path = self._payload_path(ResponseCache.make_key(endpoint, params))
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, EOFError, json.JSONDecodeError):
+            return None
+
+    def put_response(self, endpoint: str, params: Optional[Dict[str, Any]], payload: Any) -> None:
+        """Guarda a resposta (escrita atômica) antes de ela ser processada."""
+        if self.run_id is None:
+            return
+        key = ResponseCache.make_key(endpoint, params)
+        path = self._payload_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_gz(path, payload)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (run_id, key, endpoint, params, received_at) VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, key, endpoint.strip("/"), json.dumps(params or {}, sort_keys=True, default=str), time.time()),
+            )
+        finally:
+            conn.close()
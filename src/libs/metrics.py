@@ -0,0 +1,324 @@
+"""Métricas de execução do pipeline: tempo por etapa, latência da API, esperas e bytes.
+
+Um coletor por processo (METRICS) é alimentado pelo cliente da API, pelo rate limiter,
+pelo S3Uploader e pelo PostgresLoader. Ao final do run o pipeline grava um relatório
+JSON e um arquivo texto no formato do Prometheus (node_exporter textfile collector).
+"""
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .utils import DATA_DIR, setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_METRICS_DIR = os.path.join(DATA_DIR, '.state', 'metrics')
+PROMETHEUS_FILE = 'pipeline.prom'
+
+# Limites (segundos) dos buckets do histograma de latência das chamadas à API
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROFILE_TOP = 25
+
+
+def resolve_metrics_dir(output_dir: str | Path | None = None) -> Path:
+    """Diretório dos relatórios: argumento, PIPELINE_METRICS_DIR ou data/.state/metrics."""
+    return Path(output_dir or os.getenv('PIPELINE_METRICS_DIR') or DEFAULT_METRICS_DIR)
+
+
+class _Histogram:
+    """Histograma cumulativo no estilo Prometheus (buckets fixos + soma + contagem)."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        running = 0
+        result = []
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimativa pelo limite superior do bucket que contém o quantil."""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, cumulative in zip(LATENCY_BUCKETS, self.cumulative()):
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(bound): value for bound, value in zip(LATENCY_BUCKETS, self.cumulative())}
+        buckets['+Inf'] = self.count
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.total, 6),
+            'mean_seconds': round(self.total / self.count, 6) if self.count else None,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'buckets': buckets,
+        }
+
+
+def _label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """Coletor thread-safe das métricas de uma execução do pipeline."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.stages: Dict[str, Dict[str, Any]] = {}
+            self.requests: Counter = Counter()                      # (endpoint, status) -> chamadas
+            self.latency: Dict[str, _Histogram] = defaultdict(_Histogram)
+            self.cache_hits: Counter = Counter()
+            self.sleep_seconds = 0.0
+            self.bytes: Counter = Counter()
+            self.rows: Counter = Counter()
+            self.quota_remaining: Optional[int] = None
+            self.profiles: Dict[str, Dict[str, Any]] = {}
+
+    def observe_request(self, endpoint: str, status: int, seconds: float, nbytes: int = 0) -> None:
+        """Registra uma chamada HTTP à API (inclusive 429)."""
+        with self._lock:
+            self.requests[(endpoint, int(status))] += 1
+            self.latency[endpoint].observe(seconds)
+            self.bytes['api_response'] += nbytes
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        with self._lock:
+            self.cache_hits[endpoint] += 1
+
+    def add_sleep(self, seconds: float) -> None:
+        """Soma o tempo bloqueado no rate limiter."""
+        if seconds > 0:
+            with self._lock:
+                self.sleep_seconds += seconds
+
+    def add_bytes(self, kind: str, nbytes: int) -> None:
+        with self._lock:
+            self.bytes[kind] += nbytes
+
+    def add_rows(self, kind: str, rows: int) -> None:
+        with self._lock:
+            self.rows[kind] += rows
+
+    def set_quota_remaining(self, remaining: int) -> None:
+        with self._lock:
+            self.quota_remaining = remaining
+
+    @contextmanager
+    def stage(self, name: str, label: Optional[str] = None, profile: bool = False,
+              output_dir: Optional[Path] = None) -> Iterator[None]:
+        """Mede o tempo de parede de uma etapa; com profile, anexa cProfile e tracemalloc."""
+        profiler = cProfile.Profile() if profile else None
+        started_tracemalloc = profile and not tracemalloc.is_tracing()
+        if profile:
+            if started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            profiler.enable()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self._store_profile(name, profiler, output_dir)
+                if started_tracemalloc:
+                    tracemalloc.stop()
+            with self._lock:
+                self.stages[name] = {
+                    'label': label or name,
+                    'seconds': round(elapsed, 6),
+                    'error': error,
+                }
+
+    def _store_profile(self, name: str, profiler: cProfile.Profile, output_dir: Optional[Path]) -> None:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        top_allocations = [
+            {'location': str(stat.traceback), 'size_kib': round(stat.size / 1024, 1), 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP]
+        ]
+        stats = pstats.Stats(profiler)
+        top_functions = []
+        for (filename, line, function), (_, calls, _, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[:PROFILE_TOP]:
+            top_functions.append({
+                'function': f"{filename}:{line}({function})",
+                'calls': calls,
+                'cumulative_seconds': round(cumulative, 6),
+            })
+        profile: Dict[str, Any] = {
+            'peak_memory_kib': round(peak / 1024, 1),
+            'top_allocations': top_allocations,
+            'top_functions': top_functions,
+        }
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            prof_path = output_dir / f"profile_{name}.prof"
+            profiler.dump_stats(str(prof_path))
+            profile['pstats_file'] = str(prof_path)
+            logger.info(f"Perfil da etapa {name} salvo em {prof_path}")
+        with self._lock:
+            self.profiles[name] = profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints: Dict[str, Dict[str, Any]] = {}
+            for endpoint, histogram in self.latency.items():
+                endpoints[endpoint] = {
+                    'calls': histogram.count,
+                    'status': {
+                        str(status): count
+                        for (name, status), count in sorted(self.requests.items())
+                        if name == endpoint
+                    },
+                    'cache_hits': self.cache_hits.get(endpoint, 0),
+                    'latency': histogram.to_dict(),
+                }
+            for endpoint, hits in self.cache_hits.items():
+                endpoints.setdefault(endpoint, {'calls': 0, 'status': {}, 'cache_hits': hits, 'latency': None})
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec='seconds'),
+                'wall_seconds': round(time.time() - self.started_at, 6),
+                'stages': dict(self.stages),
+                'api': {
+                    'endpoints': endpoints,
+                    'rate_limit_sleep_seconds': round(self.sleep_seconds, 6),
+                    'quota_remaining': self.quota_remaining,
+                },
+                'bytes': dict(self.bytes),
+                'rows': dict(self.rows),
+                'profiles': dict(self.profiles),
+            }
+
+    def to_prometheus(self) -> str:
+        """Serializa as métricas no formato de exposição texto do Prometheus."""
+        report = self.to_dict()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple[Dict[str, Any], Any]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ','.join(f'{key}="{_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        metric('pipeline_last_run_timestamp_seconds', 'gauge', 'Início da última execução (epoch).',
+               [({}, round(self.started_at, 3))])
+        metric('pipeline_stage_duration_seconds', 'gauge', 'Tempo de parede por etapa.',
+               [({'stage': name}, stage['seconds']) for name, stage in report['stages'].items()])
+        metric('pipeline_stage_failed', 'gauge', 'Etapa terminou com erro (1) ou não (0).',
+               [({'stage': name}, int(stage['error'] is not None)) for name, stage in report['stages'].items()])
+
+        with self._lock:
+            requests = sorted(self.requests.items())
+            histograms = sorted((endpoint, histogram.cumulative(), histogram.total, histogram.count)
+                                for endpoint, histogram in self.latency.items())
+            cache_hits = sorted(self.cache_hits.items())
+        metric('api_football_requests_total', 'counter', 'Chamadas HTTP à API por endpoint e status.',
+               [({'endpoint': endpoint, 'status': status}, count) for (endpoint, status), count in requests])
+        metric('api_football_cache_hits_total', 'counter', 'Respostas servidas pelo cache local.',
+               [({'endpoint': endpoint}, count) for endpoint, count in cache_hits])
+
+        name = 'api_football_request_duration_seconds'
+        lines.append(f"# HELP {name} Latência das chamadas HTTP à API.")
+        lines.append(f"# TYPE {name} histogram")
+        for endpoint, cumulative, total, count in histograms:
+            endpoint_label = _label(endpoint)
+            for bound, value in zip(LATENCY_BUCKETS, cumulative):
+                lines.append(f'{name}_bucket{{endpoint="{endpoint_label}",le="{bound}"}} {value}')
+            lines.append(f'{name}_bucket{{endpoint="{endpoint_label}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{endpoint="{endpoint_label}"}} {round(total, 6)}')
+            lines.append(f'{name}_count{{endpoint="{endpoint_label}"}} {count}')
+
+        metric('api_football_rate_limit_sleep_seconds_total', 'counter', 'Tempo bloqueado no rate limiter.',
+               [({}, report['api']['rate_limit_sleep_seconds'])])
+        if report['api']['quota_remaining'] is not None:
+            metric('api_football_quota_remaining', 'gauge', 'Requisições restantes na cota diária.',
+                   [({}, report['api']['quota_remaining'])])
+        metric('pipeline_bytes_total', 'counter', 'Bytes transferidos por origem/destino.',
+               [({'kind': kind}, value) for kind, value in sorted(report['bytes'].items())])
+        metric('pipeline_rows_total', 'counter', 'Linhas processadas por destino.',
+               [({'kind': kind}, value) for kind, value in sorted(report['rows'].items())])
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, output_dir: Optional[Path] = None) -> tuple[Path, Path]:
+        """Grava run_<timestamp>.json e pipeline.prom; retorna os dois caminhos.
+
+        O arquivo .prom é trocado por rename para que o coletor nunca leia um arquivo parcial.
+        """
+        output_dir = resolve_metrics_dir(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started_at, timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        report_path = output_dir / f"run_{stamp}.json"
+        report_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+
+        prom_path = output_dir / PROMETHEUS_FILE
+        tmp_path = prom_path.with_suffix('.prom.tmp')
+        tmp_path.write_text(self.to_prometheus(), encoding='utf-8')
+        os.replace(tmp_path, prom_path)
+        logger.info(f"Métricas da execução gravadas em {report_path} e {prom_path}")
+        return report_path, prom_path
+
+
+def latest_report(output_dir: str | Path | None = None) -> Optional[Dict[str, Any]]:
+    """Relatório JSON da execução mais recente (None sem histórico ou ilegível)."""
+    reports = sorted(resolve_metrics_dir(output_dir).glob('run_*.json'))
+    if not reports:
+        return None
+    try:
+        return json.loads(reports[-1].read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def last_call_seconds(output_dir: str | Path | None = None) -> Optional[float]:
+    """Latência média das chamadas à API no relatório mais recente (None sem histórico)."""
+    report = latest_report(output_dir)
+    if report is None:
+        return None
+    total = count = 0.0
+    for endpoint in report.get('api', {}).get('endpoints', {}).values():
+        latency = endpoint.get('latency') or {}
+        total += latency.get('sum_seconds') or 0.0
+        count += latency.get('count') or 0
+    return total / count if count else None
+
+
+METRICS = RunMetrics()
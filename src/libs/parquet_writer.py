@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from .utils import csv_stem, list_csv, setup_logger
+
+logger = setup_logger(__name__)
+
+PARQUET_COMPRESSIONS = ("snappy", "zstd")
+
+# Tipos espelham as tabelas *_parquet de terraform/glue.tf (int = int32, timestamp = ms UTC)
+FIXTURES_SCHEMA = pa.schema([
+    ("fixture_id", pa.int32()),
+    ("date", pa.timestamp("ms", tz="UTC")),
+    ("league_name", pa.string()),
+    ("home_team_id", pa.int32()),
+    ("home_team_name", pa.string()),
+    ("away_team_id", pa.int32()),
+    ("away_team_name", pa.string()),
+    ("fulltime_home", pa.int32()),
+    ("fulltime_away", pa.int32()),
+    ("status", pa.string()),
+])
+
+PLAYERS_SCHEMA = pa.schema([
+    ("category", pa.string()),
+    ("player_id", pa.int32()),
+    ("player_name", pa.string()),
+    ("team_id", pa.int32()),
+    ("team_name", pa.string()),
+    ("appearences", pa.int32()),
+    ("minutes", pa.int32()),
+    ("goals", pa.int32()),
+    ("assists", pa.int32()),
+    ("shots_total", pa.int32()),
+])
+
+
+class ParquetWriter:
+    """Converte as partições CSV em Parquet tipado, no mesmo layout season=/league= do S3."""
+
+    @staticmethod
+    def _read_csv(csv_path: Path, schema: pa.Schema) -> pa.Table:
+        convert_options = pa_csv.ConvertOptions(
+            column_types={field.name: field.type for field in schema},
+            include_columns=schema.names,
+            # Partições antigas sem colunas novas (ex.: status) viram nulos
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        )
+        # .csv.gz/.csv.zst são descomprimidos pelo pyarrow a partir da extensão
+        table = pa_csv.read_csv(csv_path, convert_options=convert_options)
+        return table.select(schema.names).cast(schema)
+
+    @staticmethod
+    def _is_up_to_date(csv_path: Path, parquet_path: Path) -> bool:
+        return parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+
+    @staticmethod
+    def _write(table: pa.Table, parquet_path: Path, compression: str) -> None:
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"Compressão Parquet não suportada: {compression}")
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = parquet_path.with_name(parquet_path.name + ".tmp")
+        pq.write_table(table, tmp_path, compression=compression, coerce_timestamps="ms")
+        os.replace(tmp_path, parquet_path)
+
+    @staticmethod
+    def convert_fixtures(data_dir: Path, output_dir: Path | None = None, compression: str = "snappy") -> List[Path]:
+        """Converte season_*_league_*_results.csv; retorna os arquivos Parquet (re)escritos."""
+        seasons_dir = data_dir / "sport" / "seasons"
+        output_dir = output_dir or data_dir / "sport" / "parquet"
+        written: List[Path] = []
+        for csv_file in list_csv(seasons_dir, "season_*_league_*_results"):
+            stem = csv_stem(csv_file)
+            parts = stem.split('_')
+            season, league = parts[1], parts[3]
+            parquet_path = output_dir / "seasons" / f"season={season}" / f"league={league}" / f"{stem}.parquet"
+            if ParquetWriter._is_up_to_date(csv_file, parquet_path):
+                continue
+            ParquetWriter._write(ParquetWriter._read_csv(csv_file, FIXTURES_SCHEMA), parquet_path, compression)
+            written.append(parquet_path)
+        return written
+
+    @staticmethod
+    def convert_players(data_dir: Path, output_dir: Path | None = None, compression: str = "snappy") -> List[Path]:
+        """Converte os CSVs de jogadores para players/<tipo>/league=/season=."""
+        players_dir = data_dir / "sport" / "players"
+        output_dir = output_dir or data_dir / "sport" / "parquet"
+        written: List[Path] = []
+        for csv_file in list_csv(players_dir, "*_league_*_season_*"):
+            # top_scorers_league_71_season_2023 -> top_scorers, 71, 2023
+            stem = csv_stem(csv_file)
+            parts = stem.split('_')
+            stat_type = '_'.join(parts[:2])
+            league, season = parts[3], parts[5]
+            parquet_path = output_dir / "players" / stat_type / f"league={league}" / f"season={season}" / f"{stem}.parquet"
+            if ParquetWriter._is_up_to_date(csv_file, parquet_path):
+                continue
+            ParquetWriter._write(ParquetWriter._read_csv(csv_file, PLAYERS_SCHEMA), parquet_path, compression)
+            written.append(parquet_path)
+        return written
+
+    @staticmethod
+    def convert_sport_data(data_dir: Path, output_dir: Path | None = None, compression: str = "snappy") -> List[Path]:
+        written = ParquetWriter.convert_fixtures(data_dir, output_dir, compression)
+        written += ParquetWriter.convert_players(data_dir, output_dir, compression)
+        logger.info(f"Parquet ({compression}): {len(written)} partições convertidas")
+        return written
@@ -1,17 +1,43 @@
+import asyncio
+import hashlib
+import json
+import os
 from pathlib import Path
 
 from tqdm import tqdm
 
 from .api_football import (
     APIFootballClient,
+    AsyncAPIFootballClient,
+    FixtureDetailsService,
     MatchResultsService,
+    SquadStatsService,
     TopAssistsService,
     TopScorersService,
     load_target_leagues,
     load_target_seasons,
 )
-from .storage import GlueCrawlerRunner, PostgresLoader, S3Uploader
-from .utils import setup_logger
+from .planner import (
+    DEFAULT_CALL_SECONDS,
+    DEFAULT_ENDPOINTS,
+    FIXTURE_DETAILS_ENDPOINT,
+    FIXTURES_ENDPOINT,
+    SQUAD_STATS_ENDPOINT,
+    STATE_DELTA,
+    STATE_DONE,
+    TOP_ASSISTS_ENDPOINT,
+    TOP_SCORERS_ENDPOINT,
+    ExtractionPlan,
+    PlannedUnit,
+    WorkUnit,
+    build_plan,
+    build_work_units,
+)
+from .journal import RunJournal
+from .metrics import METRICS, last_call_seconds, resolve_metrics_dir
+from .rate_limit import QuotaExhaustedError
+from .storage import GlueCrawlerRunner, GluePartitionRegistrar, PostgresLoader, S3Uploader
+from .utils import DATA_DIR, CSVWriter, remove_orphan_tmp, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -24,23 +50,64 @@ class APIFootballExtractionPipeline:
         enable_s3: bool = True,
         enable_postgres: bool = False,  # Desabilitado por padrão (não necessário para analytics)
         enable_glue: bool = True,
+        async_extraction: bool = False,
+        async_client: AsyncAPIFootballClient | None = None,
+        max_concurrency: int = 4,
+        delta_refresh: bool = False,
+        enable_parquet: bool = False,
+        parquet_compression: str = "snappy",
+        postgres_full_reload: bool = False,
+        s3_sync: bool = True,
+        glue_wait: bool = False,
+        metrics_dir: Path | None = None,
+        profile_stage: str | None = None,
+        resume: bool = True,
+        journal: RunJournal | None = None,
+        fixture_details: bool = False,
+        squad_stats: bool = False,
+        csv_compression: str | None = None,
     ) -> None:
         self.client = client or APIFootballClient()
+        # Compressão dos CSVs gravados e enviados (none, gzip, zstd); None = PIPELINE_CSV_COMPRESSION
+        if csv_compression is not None:
+            CSVWriter.set_compression(csv_compression)
+        self.csv_compression = csv_compression
         self.seasons = load_target_seasons()
         self.leagues = load_target_leagues()
         self.fixtures_service = MatchResultsService(self.client)
         self.scorers_service = TopScorersService(self.client)
         self.assists_service = TopAssistsService(self.client)
+        self.details_service = FixtureDetailsService(self.client)
+        self.squad_service = SquadStatsService(self.client)
         
         if data_dir is None:
-            project_root = Path(__file__).resolve().parent.parent.parent
-            self.data_dir = project_root / "data"
+            self.data_dir = Path(DATA_DIR).resolve()
         else:
             self.data_dir = data_dir
         
         self.enable_s3 = enable_s3
         self.enable_postgres = enable_postgres
         self.enable_glue = enable_glue
+        self.async_extraction = async_extraction
+        self.async_client = async_client
+        self.max_concurrency = max_concurrency
+        self.delta_refresh = delta_refresh
+        self.enable_parquet = enable_parquet
+        self.parquet_compression = parquet_compression
+        self.postgres_full_reload = postgres_full_reload
+        self.s3_sync = s3_sync
+        self.glue_wait = glue_wait
+        self.metrics_dir = metrics_dir
+        # Chave da etapa (extract, parquet, financial, s3, postgres, glue) a perfilar com cProfile/tracemalloc
+        self.profile_stage = profile_stage or os.getenv("PIPELINE_PROFILE_STAGE") or None
+        # Retoma a última execução interrompida (unidades/etapas concluídas e respostas recebidas)
+        self.resume = resume
+        self.journal = journal
+        # Estatísticas/eventos/escalações por partida, em lotes de 20 ids
+        self.fixture_details = fixture_details
+        # Estatísticas de todos os jogadores (endpoint players; páginas em paralelo só na extração async)
+        self.squad_stats = squad_stats
+        self._done_units: set[WorkUnit] = set()
         
         self.s3_uploader = None
         self.postgres_loader = None
@@ -52,27 +119,190 @@ class APIFootballExtractionPipeline:
             return False
         return True
 
+    def _annotate(self, unit: WorkUnit) -> PlannedUnit:
+        """Estado de cache e custo estimado de uma unidade, sem chamar a API."""
+        if unit in self._done_units:
+            return PlannedUnit(unit, STATE_DONE, 0)
+        if unit.endpoint == FIXTURES_ENDPOINT and self._use_delta(unit.season):
+            if os.path.exists(CSVWriter.fixture_partition_path(unit.season, unit.league)):
+                _, requests_params = self.fixtures_service._plan_delta(unit.league, unit.season)
+                return PlannedUnit(unit, STATE_DELTA, len(requests_params))
+        services = {
+            FIXTURES_ENDPOINT: self.fixtures_service,
+            TOP_SCORERS_ENDPOINT: self.scorers_service,
+            TOP_ASSISTS_ENDPOINT: self.assists_service,
+            FIXTURE_DETAILS_ENDPOINT: self.details_service,
+            SQUAD_STATS_ENDPOINT: self.squad_service,
+        }
+        state, calls = services[unit.endpoint].plan_state(**unit.params)
+        return PlannedUnit(unit, state, calls)
+
+    def plan(self) -> ExtractionPlan:
+        """Monta o plano completo da extração antes de gastar cota.
+
+        Unidades atendidas pelo cache não consomem cota e sempre rodam; as demais
+        são ordenadas por prioridade e cortadas pela cota diária restante.
+        """
+        return build_plan(
+            (self._annotate(unit) for unit in build_work_units(self.leagues, self.seasons, self._endpoints())),
+            current_season=max(self.seasons),
+            budget=self.client.rate_limiter.remaining_daily(),
+            requests_per_minute=self.client.requests_per_minute,
+            concurrency=self.max_concurrency if self.async_extraction else 1,
+            call_seconds=last_call_seconds(self.metrics_dir) or DEFAULT_CALL_SECONDS,
+        )
+
+    def _endpoints(self) -> tuple[str, ...]:
+        endpoints = DEFAULT_ENDPOINTS
+        if self.squad_stats:
+            endpoints += (SQUAD_STATS_ENDPOINT,)
+        if self.fixture_details:
+            endpoints += (FIXTURE_DETAILS_ENDPOINT,)
+        return endpoints
+
+    def _plan_units(self) -> list[WorkUnit]:
+        plan = self.plan()
+        for unit, reason in plan.dropped:
+            logger.info(f"Descartado ({reason}): {unit.endpoint} league={unit.league} season={unit.season}")
+        for unit in plan.deferred:
+            logger.info(f"Adiado por cota: {unit.endpoint} league={unit.league} season={unit.season}")
+        logger.info(f"Plano: {len(plan.selected)} unidades, ~{plan.estimated_calls} chamadas, ~{plan.estimated_seconds:.0f}s")
+        # Detalhes leem os ids da partição de fixtures: rodam depois das demais unidades
+        return sorted(plan.selected, key=lambda unit: unit.endpoint == FIXTURE_DETAILS_ENDPOINT)
+
+    def dry_run(self) -> ExtractionPlan:
+        """Imprime o plano da extração sem chamar a API."""
+        if not self._has_targets():
+            print("Nenhuma league/season configurada")
+            return ExtractionPlan(units=[])
+        plan = self.plan()
+        print(plan.format())
+        return plan
+
+    def _use_delta(self, season: int) -> bool:
+        """Delta só vale para a temporada corrente; as encerradas não mudam mais."""
+        return self.delta_refresh and season == max(self.seasons)
+
+    def _export_fixtures(self, service: MatchResultsService, league: int, season: int) -> int:
+        if self._use_delta(season):
+            return service.refresh_fixtures(league, season)
+        return service.export_fixtures(league=league, season=season)
+
+    async def _aexport_fixtures(self, service: MatchResultsService, league: int, season: int) -> int:
+        if self._use_delta(season):
+            return await service.arefresh_fixtures(league, season)
+        return await service.aexport_fixtures(league=league, season=season)
+
     def _extract_data(self) -> None:
         """Extrai dados da API Football para todas as leagues e seasons configuradas."""
-        total = len(self.leagues) * len(self.seasons)
-        with tqdm(total=total, desc="Extraindo dados da API") as pbar:
-            for league_id in self.leagues:
-                for season in self.seasons:
-                    params = {"league": league_id, "season": season}
-                    self.fixtures_service.get_fixtures(**params)
-                    self.scorers_service.get_topscorers(**params)
-                    self.assists_service.get_topassists(**params)
+        fetchers = {
+            FIXTURES_ENDPOINT: lambda **params: self._export_fixtures(self.fixtures_service, **params),
+            TOP_SCORERS_ENDPOINT: self.scorers_service.export_topscorers,
+            TOP_ASSISTS_ENDPOINT: self.assists_service.export_topassists,
+            FIXTURE_DETAILS_ENDPOINT: self.details_service.export_details,
+            SQUAD_STATS_ENDPOINT: self.squad_service.export_squad_stats,
+        }
+        units = self._plan_units()
+        with tqdm(total=len(units), desc="Extraindo dados da API") as pbar:
+            for unit in units:
+                try:
+                    fetchers[unit.endpoint](**unit.params)
+                except QuotaExhaustedError as e:
+                    logger.error(f"{e}. Unidades restantes adiadas para a próxima execução")
+                    return
+                self._mark_unit_done(unit)
+                pbar.update(1)
+
+    def _build_async_client(self) -> AsyncAPIFootballClient:
+        """Cria o cliente assíncrono herdando o rate limit do cliente síncrono."""
+        client = self.async_client or AsyncAPIFootballClient(
+            api_key=self.client.api_key,
+            base_url=self.client.base_url,
+            requests_per_minute=self.client.requests_per_minute,
+            max_concurrency=self.max_concurrency,
+            rate_limiter=self.client.rate_limiter,
+            cache=self.client.cache,
+            enable_cache=self.client.cache is not None,
+            entities=self.client.entities,
+            enable_entities=self.client.entities is not None,
+        )
+        client.journal = self.client.journal
+        return client
+
+    async def _extract_data_async(self) -> None:
+        """Extrai dados com várias requisições em voo; cada resposta é gravada assim que chega."""
+        units = self._plan_units()
+        async with self._build_async_client() as client:
+            async_fixtures = MatchResultsService(client)
+            fetchers = {
+                FIXTURES_ENDPOINT: lambda **params: self._aexport_fixtures(async_fixtures, **params),
+                TOP_SCORERS_ENDPOINT: TopScorersService(client).aexport_topscorers,
+                TOP_ASSISTS_ENDPOINT: TopAssistsService(client).aexport_topassists,
+                FIXTURE_DETAILS_ENDPOINT: FixtureDetailsService(client).aexport_details,
+                SQUAD_STATS_ENDPOINT: SquadStatsService(client).aexport_squad_stats,
+            }
+            # Detalhes só depois que todas as partições de fixtures foram gravadas
+            phases = [
+                [unit for unit in units if unit.endpoint != FIXTURE_DETAILS_ENDPOINT],
+                [unit for unit in units if unit.endpoint == FIXTURE_DETAILS_ENDPOINT],
+            ]
+
+            with tqdm(total=len(units), desc="Extraindo dados da API (async)") as pbar:
+                async def run_unit(unit: WorkUnit) -> None:
+                    await fetchers[unit.endpoint](**unit.params)
+                    self._mark_unit_done(unit)
                     pbar.update(1)
 
+                quota_exhausted = False
+                for phase in phases:
+                    if quota_exhausted:
+                        break
+                    # Tarefas criadas em ordem de prioridade disputam os tokens nessa mesma ordem
+                    try:
+                        async with asyncio.TaskGroup() as tg:
+                            for unit in phase:
+                                tg.create_task(run_unit(unit))
+                    except* QuotaExhaustedError as eg:
+                        logger.error(f"{eg.exceptions[0]}. Unidades restantes adiadas para a próxima execução")
+                        quota_exhausted = True
+
+    def _convert_to_parquet(self) -> None:
+        """Converte as partições CSV alteradas em Parquet tipado."""
+        if not self.enable_parquet:
+            return
+
+        from .parquet_writer import ParquetWriter
+
+        ParquetWriter.convert_sport_data(self.data_dir, compression=self.parquet_compression)
+
+    def _has_financial_inputs(self) -> bool:
+        """Há CSVs financeiros (transfers/balances) a normalizar."""
+        financial_dir = self.data_dir / "financial"
+        return any(any((financial_dir / dataset).glob("*.csv")) for dataset in ("transfers", "balances"))
+
+    def _normalize_financial(self) -> None:
+        """Converte os CSVs financeiros (formato brasileiro) em Parquet tipado."""
+        from .financial import FinancialNormalizer
+
+        FinancialNormalizer.convert_financial_data(self.data_dir, compression=self.parquet_compression)
+
     def _upload_to_s3(self) -> None:
         """Faz upload dos CSVs para o bucket S3."""
         if not self.enable_s3:
             return
         
         try:
-            self.s3_uploader = S3Uploader()
+            self.s3_uploader = S3Uploader(compression=self.csv_compression)
+            if self.s3_sync:
+                # Envia só o que mudou; chaves obsoletas são removidas após os uploads
+                self.s3_uploader.sync_sport_data(self.data_dir, include_parquet=self.enable_parquet)
+                self.s3_uploader.sync_financial_data(self.data_dir, include_parquet=True)
+                return
             self.s3_uploader.upload_sport_data(self.data_dir)
+            if self.enable_parquet:
+                self.s3_uploader.upload_sport_parquet(self.data_dir)
             self.s3_uploader.upload_financial_data(self.data_dir)
+            self.s3_uploader.upload_financial_parquet(self.data_dir)
         except Exception as e:
             logger.error(f"Erro no upload S3: {e}")
 
@@ -84,11 +314,32 @@ class APIFootballExtractionPipeline:
         try:
             self.postgres_loader = PostgresLoader()
             self.postgres_loader.create_schema()
-            self.postgres_loader.load_all_data(self.data_dir)
+            self.postgres_loader.load_all_data(self.data_dir, incremental=not self.postgres_full_reload)
         except Exception as e:
             logger.error(f"Erro na carga PostgreSQL: {e}")
             raise  # Propaga o erro para que o pipeline saiba que falhou
 
+    def _register_glue_partitions(self) -> None:
+        """Registra no Glue as partições presentes em sport/ no S3; sem database configurado, usa o crawler.
+
+        As chaves vêm da listagem do bucket, não só dos uploads desta execução: o sync pula
+        objetos inalterados e, numa execução retomada, a etapa s3 pode já ter sido concluída.
+        """
+        if not self.enable_glue:
+            return
+
+        if os.getenv("GLUE_DATABASE_NAME"):
+            try:
+                uploader = self.s3_uploader or S3Uploader(compression=self.csv_compression)
+                s3_keys = list(uploader.list_objects("sport/"))
+                if s3_keys:
+                    GluePartitionRegistrar().register_keys(s3_keys, wait=self.glue_wait)
+                    return
+                logger.warning("Nenhuma chave em sport/ no S3 para registrar no Glue, usando crawler")
+            except Exception as e:
+                logger.error(f"Erro ao registrar partições no Glue, usando crawler: {e}")
+        self._run_glue_crawlers()
+
     def _run_glue_crawlers(self) -> None:
         """Executa os crawlers do AWS Glue."""
         if not self.enable_glue:
@@ -106,14 +357,70 @@ class APIFootballExtractionPipeline:
             return
 
         stages = []
-        stages.append(("Extração API", self._extract_data))
+        if self.async_extraction:
+            stages.append(("extract", "Extração API (async)", lambda: asyncio.run(self._extract_data_async())))
+        else:
+            stages.append(("extract", "Extração API", self._extract_data))
+        if self.enable_parquet:
+            stages.append(("parquet", "Conversão Parquet", self._convert_to_parquet))
+        # O Parquet financeiro tipado serve ao S3/Athena e também ao analytics local
+        if (self.enable_parquet or self.enable_s3) and self._has_financial_inputs():
+            stages.append(("financial", "Normalização financeira", self._normalize_financial))
         if self.enable_s3:
-            stages.append(("Upload S3", self._upload_to_s3))
+            stages.append(("s3", "Upload S3", self._upload_to_s3))
         if self.enable_postgres:
-            stages.append(("Carga PostgreSQL", self._load_to_postgres))
+            stages.append(("postgres", "Carga PostgreSQL", self._load_to_postgres))
         if self.enable_glue:
-            stages.append(("Crawlers Glue", self._run_glue_crawlers))
+            stages.append(("glue", "Catálogo Glue", self._register_glue_partitions))
+
+        journal = self._start_journal([stage_key for stage_key, _, _ in stages])
+        METRICS.reset()
+        try:
+            for stage_key, stage_name, stage_func in tqdm(stages, desc="Pipeline"):
+                if journal.is_stage_done(stage_key):
+                    tqdm.write(f"Pulando (concluída na execução retomada): {stage_name}")
+                    continue
+                tqdm.write(f"Executando: {stage_name}")
+                with METRICS.stage(stage_key, stage_name, profile=stage_key == self.profile_stage,
+                                   output_dir=self._metrics_output_dir()):
+                    stage_func()
+                journal.mark_stage_done(stage_key)
+            journal.finish()
+        finally:
+            self.client.journal = None
+            self._write_metrics()
+
+    def _run_signature(self, stage_keys: list[str]) -> str:
+        """Só é retomada uma execução com os mesmos targets e etapas."""
+        payload = json.dumps(
+            {"leagues": self.leagues, "seasons": self.seasons, "stages": stage_keys, "delta": self.delta_refresh,
+             "details": self.fixture_details, "squad": self.squad_stats},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-        for stage_name, stage_func in tqdm(stages, desc="Pipeline"):
-            tqdm.write(f"Executando: {stage_name}")
-            stage_func()
+    def _start_journal(self, stage_keys: list[str]) -> RunJournal:
+        """Abre (ou retoma) o diário da execução e o anexa ao cliente."""
+        journal = self.journal or RunJournal()
+        journal.start(self._run_signature(stage_keys), resume=self.resume)
+        self._done_units = journal.done_units()
+        self.client.journal = journal
+        details_dirs = list((self.data_dir / "sport" / "fixture_details").glob("*"))
+        for directory in (self.data_dir / "sport" / "seasons", self.data_dir / "sport" / "players", *details_dirs):
+            if (removed := remove_orphan_tmp(str(directory))):
+                logger.info(f"{removed} arquivo(s) .tmp órfão(s) removido(s) de {directory}")
+        return journal
+
+    def _mark_unit_done(self, unit: WorkUnit) -> None:
+        if self.client.journal is not None:
+            self.client.journal.mark_unit_done(unit)
+
+    def _metrics_output_dir(self) -> Path:
+        return resolve_metrics_dir(self.metrics_dir)
+
+    def _write_metrics(self) -> None:
+        """Grava o relatório JSON e o textfile do Prometheus; falhas aqui não derrubam o run."""
+        try:
+            METRICS.write_reports(self._metrics_output_dir())
+        except OSError as e:
+            logger.error(f"Erro ao gravar métricas da execução: {e}")
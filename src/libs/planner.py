@@ -0,0 +1,228 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+FIXTURES_ENDPOINT = "fixtures"
+TOP_SCORERS_ENDPOINT = "players/topscorers"
+TOP_ASSISTS_ENDPOINT = "players/topassists"
+DEFAULT_ENDPOINTS = (FIXTURES_ENDPOINT, TOP_SCORERS_ENDPOINT, TOP_ASSISTS_ENDPOINT)
+# Detalhes por partida (fixtures?ids=); opcional e dependente da partição de fixtures
+FIXTURE_DETAILS_ENDPOINT = "fixtures/details"
+# Estatísticas de todos os jogadores da liga (paginado); opcional
+SQUAD_STATS_ENDPOINT = "players"
+
+# Estado de cache/frescor de uma unidade antes da execução
+STATE_FRESH = "cache_fresh"            # resposta em cache dentro do TTL: sem custo de cota
+STATE_STALE = "cache_stale"            # resposta em cache expirada: será rebuscada
+STATE_LOCAL = "local_file"             # CSV já existe (cache de respostas desligado)
+STATE_MISSING = "missing"              # nada local: chamada necessária
+STATE_DELTA = "delta"                  # refresh incremental dos fixtures não finalizados
+STATE_OUT_OF_TARGETS = "out_of_targets"
+STATE_DONE = "journal_done"            # concluída na execução que está sendo retomada
+
+# Latência média assumida por chamada quando não há execução anterior para comparar
+DEFAULT_CALL_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """Uma chamada de extração: endpoint × league × season."""
+
+    endpoint: str
+    league: int
+    season: int
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {"league": self.league, "season": self.season}
+
+
+def build_work_units(
+    leagues: Iterable[int],
+    seasons: Iterable[int],
+    endpoints: Sequence[str] = DEFAULT_ENDPOINTS,
+) -> List[WorkUnit]:
+    """Monta as unidades na ordem do config (league → season → endpoint).
+
+    Leagues/seasons repetidas no config geram uma única unidade.
+    """
+    seasons = list(dict.fromkeys(seasons))
+    return [
+        WorkUnit(endpoint, league, season)
+        for league in dict.fromkeys(leagues)
+        for season in seasons
+        for endpoint in dict.fromkeys(endpoints)
+    ]
+
+
+def unit_priority(unit: WorkUnit, current_season: int) -> int:
+    """Menor valor = maior prioridade.
+
+    Fixtures da temporada corrente mudam a cada rodada e vêm primeiro; rankings
+    de temporadas encerradas não mudam mais e ficam por último.
+    """
+    is_current = unit.season >= current_season
+    is_fixtures = unit.endpoint == FIXTURES_ENDPOINT
+    if is_current:
+        return 0 if is_fixtures else 1
+    return 2 if is_fixtures else 3
+
+
+def prioritize_units(
+    units: Sequence[WorkUnit],
+    current_season: int,
+    budget: Optional[int] = None,
+    costs: Optional[Mapping[WorkUnit, int]] = None,
+) -> tuple[List[WorkUnit], List[WorkUnit]]:
+    """Ordena as unidades por prioridade e corta o que não cabe no orçamento de chamadas.
+
+    `costs` dá as chamadas estimadas por unidade (padrão: 1). Retorna (selecionadas,
+    adiadas). Com budget=None (cota desconhecida) nada é adiado.
+    """
+    ordered = sorted(units, key=lambda unit: unit_priority(unit, current_season))
+    cost = (lambda unit: costs.get(unit, 1)) if costs is not None else (lambda unit: 1)
+    needed = sum(cost(unit) for unit in ordered)
+    if budget is None or budget >= needed:
+        return ordered, []
+
+    selected: List[WorkUnit] = []
+    deferred: List[WorkUnit] = []
+    spent = 0
+    for unit in ordered:
+        # Uma vez estourado o orçamento, o restante é adiado para preservar a ordem de prioridade
+        if not deferred and spent + cost(unit) <= max(0, budget):
+            selected.append(unit)
+            spent += cost(unit)
+        else:
+            deferred.append(unit)
+    logger.warning(
+        f"Cota restante ({budget}) menor que o necessário ({needed}): "
+        f"{len(deferred)} unidades adiadas para a próxima execução"
+    )
+    return selected, deferred
+
+
+def estimate_seconds(calls: int, requests_per_minute: int, concurrency: int = 1,
+                     call_seconds: float = DEFAULT_CALL_SECONDS) -> float:
+    """Duração estimada: o gargalo entre o rate limit e a latência × requisições em voo."""
+    if calls <= 0:
+        return 0.0
+    throughput = float(requests_per_minute) / 60.0 if requests_per_minute > 0 else float("inf")
+    if call_seconds > 0:
+        throughput = min(throughput, max(1, concurrency) / call_seconds)
+    return calls / throughput
+
+
+@dataclass
+class PlannedUnit:
+    """Unidade anotada com o estado local e o custo estimado em chamadas."""
+
+    unit: WorkUnit
+    state: str
+    estimated_calls: int
+    deferred: bool = False
+
+
+@dataclass
+class ExtractionPlan:
+    """Plano completo da extração, montado antes de gastar cota."""
+
+    units: List[PlannedUnit]
+    dropped: List[tuple[WorkUnit, str]] = field(default_factory=list)
+    budget: Optional[int] = None
+    requests_per_minute: int = 10
+    concurrency: int = 1
+    call_seconds: float = DEFAULT_CALL_SECONDS
+
+    @property
+    def selected(self) -> List[WorkUnit]:
+        """Unidades a executar, na ordem de execução."""
+        return [planned.unit for planned in self.units if not planned.deferred]
+
+    @property
+    def deferred(self) -> List[WorkUnit]:
+        return [planned.unit for planned in self.units if planned.deferred]
+
+    @property
+    def estimated_calls(self) -> int:
+        return sum(planned.estimated_calls for planned in self.units if not planned.deferred)
+
+    @property
+    def estimated_seconds(self) -> float:
+        return estimate_seconds(self.estimated_calls, self.requests_per_minute, self.concurrency, self.call_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "units": [
+                {**planned.unit.params, "endpoint": planned.unit.endpoint, "state": planned.state,
+                 "estimated_calls": planned.estimated_calls, "deferred": planned.deferred}
+                for planned in self.units
+            ],
+            "dropped": [{**unit.params, "endpoint": unit.endpoint, "reason": reason} for unit, reason in self.dropped],
+            "budget": self.budget,
+            "estimated_calls": self.estimated_calls,
+            "estimated_seconds": round(self.estimated_seconds, 1),
+        }
+
+    def format(self) -> str:
+        """Tabela legível do plano (usada pelo --dry-run)."""
+        lines = [f"{'endpoint':<20} {'league':>6} {'season':>6}  {'estado':<15} {'chamadas':>8}"]
+        for planned in self.units:
+            unit = planned.unit
+            suffix = "  (adiada: cota)" if planned.deferred else ""
+            lines.append(
+                f"{unit.endpoint:<20} {unit.league:>6} {unit.season:>6}  {planned.state:<15} "
+                f"{planned.estimated_calls:>8}{suffix}"
+            )
+        for unit, reason in self.dropped:
+            lines.append(f"{unit.endpoint:<20} {unit.league:>6} {unit.season:>6}  descartada: {reason}")
+        budget = "desconhecida" if self.budget is None else str(self.budget)
+        lines.append(
+            f"{len(self.selected)} unidades, {len(self.deferred)} adiadas, {len(self.dropped)} descartadas | "
+            f"~{self.estimated_calls} chamadas, ~{self.estimated_seconds:.0f}s | cota restante: {budget}"
+        )
+        return "\n".join(lines)
+
+
+def build_plan(
+    annotated: Iterable[PlannedUnit],
+    current_season: int,
+    budget: Optional[int] = None,
+    requests_per_minute: int = 10,
+    concurrency: int = 1,
+    call_seconds: float = DEFAULT_CALL_SECONDS,
+) -> ExtractionPlan:
+    """Descarta unidades fora dos targets, prioriza as que gastam cota e corta pelo orçamento.
+
+    Unidades sem custo (cache fresco ou CSV local) sempre rodam, depois das pagas;
+    as já concluídas na execução retomada são descartadas.
+    """
+    dropped: List[tuple[WorkUnit, str]] = []
+    free: List[PlannedUnit] = []
+    paid: Dict[WorkUnit, PlannedUnit] = {}
+    for planned in annotated:
+        if planned.state == STATE_OUT_OF_TARGETS:
+            dropped.append((planned.unit, "fora dos targets do config"))
+        elif planned.state == STATE_DONE:
+            dropped.append((planned.unit, "concluída na execução retomada"))
+        elif planned.estimated_calls > 0:
+            paid[planned.unit] = planned
+        else:
+            free.append(planned)
+
+    costs = {unit: planned.estimated_calls for unit, planned in paid.items()}
+    selected, deferred = prioritize_units(list(paid), current_season, budget, costs)
+    for unit in deferred:
+        paid[unit].deferred = True
+    units = [paid[unit] for unit in selected] + free + [paid[unit] for unit in deferred]
+    return ExtractionPlan(
+        units=units,
+        dropped=dropped,
+        budget=budget,
+        requests_per_minute=requests_per_minute,
+        concurrency=concurrency,
+        call_seconds=call_seconds,
+    )
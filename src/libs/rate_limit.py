@@ -0,0 +1,259 @@
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from .metrics import METRICS
+from .utils import DATA_DIR, setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_RATE_LIMIT_DB = os.path.join(DATA_DIR, '.state', 'rate_limit.sqlite')
+
+# Headers documentados pela API-Football
+DAILY_LIMIT_HEADER = "x-ratelimit-requests-limit"
+DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+MINUTE_LIMIT_HEADER = "X-RateLimit-Limit"
+MINUTE_REMAINING_HEADER = "X-RateLimit-Remaining"
+
+
+class QuotaExhaustedError(Exception):
+    """Cota diária do plano da API-Football esgotada."""
+
+
+def _header_int(headers: Mapping[str, Any], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class QuotaRateLimiter:
+    """Token bucket compartilhado entre processos (SQLite) e ajustado pelos headers da API.
+
+    Cada processo que aponta para o mesmo arquivo consome do mesmo bucket, então
+    várias extrações simultâneas no mesmo host respeitam juntas o limite por minuto
+    e a cota diária do plano.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        requests_per_minute: int = 10,
+        daily_quota: Optional[int] = None,
+        burst: int = 1,
+        name: str = "api_football",
+    ):
+        self.db_path = Path(db_path or os.getenv("API_FOOTBALL_RATE_LIMIT_DB") or DEFAULT_RATE_LIMIT_DB)
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, burst)
+        if daily_quota is None and os.getenv("API_FOOTBALL_DAILY_QUOTA"):
+            daily_quota = int(os.environ["API_FOOTBALL_DAILY_QUOTA"])
+        self.daily_quota = daily_quota
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: transações controladas manualmente com BEGIN IMMEDIATE
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS bucket (
+                       name TEXT PRIMARY KEY,
+                       rate_per_minute REAL NOT NULL,
+                       capacity REAL NOT NULL,
+                       tokens REAL NOT NULL,
+                       updated_at REAL NOT NULL,
+                       blocked_until REAL NOT NULL DEFAULT 0
+                   )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS quota (
+                       name TEXT PRIMARY KEY,
+                       day TEXT NOT NULL,
+                       daily_limit INTEGER,
+                       used INTEGER NOT NULL DEFAULT 0,
+                       remaining INTEGER
+                   )"""
+            )
+            # A configuração (taxa, capacidade, cota) vale a partir desta instância; o estado
+            # compartilhado (tokens, consumo do dia) é preservado
+            conn.execute(
+                """INSERT INTO bucket (name, rate_per_minute, capacity, tokens, updated_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       rate_per_minute = excluded.rate_per_minute,
+                       capacity = excluded.capacity""",
+                (self.name, float(self.requests_per_minute), float(self.burst), float(self.burst), time.time()),
+            )
+            # Sem cota configurada, mantém a conhecida (ex.: aprendida dos headers da API)
+            conn.execute(
+                """INSERT INTO quota (name, day, daily_limit, remaining) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       daily_limit = COALESCE(excluded.daily_limit, quota.daily_limit),
+                       remaining = CASE
+                           WHEN excluded.daily_limit IS NULL THEN quota.remaining
+                           WHEN quota.remaining IS NULL THEN MAX(0, excluded.daily_limit - quota.used)
+                           ELSE MIN(quota.remaining, excluded.daily_limit)
+                       END""",
+                (self.name, _utc_day(), self.daily_quota, self.daily_quota),
+            )
+        finally:
+            conn.close()
+
+    def _roll_quota_day(self, conn: sqlite3.Connection) -> None:
+        """Zera o consumo quando o dia UTC muda (a cota da API reinicia à meia-noite UTC)."""
+        today = _utc_day()
+        day, daily_limit = conn.execute("SELECT day, daily_limit FROM quota WHERE name = ?", (self.name,)).fetchone()
+        if day != today:
+            conn.execute(
+                "UPDATE quota SET day = ?, used = 0, remaining = ? WHERE name = ?",
+                (today, daily_limit, self.name),
+            )
+
+    def try_acquire(self) -> float:
+        """Tenta consumir um token; retorna 0 em caso de sucesso ou os segundos a aguardar."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._roll_quota_day(conn)
+            remaining = conn.execute("SELECT remaining FROM quota WHERE name = ?", (self.name,)).fetchone()[0]
+            if remaining is not None and remaining <= 0:
+                conn.execute("COMMIT")
+                raise QuotaExhaustedError("Cota diária da API-Football esgotada")
+
+            rate, capacity, tokens, updated_at, blocked_until = conn.execute(
+                "SELECT rate_per_minute, capacity, tokens, updated_at, blocked_until FROM bucket WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            now = time.time()
+            rate_per_second = rate / 60.0
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate_per_second)
+
+            if blocked_until > now:
+                wait = blocked_until - now
+            elif tokens >= 1.0:
+                tokens -= 1.0
+                wait = 0.0
+                conn.execute(
+                    "UPDATE quota SET used = used + 1, remaining = CASE WHEN remaining IS NULL THEN NULL ELSE remaining - 1 END WHERE name = ?",
+                    (self.name,),
+                )
+            else:
+                wait = (1.0 - tokens) / rate_per_second
+
+            conn.execute(
+                "UPDATE bucket SET tokens = ?, updated_at = ? WHERE name = ?",
+                (tokens, now, self.name),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self) -> float:
+        """Bloqueia até obter um token; retorna o tempo total aguardado."""
+        waited = 0.0
+        while (wait := self.try_acquire()) > 0:
+            logger.info(f"Rate limit: aguardando {wait:.2f}s")
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def acquire_async(self) -> float:
+        """Versão assíncrona de acquire; a transação SQLite (que pode esperar o lock) roda fora do event loop."""
+        waited = 0.0
+        while (wait := await asyncio.to_thread(self.try_acquire)) > 0:
+            logger.info(f"Rate limit: aguardando {wait:.2f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def block_for(self, seconds: float) -> None:
+        """Suspende o bucket para todos os processos (ex.: após um 429)."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE bucket SET tokens = 0, updated_at = ?, blocked_until = MAX(blocked_until, ?) WHERE name = ?",
+                (time.time(), time.time() + seconds, self.name),
+            )
+        finally:
+            conn.close()
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Ajusta taxa por minuto e cota diária a partir dos headers da resposta."""
+        minute_limit = _header_int(headers, MINUTE_LIMIT_HEADER)
+        minute_remaining = _header_int(headers, MINUTE_REMAINING_HEADER)
+        daily_limit = _header_int(headers, DAILY_LIMIT_HEADER)
+        daily_remaining = _header_int(headers, DAILY_REMAINING_HEADER)
+        if daily_remaining is not None:
+            METRICS.set_quota_remaining(daily_remaining)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if minute_limit:
+                # Nunca ultrapassa o limite configurado localmente
+                rate = min(float(minute_limit), float(self.requests_per_minute))
+                conn.execute("UPDATE bucket SET rate_per_minute = ? WHERE name = ?", (rate, self.name))
+            if minute_remaining is not None:
+                if minute_remaining <= 0:
+                    conn.execute(
+                        "UPDATE bucket SET tokens = 0, updated_at = ?, blocked_until = MAX(blocked_until, ?) WHERE name = ?",
+                        (time.time(), time.time() + 60.0, self.name),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE bucket SET tokens = MIN(tokens, ?) WHERE name = ?",
+                        (float(minute_remaining), self.name),
+                    )
+            if daily_limit is not None or daily_remaining is not None:
+                self._roll_quota_day(conn)
+                conn.execute(
+                    """UPDATE quota SET
+                           daily_limit = COALESCE(?, daily_limit),
+                           remaining = COALESCE(?, remaining),
+                           used = COALESCE(? - ?, used)
+                       WHERE name = ?""",
+                    (daily_limit, daily_remaining, daily_limit, daily_remaining, self.name),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def remaining_daily(self) -> Optional[int]:
+        """Retorna as requisições restantes no dia (None se a cota for desconhecida)."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._roll_quota_day(conn)
+            remaining = conn.execute("SELECT remaining FROM quota WHERE name = ?", (self.name,)).fetchone()[0]
+            conn.execute("COMMIT")
+            return remaining
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
@@ -0,0 +1,224 @@
+"""Classificação, mandante/visitante, forma recente e posição por rodada, a partir dos fixtures.
+
+Tudo é calculado de uma vez para todas as leagues/seasons (groupby/cumsum/rank), sem
+chamar a API. O StandingsEngine guarda as partidas por partição (season, league) e, quando
+o refresh incremental altera resultados, só as partições afetadas são reprocessadas.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from .api_football import FINAL_STATUSES
+from .api_football_models import FixtureResult
+from .utils import DATA_DIR, FIXTURE_FIELDNAMES, csv_stem, fixture_to_row, list_csv, open_csv, setup_logger
+
+logger = setup_logger(__name__)
+
+PARTITION_KEYS = ["season", "league"]
+TEAM_KEYS = PARTITION_KEYS + ["team_id"]
+# Critérios de desempate: pontos, vitórias, saldo, gols pró (regulamento do Brasileirão)
+TIEBREAKERS = ["points", "wins", "goal_diff", "goals_for"]
+DEFAULT_FORM_WINDOW = 5
+
+_FIXTURES_FILE = re.compile(r"season_(\d+)_league_(\d+)_results$")
+_RESULT_LETTERS = np.array(["L", "D", "W"])
+
+
+def fixtures_frame(results: Iterable[FixtureResult]) -> pd.DataFrame:
+    """Converte a saída de MatchResultsService.get_fixtures no mesmo formato das partições CSV."""
+    rows = [
+        {**fixture_to_row(result), "season": result.season, "league": result.league_id}
+        for result in results
+    ]
+    return pd.DataFrame(rows, columns=FIXTURE_FIELDNAMES + PARTITION_KEYS)
+
+
+def team_match_rows(fixtures: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por time por partida encerrada (formato longo), com gols e pontos.
+
+    Colunas season/league, quando presentes, são mantidas em cada linha.
+    """
+    keys = [column for column in PARTITION_KEYS if column in fixtures]
+    status = fixtures["status"].fillna("").astype(str).str.strip() if "status" in fixtures else pd.Series("", index=fixtures.index)
+    home_goals = pd.to_numeric(fixtures["fulltime_home"], errors="coerce")
+    away_goals = pd.to_numeric(fixtures["fulltime_away"], errors="coerce")
+    finished = home_goals.notna() & away_goals.notna() & (status.eq("") | status.isin(FINAL_STATUSES))
+    fixtures = fixtures.loc[finished]
+    home_goals, away_goals = home_goals[finished], away_goals[finished]
+
+    def side(venue: str, prefix: str, goals_for: pd.Series, goals_against: pd.Series) -> pd.DataFrame:
+        frame = {key: fixtures[key].to_numpy() for key in keys}
+        frame.update({
+            "fixture_id": fixtures["fixture_id"].to_numpy(),
+            "date": fixtures["date"].to_numpy(),
+            "team_id": fixtures[f"{prefix}_team_id"].to_numpy(),
+            "team_name": fixtures[f"{prefix}_team_name"].to_numpy(),
+            "venue": venue,
+            "goals_for": goals_for.to_numpy(),
+            "goals_against": goals_against.to_numpy(),
+        })
+        return pd.DataFrame(frame)
+
+    rows = pd.concat(
+        [side("home", "home", home_goals, away_goals), side("away", "away", away_goals, home_goals)],
+        ignore_index=True,
+    )
+    rows["goals_for"] = rows["goals_for"].astype("int64")
+    rows["goals_against"] = rows["goals_against"].astype("int64")
+    diff = rows["goals_for"].to_numpy() - rows["goals_against"].to_numpy()
+    rows["win"] = (diff > 0).astype("int64")
+    rows["draw"] = (diff == 0).astype("int64")
+    rows["loss"] = (diff < 0).astype("int64")
+    rows["points"] = np.select([diff > 0, diff == 0], [3, 1], 0).astype("int64")
+    return rows
+
+
+def _rank(frame: pd.DataFrame, group_keys: List[str]) -> pd.Series:
+    """Posição dentro de cada grupo pelos critérios de desempate."""
+    ordered = frame.sort_values(group_keys + TIEBREAKERS, ascending=[True] * len(group_keys) + [False] * len(TIEBREAKERS))
+    return ordered.groupby(group_keys, sort=False).cumcount().add(1).reindex(frame.index)
+
+
+def standings_table(rows: pd.DataFrame, venue: Optional[str] = None) -> pd.DataFrame:
+    """Classificação por (season, league); venue='home'/'away' restringe aos jogos em casa/fora."""
+    if venue is not None:
+        rows = rows.loc[rows["venue"] == venue]
+    table = rows.groupby(TEAM_KEYS, sort=False).agg(
+        team_name=("team_name", "last"),
+        matches=("points", "size"),
+        wins=("win", "sum"),
+        draws=("draw", "sum"),
+        losses=("loss", "sum"),
+        goals_for=("goals_for", "sum"),
+        goals_against=("goals_against", "sum"),
+        points=("points", "sum"),
+    ).reset_index()
+    table["goal_diff"] = table["goals_for"] - table["goals_against"]
+    table.insert(2, "position", _rank(table, PARTITION_KEYS))
+    return table.sort_values(PARTITION_KEYS + ["position"], ignore_index=True)
+
+
+def _chronological(rows: pd.DataFrame) -> pd.DataFrame:
+    kickoff = pd.to_datetime(rows["date"], errors="coerce", utc=True)
+    return rows.assign(_kickoff=kickoff).sort_values(TEAM_KEYS + ["_kickoff", "fixture_id"], ignore_index=True)
+
+
+def form_table(rows: pd.DataFrame, window: int = DEFAULT_FORM_WINDOW) -> pd.DataFrame:
+    """Forma recente por time: sequência dos últimos `window` jogos (ex.: "WDLWW") e pontos nela."""
+    rows = _chronological(rows)
+    grouped = rows.groupby(TEAM_KEYS, sort=False)
+    rows["form_points"] = grouped["points"].rolling(window, min_periods=1).sum().to_numpy().astype("int64")
+    rows["result"] = _RESULT_LETTERS[np.sign(rows["goals_for"] - rows["goals_against"]).to_numpy() + 1]
+    last = rows.groupby(TEAM_KEYS, sort=False).tail(window)
+    form = last.groupby(TEAM_KEYS, sort=False).agg(
+        team_name=("team_name", "last"),
+        form=("result", "sum"),
+        form_matches=("result", "size"),
+    ).reset_index()
+    points = rows.groupby(TEAM_KEYS, sort=False)["form_points"].last().rename("form_points").reset_index()
+    return form.merge(points, on=TEAM_KEYS).sort_values(PARTITION_KEYS + ["form_points"], ascending=[True, True, False], ignore_index=True)
+
+
+def positions_by_matchday(rows: pd.DataFrame) -> pd.DataFrame:
+    """Posição de cada time após cada rodada (a n-ésima partida do time), com o acumulado até ela."""
+    rows = _chronological(rows)
+    grouped = rows.groupby(TEAM_KEYS, sort=False)
+    progress = rows[TEAM_KEYS + ["team_name", "fixture_id"]].copy()
+    progress["matchday"] = grouped.cumcount() + 1
+    for column, source in (("points", "points"), ("wins", "win"), ("goals_for", "goals_for"), ("goals_against", "goals_against")):
+        progress[column] = grouped[source].cumsum()
+    progress["goal_diff"] = progress["goals_for"] - progress["goals_against"]
+    progress["position"] = _rank(progress, PARTITION_KEYS + ["matchday"])
+    return progress.sort_values(PARTITION_KEYS + ["matchday", "position"], ignore_index=True)
+
+
+class StandingsEngine:
+    """Mantém as partidas de todas as partições e recalcula só o que mudou.
+
+    `load()` relê do disco apenas as partições cujo CSV mudou (mtime/tamanho);
+    `update()` aplica fixtures já em memória (ex.: saída de get_fixtures) por fixture_id.
+    """
+
+    def __init__(self, data_dir: str | Path | None = None):
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self._fixtures: Dict[tuple[int, int], pd.DataFrame] = {}
+        self._rows: Dict[tuple[int, int], pd.DataFrame] = {}
+        self._signatures: Dict[tuple[int, int], tuple[int, int]] = {}
+        self._all_rows: Optional[pd.DataFrame] = None
+
+    def _set_partition(self, key: tuple[int, int], fixtures: pd.DataFrame) -> None:
+        self._fixtures[key] = fixtures
+        self._rows[key] = team_match_rows(fixtures)
+        self._all_rows = None
+
+    def load(self, seasons: Optional[Iterable[int]] = None, leagues: Optional[Iterable[int]] = None) -> Set[tuple[int, int]]:
+        """Carrega as partições novas ou alteradas; retorna as chaves (season, league) recalculadas."""
+        seasons = set(seasons) if seasons else None
+        leagues = set(leagues) if leagues else None
+        changed: Set[tuple[int, int]] = set()
+        for csv_file in list_csv(self.data_dir / "sport" / "seasons", "season_*_league_*_results"):
+            match = _FIXTURES_FILE.match(csv_stem(csv_file))
+            if match is None:
+                continue
+            key = (int(match[1]), int(match[2]))
+            if (seasons and key[0] not in seasons) or (leagues and key[1] not in leagues):
+                continue
+            stat = csv_file.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._signatures.get(key) == signature:
+                continue
+            with open_csv(csv_file) as f:
+                fixtures = pd.read_csv(f, dtype={"status": "string"}).assign(season=key[0], league=key[1])
+            self._set_partition(key, fixtures)
+            self._signatures[key] = signature
+            changed.add(key)
+        if changed:
+            logger.info(f"Classificação: {len(changed)} partições recalculadas")
+        return changed
+
+    def update(self, fixtures: pd.DataFrame | Iterable[FixtureResult]) -> Set[tuple[int, int]]:
+        """Mescla fixtures novos/atualizados (por fixture_id) e recalcula só as partições tocadas."""
+        if not isinstance(fixtures, pd.DataFrame):
+            fixtures = fixtures_frame(fixtures)
+        fixtures = fixtures.dropna(subset=PARTITION_KEYS).astype({"season": "int64", "league": "int64"})
+        changed: Set[tuple[int, int]] = set()
+        for (season, league), incoming in fixtures.groupby(PARTITION_KEYS, sort=False):
+            key = (int(season), int(league))
+            current = self._fixtures.get(key)
+            merged = incoming if current is None else pd.concat(
+                [current.loc[~current["fixture_id"].isin(incoming["fixture_id"])], incoming], ignore_index=True
+            )
+            self._set_partition(key, merged.reset_index(drop=True))
+            changed.add(key)
+        return changed
+
+    @property
+    def rows(self) -> pd.DataFrame:
+        """Partidas no formato longo (uma linha por time por jogo) de todas as partições."""
+        if self._all_rows is None:
+            frames = [self._rows[key] for key in sorted(self._rows)]
+            self._all_rows = pd.concat(frames, ignore_index=True) if frames else team_match_rows(
+                pd.DataFrame(columns=FIXTURE_FIELDNAMES + PARTITION_KEYS)
+            )
+        return self._all_rows
+
+    def standings(self, venue: Optional[str] = None) -> pd.DataFrame:
+        return standings_table(self.rows, venue)
+
+    def home_away(self) -> pd.DataFrame:
+        """Classificação geral com as campanhas em casa e fora lado a lado."""
+        columns = ["matches", "wins", "draws", "losses", "goals_for", "goals_against", "goal_diff", "points", "position"]
+        overall = self.standings()
+        for venue in ("home", "away"):
+            split = self.standings(venue)[TEAM_KEYS + columns].rename(columns={column: f"{venue}_{column}" for column in columns})
+            overall = overall.merge(split, on=TEAM_KEYS, how="left")
+        return overall
+
+    def form(self, window: int = DEFAULT_FORM_WINDOW) -> pd.DataFrame:
+        return form_table(self.rows, window)
+
+    def positions(self) -> pd.DataFrame:
+        return positions_by_matchday(self.rows)
@@ -1,90 +1,333 @@
+import csv
+import hashlib
+import json
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-import boto3
-import psycopg2
-from dotenv import load_dotenv
+# boto3, psycopg2 e pandas (índice de times) são importados no uso: quem só extrai
+# ou só carrega o PostgreSQL não paga o import do SDK da AWS e vice-versa
+from .env import load_env
+from .metrics import METRICS
+from .utils import (
+    CSV_COMPRESSIONS,
+    CSV_EXTENSIONS,
+    compress_bytes,
+    compression_of,
+    csv_compression,
+    csv_stem,
+    list_csv,
+    open_csv,
+    setup_logger,
+)
 
-from .utils import setup_logger
-
-load_dotenv()
+load_env()
 
 logger = setup_logger(__name__)
 
+# Manifestos de checksum do sync ficam fora de sport/ para não serem lidos pelos crawlers
+S3_MANIFEST_PREFIX = "_sync/"
+# Multipart só para arquivos grandes (Parquet consolidado); CSVs de partição vão em um PUT
+S3_TRANSFER_SETTINGS = {
+    "multipart_threshold": 16 * 1024 * 1024,
+    "multipart_chunksize": 16 * 1024 * 1024,
+    "max_concurrency": 4,
+    "use_threads": True,
+}
+
+# Colunas aceitas nos CSVs (cabeçalho) e colunas das tabelas de destino
+FIXTURES_CSV_COLUMNS = (
+    'fixture_id', 'date', 'league_name',
+    'home_team_id', 'home_team_name', 'away_team_id', 'away_team_name',
+    'fulltime_home', 'fulltime_away', 'status',
+)
+FIXTURES_TABLE_COLUMNS = FIXTURES_CSV_COLUMNS + ('league_id', 'season')
+PLAYERS_CSV_COLUMNS = (
+    'category', 'player_id', 'player_name', 'team_id', 'team_name',
+    'appearences', 'minutes', 'goals', 'assists', 'shots_total',
+)
+PLAYERS_TABLE_COLUMNS = PLAYERS_CSV_COLUMNS + ('league_id', 'season')
+
+# tabela -> (colunas do CSV, colunas da tabela, chave de conflito)
+LOAD_TABLES = {
+    "fixtures": (FIXTURES_CSV_COLUMNS, FIXTURES_TABLE_COLUMNS, ("fixture_id",)),
+    "top_scorers": (PLAYERS_CSV_COLUMNS, PLAYERS_TABLE_COLUMNS, ("player_id", "league_id", "season")),
+    "top_assists": (PLAYERS_CSV_COLUMNS, PLAYERS_TABLE_COLUMNS, ("player_id", "league_id", "season")),
+    # Elenco completo: quem trocou de time na temporada tem uma linha por time
+    "squad_stats": (PLAYERS_CSV_COLUMNS, PLAYERS_TABLE_COLUMNS, ("player_id", "team_id", "league_id", "season")),
+}
+
+
+def _file_hash(path: Path) -> str:
+    """sha256 do conteúdo, lido em blocos (manifesto do sync S3 e load_manifest do PostgreSQL)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class S3Uploader:
-    def __init__(self, bucket_name: str | None = None):
+    def __init__(self, bucket_name: str | None = None, max_workers: int = 8, compression: str | None = None):
         self.bucket_name = bucket_name or os.getenv("S3_BUCKET_NAME")
         if not self.bucket_name:
             raise ValueError("S3_BUCKET_NAME não configurado")
-        self.s3_client = boto3.client('s3')
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config as BotoConfig
+
+        self.max_workers = max_workers
+        self.transfer_config = TransferConfig(**S3_TRANSFER_SETTINGS)
+        # CSVs locais sem compressão são comprimidos no envio (chave .csv.gz/.csv.zst)
+        self.compression = csv_compression(compression)
+        # Chaves enviadas nesta instância (usadas para registrar partições no Glue)
+        self.uploaded_keys: list[str] = []
+        # Pool HTTP dimensionado para uploads paralelos (arquivos × partes multipart)
+        self.s3_client = boto3.client(
+            's3',
+            config=BotoConfig(max_pool_connections=max_workers * self.transfer_config.max_request_concurrency),
+        )
+
+    def csv_key(self, prefix: str, csv_file: Path) -> str:
+        """Chave S3 de um CSV: mantém a compressão do arquivo local ou aplica a do uploader."""
+        compression = compression_of(csv_file)
+        if compression == 'none':
+            compression = self.compression
+        return f"{prefix}{csv_stem(csv_file)}.csv{CSV_COMPRESSIONS[compression]}"
 
-    def upload_file(self, local_path: Path, s3_key: str) -> None:
-        """Faz upload de um arquivo local para o S3."""
-        self.s3_client.upload_file(str(local_path), self.bucket_name, s3_key)
+    @staticmethod
+    def _recompressed(local_path: Path, s3_key: str) -> bool:
+        """CSV local sem compressão enviado para uma chave comprimida."""
+        return compression_of(local_path) == 'none' and compression_of(s3_key) != 'none'
+
+    @staticmethod
+    def _content_args(s3_key: str) -> dict[str, str]:
+        if not s3_key.endswith(CSV_EXTENSIONS):
+            return {}
+        compression = compression_of(s3_key)
+        args = {'ContentType': 'text/csv'}
+        if compression != 'none':
+            args['ContentEncoding'] = compression
+        return args
+
+    @staticmethod
+    def _superseded(remote: list[str], keys: list[str]) -> list[str]:
+        """Chaves remotas do mesmo CSV em outra compressão (ex.: x.csv depois de passar a enviar x.csv.gz)."""
+        def base(key: str) -> str:
+            suffix = CSV_COMPRESSIONS[compression_of(key)]
+            return key[:-len(suffix)] if suffix else key
+
+        current = set(keys)
+        bases = {base(key) for key in keys if key.endswith(CSV_EXTENSIONS)}
+        return [key for key in remote if key not in current and key.endswith(CSV_EXTENSIONS) and base(key) in bases]
+
+    def upload_file(self, local_path: Path, s3_key: str, checksum: str | None = None) -> None:
+        """Faz upload de um arquivo local para o S3 (comprimindo o CSV se a chave pedir)."""
+        extra_args = self._content_args(s3_key)
+        if checksum:
+            extra_args['Metadata'] = {'sha256': checksum}
+        if self._recompressed(local_path, s3_key):
+            body = compress_bytes(local_path.read_bytes(), compression_of(s3_key))
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=body, **extra_args)
+            size = len(body)
+        else:
+            self.s3_client.upload_file(
+                str(local_path), self.bucket_name, s3_key,
+                ExtraArgs=extra_args or None, Config=self.transfer_config,
+            )
+            size = os.path.getsize(local_path)
+        self.uploaded_keys.append(s3_key)
+        METRICS.add_bytes('s3_upload', size)
 
     def clear_sport_data(self) -> None:
         """Remove todos os arquivos da pasta sport/ no S3."""
+        self.delete_keys(list(self.list_objects('sport/')))
+
+    def delete_keys(self, keys: list[str]) -> None:
+        """Remove as chaves informadas em lotes de 1000 (limite do delete_objects)."""
+        for start in range(0, len(keys), 1000):
+            objects = [{'Key': key} for key in keys[start:start + 1000]]
+            self.s3_client.delete_objects(Bucket=self.bucket_name, Delete={'Objects': objects})
+
+    def list_objects(self, prefix: str) -> dict[str, int]:
+        """Lista as chaves sob o prefixo com seus tamanhos."""
         paginator = self.s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix='sport/')
-        
-        for page in pages:
-            if 'Contents' in page:
-                objects = [{'Key': obj['Key']} for obj in page['Contents']]
-                if objects:
-                    self.s3_client.delete_objects(
-                        Bucket=self.bucket_name,
-                        Delete={'Objects': objects}
-                    )
+        objects = {}
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                objects[obj['Key']] = obj['Size']
+        return objects
 
-    def upload_sport_data(self, data_dir: Path) -> None:
-        """Faz upload de todos os CSVs de dados esportivos para o S3 com particionamento."""
-        self.clear_sport_data()
-        
+    def _load_manifest(self, name: str) -> dict[str, str]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=f"{S3_MANIFEST_PREFIX}{name}.json")
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return {}
+            raise
+        return json.loads(response['Body'].read())
+
+    def _save_manifest(self, name: str, manifest: dict[str, str]) -> None:
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=f"{S3_MANIFEST_PREFIX}{name}.json",
+            Body=json.dumps(manifest, sort_keys=True).encode('utf-8'),
+            ContentType='application/json',
+        )
+
+    def sync(self, files: dict[str, Path], prefix: str, manifest_name: str, delete_stale: bool = True) -> dict[str, int]:
+        """Sincroniza arquivos locais (chave S3 -> caminho) com o prefixo no bucket.
+
+        Só sobe o que é novo ou mudou segundo o manifesto de checksums (sha256) salvo
+        no bucket; chaves que não existem mais localmente são removidas apenas depois
+        que todos os uploads terminaram, então o prefixo nunca fica vazio.
+        """
+        remote = self.list_objects(prefix)
+        manifest = self._load_manifest(manifest_name)
+
+        checksums = {key: _file_hash(path) for key, path in files.items()}
+        # Comprimidos no envio não têm o tamanho do local: vale só o checksum do manifesto
+        changed = [
+            key for key, path in files.items()
+            if key not in remote
+            or (remote[key] != path.stat().st_size and not self._recompressed(path, key))
+            or manifest.get(key) != checksums[key]
+        ]
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self.upload_file, files[key], key, checksums[key]): key
+                    for key in changed
+                }
+                for future in as_completed(futures):
+                    future.result()
+
+        stale = [key for key in remote if key not in files] if delete_stale else []
+        # Mesmo sem delete_stale, o CSV não pode ficar duas vezes na tabela (x.csv e x.csv.gz)
+        stale += [key for key in self._superseded(list(remote), list(files)) if key not in stale]
+        if stale:
+            self.delete_keys(stale)
+
+        kept = {key: value for key, value in manifest.items() if key in remote and key not in stale}
+        self._save_manifest(manifest_name, {**kept, **checksums})
+
+        logger.info(
+            f"Sync s3://{self.bucket_name}/{prefix}: {len(changed)} enviados, "
+            f"{len(files) - len(changed)} inalterados, {len(stale)} removidos"
+        )
+        return {"uploaded": len(changed), "unchanged": len(files) - len(changed), "deleted": len(stale)}
+
+    def _sport_csv_files(self, data_dir: Path) -> dict[str, Path]:
+        """Mapeia os CSVs esportivos para as chaves particionadas no S3."""
         seasons_dir = data_dir / "sport" / "seasons"
         players_dir = data_dir / "sport" / "players"
+        files = {}
 
         if seasons_dir.exists():
-            for csv_file in seasons_dir.glob("season_*_league_*_results.csv"):
-                parts = csv_file.stem.split('_')
+            for csv_file in list_csv(seasons_dir, "season_*_league_*_results"):
+                parts = csv_stem(csv_file).split('_')
                 # season_2024_league_475_results -> parts[1]=2024, parts[3]=475
                 season = parts[1]
                 league = parts[3]
-                s3_key = f"sport/seasons/season={season}/league={league}/{csv_file.name}"
-                self.upload_file(csv_file, s3_key)
+                files[self.csv_key(f"sport/seasons/season={season}/league={league}/", csv_file)] = csv_file
 
         if players_dir.exists():
-            for csv_file in players_dir.glob("*.csv"):
+            for csv_file in list_csv(players_dir, "*"):
                 # Arquivo: top_scorers_league_71_season_2023.csv
-                parts = csv_file.stem.split('_')
+                parts = csv_stem(csv_file).split('_')
                 stat_type = '_'.join(parts[:2])  # top_scorers
                 league = parts[3]  # 71
                 season = parts[5]  # 2023
                 # Estrutura: sport/players/top_scorers/league=71/season=2023/arquivo.csv
-                s3_key = f"sport/players/{stat_type}/league={league}/season={season}/{csv_file.name}"
-                self.upload_file(csv_file, s3_key)
+                files[self.csv_key(f"sport/players/{stat_type}/league={league}/season={season}/", csv_file)] = csv_file
+
+        # fixture_details/statistics/season_2024_league_71.csv
+        #   -> sport/fixture_details/fixture_statistics/season=2024/league=71/season_2024_league_71.csv
+        # (o diretório antes de season= é o nome da tabela no Glue)
+        for csv_file in list_csv(data_dir / "sport" / "fixture_details", "*/season_*_league_*"):
+            parts = csv_stem(csv_file).split('_')
+            kind = csv_file.parent.name
+            files[self.csv_key(f"sport/fixture_details/fixture_{kind}/season={parts[1]}/league={parts[3]}/", csv_file)] = csv_file
+        return files
+
+    @staticmethod
+    def _sport_parquet_files(data_dir: Path) -> dict[str, Path]:
+        parquet_dir = data_dir / "sport" / "parquet"
+        if not parquet_dir.exists():
+            return {}
+        # seasons/season=2024/league=71/arquivo.parquet -> sport/parquet/seasons/season=2024/league=71/arquivo.parquet
+        return {
+            f"sport/parquet/{parquet_file.relative_to(parquet_dir).as_posix()}": parquet_file
+            for parquet_file in parquet_dir.rglob("*.parquet")
+        }
+
+    def sync_sport_data(self, data_dir: Path, include_parquet: bool = False) -> dict[str, int]:
+        """Sincroniza sport/ com os CSVs (e opcionalmente o Parquet) locais."""
+        files = self._sport_csv_files(data_dir)
+        if include_parquet:
+            files.update(self._sport_parquet_files(data_dir))
+        return self.sync(files, 'sport/', 'sport')
+
+    def upload_sport_data(self, data_dir: Path) -> None:
+        """Faz upload de todos os CSVs de dados esportivos para o S3 com particionamento (limpa sport/ antes)."""
+        self.clear_sport_data()
+        for s3_key, csv_file in self._sport_csv_files(data_dir).items():
+            self.upload_file(csv_file, s3_key)
+
+    def upload_sport_parquet(self, data_dir: Path) -> None:
+        """Faz upload das partições Parquet mantendo o layout season=/league= em sport/parquet/."""
+        for s3_key, parquet_file in self._sport_parquet_files(data_dir).items():
+            self.upload_file(parquet_file, s3_key)
+
+    def _financial_files(self, data_dir: Path) -> dict[str, Path]:
+        financial_dir = data_dir / "financial"
+        files = {}
+        for subdir in ("transfers", "balances"):
+            source_dir = financial_dir / subdir
+            if source_dir.exists():
+                for csv_file in list_csv(source_dir, "*"):
+                    files[self.csv_key(f"financial/_data_treated/{subdir}/", csv_file)] = csv_file
+        return files
 
     def upload_financial_data(self, data_dir: Path) -> None:
         """Faz upload de todos os CSVs de dados financeiros para o S3."""
-        financial_dir = data_dir / "financial"
-        
-        if not financial_dir.exists():
-            return
-        
-        # Upload de transfers
-        transfers_dir = financial_dir / "transfers"
-        if transfers_dir.exists():
-            for csv_file in transfers_dir.glob("*.csv"):
-                s3_key = f"financial/_data_treated/transfers/{csv_file.name}"
-                self.upload_file(csv_file, s3_key)
-        
-        # Upload de balances
-        balances_dir = financial_dir / "balances"
-        if balances_dir.exists():
-            for csv_file in balances_dir.glob("*.csv"):
-                s3_key = f"financial/_data_treated/balances/{csv_file.name}"
-                self.upload_file(csv_file, s3_key)
+        files = self._financial_files(data_dir)
+        for s3_key, csv_file in files.items():
+            self.upload_file(csv_file, s3_key)
+        superseded = self._superseded(list(self.list_objects('financial/_data_treated/')), list(files))
+        if superseded:
+            self.delete_keys(superseded)
+
+    @staticmethod
+    def _financial_parquet_files(data_dir: Path) -> dict[str, Path]:
+        parquet_dir = data_dir / "financial" / "parquet"
+        if not parquet_dir.exists():
+            return {}
+        # transfers/arquivo.parquet -> financial/parquet/transfers/arquivo.parquet
+        return {
+            f"financial/parquet/{parquet_file.relative_to(parquet_dir).as_posix()}": parquet_file
+            for parquet_file in parquet_dir.rglob("*.parquet")
+        }
+
+    def upload_financial_parquet(self, data_dir: Path) -> None:
+        """Faz upload dos Parquet financeiros tipados para financial/parquet/."""
+        for s3_key, parquet_file in self._financial_parquet_files(data_dir).items():
+            self.upload_file(parquet_file, s3_key)
+
+    def sync_financial_data(self, data_dir: Path, include_parquet: bool = False) -> dict[str, int]:
+        """Envia só os CSVs (e opcionalmente os Parquet tipados) financeiros alterados.
+
+        Os CSVs tratados nunca são removidos do bucket; já financial/parquet/ espelha o local.
+        """
+        stats = self.sync(self._financial_files(data_dir), 'financial/_data_treated/', 'financial', delete_stale=False)
+        if include_parquet:
+            self.sync(self._financial_parquet_files(data_dir), 'financial/parquet/', 'financial_parquet')
+        return stats
 
 
 class PostgresLoader:
@@ -101,6 +344,8 @@ class PostgresLoader:
 
     def _get_connection(self):
         """Cria e retorna uma conexão com o PostgreSQL."""
+        import psycopg2
+
         return psycopg2.connect(**self.conn_params)
 
     def create_schema(self) -> None:
@@ -123,135 +368,211 @@ class PostgresLoader:
         conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                cur.execute("TRUNCATE TABLE fixtures, top_scorers, top_assists CASCADE;")
+                cur.execute("TRUNCATE TABLE fixtures, top_scorers, top_assists, squad_stats, team_identity CASCADE;")
                 conn.commit()
         finally:
             conn.close()
 
-    def _parse_int(self, value: str | None) -> int | None:
-        """Converte string para int, retornando None se vazio ou inválido."""
-        if not value or value.strip() == '':
-            return None
-        try:
-            return int(value)
-        except (ValueError, TypeError):
-            return None
-    
-    def _parse_timestamp(self, value: str | None) -> str | None:
-        """Retorna timestamp como string, ou None se vazio."""
-        if not value or value.strip() == '':
-            return None
-        return value.strip()
+    def _copy_to_staging(self, cur, csv_path: Path, staging_table: str, allowed_columns: tuple[str, ...]) -> int:
+        """Copia o CSV para a tabela de staging via COPY FROM STDIN; retorna as linhas copiadas."""
+        with open_csv(csv_path) as f:
+            header = next(csv.reader([f.readline()]), None)
+            if not header:
+                return 0
+            unknown = set(header) - set(allowed_columns)
+            if unknown:
+                raise ValueError(f"Colunas inesperadas em {csv_path.name}: {sorted(unknown)}")
+            # O cabeçalho já foi consumido (streams comprimidos não voltam ao início)
+            # Campos vazios sem aspas viram NULL no formato csv do COPY
+            cur.copy_expert(
+                f"COPY {staging_table} ({', '.join(header)}) FROM STDIN WITH (FORMAT csv)",
+                f,
+            )
+            return cur.rowcount
 
-    def load_fixtures_csv(self, csv_path: Path) -> None:
-        """Carrega CSV de fixtures extraindo season e league_id do nome do arquivo."""
-        import csv
-        
-        # Extrai season e league_id do nome: season_2023_league_11_results.csv
-        parts = csv_path.stem.split('_')
-        season = int(parts[1])  # 2023
-        league_id = int(parts[3])  # 11
-        
+    def _stage_partition(self, cur, csv_path: Path, staging_table: str, allowed_columns: tuple[str, ...],
+                         league_id: int, season: int) -> int:
+        """Copia uma partição e preenche league_id/season, que vêm do nome do arquivo."""
+        copied = self._copy_to_staging(cur, csv_path, staging_table, allowed_columns)
+        cur.execute(
+            f"UPDATE {staging_table} SET league_id = %s, season = %s WHERE season IS NULL",
+            (league_id, season),
+        )
+        return copied
+
+    @staticmethod
+    def _fixtures_partition(csv_path: Path) -> tuple[int, int]:
+        # season_2023_league_11_results.csv -> league_id=11, season=2023
+        parts = csv_stem(csv_path).split('_')
+        return int(parts[3]), int(parts[1])
+
+    @staticmethod
+    def _players_partition(csv_path: Path) -> tuple[int, int]:
+        # top_scorers_league_11_season_2023.csv -> league_id=11, season=2023
+        parts = csv_stem(csv_path).split('_')
+        return int(parts[3]), int(parts[5])
+
+    def _partition_of(self, table_name: str, csv_path: Path) -> tuple[int, int]:
+        if table_name == "fixtures":
+            return self._fixtures_partition(csv_path)
+        return self._players_partition(csv_path)
+
+    def _create_staging(self, cur, table_name: str) -> str:
+        """Cria a tabela temporária de staging (sem constraints) descartada no commit."""
+        staging_table = f"staging_{table_name}"
+        cur.execute(f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS SELECT * FROM {table_name} WITH NO DATA")
+        return staging_table
+
+    def _delete_missing(self, cur, staging_table: str, table_name: str) -> int:
+        """Remove das partições recarregadas as linhas que sumiram do CSV (ex.: saiu do top 20)."""
+        keys = LOAD_TABLES[table_name][2]
+        key_match = ' AND '.join(f"s.{key} = t.{key}" for key in keys)
+        cur.execute(
+            f"""DELETE FROM {table_name} t
+                USING (SELECT DISTINCT league_id, season FROM {staging_table}) p
+                WHERE t.league_id = p.league_id AND t.season = p.season
+                  AND NOT EXISTS (SELECT 1 FROM {staging_table} s WHERE {key_match})"""
+        )
+        return cur.rowcount
+
+    def _merge(self, cur, staging_table: str, table_name: str) -> int:
+        """Upsert set-based da staging na tabela final; linhas idênticas não são reescritas."""
+        _, columns, keys = LOAD_TABLES[table_name]
+        column_list = ', '.join(columns)
+        key_list = ', '.join(keys)
+        updatable = [column for column in columns if column not in keys]
+        cur.execute(
+            f"""INSERT INTO {table_name} ({column_list})
+                SELECT DISTINCT ON ({key_list}) {column_list}
+                FROM {staging_table}
+                WHERE {' AND '.join(f"{key} IS NOT NULL" for key in keys)}
+                ORDER BY {key_list}
+                ON CONFLICT ({key_list}) DO UPDATE SET
+                    {', '.join(f"{column} = EXCLUDED.{column}" for column in updatable)}
+                WHERE ({', '.join(f"{table_name}.{column}" for column in updatable)})
+                    IS DISTINCT FROM ({', '.join(f"EXCLUDED.{column}" for column in updatable)})"""
+        )
+        return cur.rowcount
+
+    def _changed_partitions(self, cur, table_name: str, csv_files: list[Path]) -> list[tuple[Path, str]]:
+        """Compara o hash de cada CSV com o load_manifest; retorna só os alterados."""
+        cur.execute("SELECT league_id, season, content_hash FROM load_manifest WHERE table_name = %s", (table_name,))
+        loaded = {(league_id, season): content_hash for league_id, season, content_hash in cur.fetchall()}
+        changed = []
+        for csv_path in csv_files:
+            content_hash = _file_hash(csv_path)
+            if loaded.get(self._partition_of(table_name, csv_path)) != content_hash:
+                changed.append((csv_path, content_hash))
+        return changed
+
+    def _load_table(self, cur, table_name: str, partitions: list[tuple[Path, str]], replace_partitions: bool) -> int:
+        """Carrega as partições informadas e registra seus hashes no load_manifest."""
+        if not partitions:
+            return 0
+        csv_columns = LOAD_TABLES[table_name][0]
+        staging_table = self._create_staging(cur, table_name)
+        manifest_rows = []
+        for csv_path, content_hash in partitions:
+            league_id, season = self._partition_of(table_name, csv_path)
+            copied = self._stage_partition(cur, csv_path, staging_table, csv_columns, league_id, season)
+            manifest_rows.append((table_name, league_id, season, csv_path.name, content_hash, copied))
+
+        if replace_partitions:
+            self._delete_missing(cur, staging_table, table_name)
+        rows = self._merge(cur, staging_table, table_name)
+
+        cur.executemany(
+            """INSERT INTO load_manifest (table_name, league_id, season, source_file, content_hash, row_count, loaded_at)
+               VALUES (%s, %s, %s, %s, %s, %s, NOW())
+               ON CONFLICT (table_name, league_id, season) DO UPDATE SET
+                   source_file = EXCLUDED.source_file,
+                   content_hash = EXCLUDED.content_hash,
+                   row_count = EXCLUDED.row_count,
+                   loaded_at = EXCLUDED.loaded_at""",
+            manifest_rows,
+        )
+        return rows
+
+    def _log_throughput(self, table_name: str, rows: int, elapsed: float) -> None:
+        rate = rows / elapsed if elapsed > 0 else float(rows)
+        logger.info(f"Carga {table_name}: {rows} linhas em {elapsed:.2f}s ({rate:.0f} linhas/s)")
+        METRICS.add_rows(f"postgres.{table_name}", rows)
+
+    def _load_single(self, csv_path: Path, table_name: str) -> None:
         conn = self._get_connection()
         try:
             with conn.cursor() as cur:
-                with open(csv_path, 'r', encoding='utf-8', newline='') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        fixture_id = self._parse_int(row.get('fixture_id'))
-                        if fixture_id is None:
-                            continue
-                        
-                        cur.execute(
-                            """INSERT INTO fixtures 
-                               (fixture_id, date, league_id, league_name, season,
-                                home_team_id, home_team_name, away_team_id, away_team_name,
-                                fulltime_home, fulltime_away)
-                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                               ON CONFLICT (fixture_id) DO NOTHING""",
-                            (
-                                fixture_id,
-                                self._parse_timestamp(row.get('date')),
-                                league_id,
-                                row.get('league_name', '').strip() or None,
-                                season,
-                                self._parse_int(row.get('home_team_id')),
-                                row.get('home_team_name', '').strip() or None,
-                                self._parse_int(row.get('away_team_id')),
-                                row.get('away_team_name', '').strip() or None,
-                                self._parse_int(row.get('fulltime_home')),
-                                self._parse_int(row.get('fulltime_away')),
-                            )
-                        )
+                started = time.perf_counter()
+                rows = self._load_table(cur, table_name, [(csv_path, _file_hash(csv_path))], replace_partitions=True)
                 conn.commit()
+                self._log_throughput(table_name, rows, time.perf_counter() - started)
         finally:
             conn.close()
+
+    def load_fixtures_csv(self, csv_path: Path) -> None:
+        """Carrega CSV de fixtures extraindo season e league_id do nome do arquivo."""
+        self._load_single(csv_path, "fixtures")
     
     def load_players_csv(self, csv_path: Path, table_name: str) -> None:
         """Carrega CSV de players extraindo league_id e season do nome do arquivo."""
-        import csv
-        
-        # Extrai league_id e season do nome: top_scorers_league_11_season_2023.csv
-        parts = csv_path.stem.split('_')
-        league_id = int(parts[3])  # 11
-        season = int(parts[5])  # 2023
-        
-        conn = self._get_connection()
-        try:
-            with conn.cursor() as cur:
-                with open(csv_path, 'r', encoding='utf-8', newline='') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        player_id = self._parse_int(row.get('player_id'))
-                        if player_id is None:
-                            continue
-                        
-                        cur.execute(
-                            f"""INSERT INTO {table_name}
-                               (category, player_id, player_name, team_id, team_name,
-                                league_id, season, appearences, minutes, goals, assists, shots_total)
-                               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                               ON CONFLICT (player_id, league_id, season) DO NOTHING""",
-                            (
-                                row.get('category', '').strip() or None,
-                                player_id,
-                                row.get('player_name', '').strip() or None,
-                                self._parse_int(row.get('team_id')),
-                                row.get('team_name', '').strip() or None,
-                                league_id,
-                                season,
-                                self._parse_int(row.get('appearences')),
-                                self._parse_int(row.get('minutes')),
-                                self._parse_int(row.get('goals')),
-                                self._parse_int(row.get('assists')),
-                                self._parse_int(row.get('shots_total')),
-                            )
-                        )
-                conn.commit()
-        finally:
-            conn.close()
+        self._load_single(csv_path, table_name)
 
-    def load_all_data(self, data_dir: Path) -> None:
-        """Carrega todos os CSVs nos respectivas tabelas PostgreSQL."""
-        self.truncate_tables()
-        
+    def _load_team_identity(self, cur, data_dir: Path) -> int:
+        """Substitui team_identity pelo índice atual (poucas centenas de linhas)."""
+        from .teams import TeamIdentityIndex
+
+        rows = TeamIdentityIndex(data_dir).rows()
+        cur.execute("DELETE FROM team_identity")
+        cur.executemany("INSERT INTO team_identity (name_key, team_id, team_name) VALUES (%s, %s, %s)", rows)
+        logger.info(f"Carga team_identity: {len(rows)} nomes")
+        return len(rows)
+
+    def load_all_data(self, data_dir: Path, incremental: bool = True) -> None:
+        """Carrega os CSVs nas respectivas tabelas em uma única conexão e transação.
+
+        No modo incremental só as partições cujo hash mudou desde a última carga são
+        recarregadas (upsert + remoção das linhas que saíram da partição). Com
+        incremental=False as tabelas são truncadas e tudo é recarregado; como o
+        TRUNCATE está na mesma transação, leitores nunca veem as tabelas vazias.
+        """
         seasons_dir = data_dir / "sport" / "seasons"
         players_dir = data_dir / "sport" / "players"
 
-        if seasons_dir.exists():
-            for csv_file in seasons_dir.glob("season_*_league_*_results.csv"):
-                self.load_fixtures_csv(csv_file)
+        csv_files = {
+            "fixtures": list_csv(seasons_dir, "season_*_league_*_results"),
+        }
+        for table_name in ("top_scorers", "top_assists", "squad_stats"):
+            csv_files[table_name] = list_csv(players_dir, f"{table_name}_*")
 
-        if players_dir.exists():
-            for csv_file in players_dir.glob("top_scorers_*.csv"):
-                self.load_players_csv(csv_file, "top_scorers")
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                if not incremental:
+                    cur.execute("TRUNCATE TABLE fixtures, top_scorers, top_assists, squad_stats, load_manifest CASCADE;")
 
-            for csv_file in players_dir.glob("top_assists_*.csv"):
-                self.load_players_csv(csv_file, "top_assists")
+                self._load_team_identity(cur, data_dir)
+
+                for table_name, files in csv_files.items():
+                    partitions = self._changed_partitions(cur, table_name, files)
+                    if not partitions:
+                        logger.info(f"Carga {table_name}: nenhuma partição alterada")
+                        continue
+                    started = time.perf_counter()
+                    rows = self._load_table(cur, table_name, partitions, replace_partitions=incremental)
+                    logger.info(f"Carga {table_name}: {len(partitions)}/{len(files)} partições recarregadas")
+                    self._log_throughput(table_name, rows, time.perf_counter() - started)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
 
 class GlueCrawlerRunner:
     def __init__(self):
+        import boto3
+
         self.glue_client = boto3.client('glue')
 
     def start_crawler(self, crawler_name: str) -> None:
@@ -271,3 +592,135 @@ class GlueCrawlerRunner:
             self.start_crawler(sport_crawler)
         # if financial_crawler:
         #     self.start_crawler(financial_crawler)
+
+
+class GluePartitionRegistrar:
+    """Registra no Glue Data Catalog as partições season=/league= recém-enviadas ao S3.
+
+    Substitui o crawler de sport/: as partições são criadas/atualizadas em lote a partir
+    das chaves S3 enviadas, ficando consultáveis no Athena assim que a chamada retorna.
+    Tabelas Parquet (sport/parquet/) usam partition projection e não precisam de registro.
+    """
+
+    BATCH_SIZE = 100  # Limite de batch_create_partition / batch_update_partition
+
+    def __init__(self, database_name: str | None = None):
+        self.database_name = database_name or os.getenv("GLUE_DATABASE_NAME")
+        if not self.database_name:
+            raise ValueError("GLUE_DATABASE_NAME não configurado")
+        import boto3
+
+        self.glue_client = boto3.client('glue')
+        self._tables: dict[str, dict] = {}
+
+    @staticmethod
+    def partition_from_key(s3_key: str) -> tuple[str, tuple[str, ...]] | None:
+        """sport/seasons/season=2024/league=71/x.csv -> ("seasons", ("2024", "71"))."""
+        parts = s3_key.split('/')
+        if len(parts) < 2 or parts[0] != 'sport' or parts[1] == 'parquet':
+            return None
+        partition_parts = [part for part in parts[:-1] if '=' in part]
+        if not partition_parts:
+            return None
+        table_name = parts[parts.index(partition_parts[0]) - 1]
+        return table_name, tuple(part.split('=', 1)[1] for part in partition_parts)
+
+    def _table(self, table_name: str) -> dict:
+        if table_name not in self._tables:
+            response = self.glue_client.get_table(DatabaseName=self.database_name, Name=table_name)
+            self._tables[table_name] = response['Table']
+        return self._tables[table_name]
+
+    def _partition_input(self, table_name: str, values: tuple[str, ...]) -> dict:
+        table = self._table(table_name)
+        descriptor = table['StorageDescriptor']
+        partition_path = '/'.join(
+            f"{key['Name']}={value}" for key, value in zip(table['PartitionKeys'], values)
+        )
+        return {
+            'Values': list(values),
+            'StorageDescriptor': {
+                'Columns': descriptor['Columns'],
+                'Location': f"{descriptor['Location'].rstrip('/')}/{partition_path}/",
+                'InputFormat': descriptor['InputFormat'],
+                'OutputFormat': descriptor['OutputFormat'],
+                'SerdeInfo': descriptor['SerdeInfo'],
+                'Parameters': descriptor.get('Parameters', {}),
+            },
+        }
+
+    def _register_table(self, table_name: str, partitions: list[tuple[str, ...]]) -> tuple[int, int]:
+        """Cria as partições em lotes; as que já existem são atualizadas. Retorna (criadas, atualizadas)."""
+        created = updated = 0
+        for start in range(0, len(partitions), self.BATCH_SIZE):
+            inputs = [self._partition_input(table_name, values) for values in partitions[start:start + self.BATCH_SIZE]]
+            response = self.glue_client.batch_create_partition(
+                DatabaseName=self.database_name,
+                TableName=table_name,
+                PartitionInputList=inputs,
+            )
+            existing = []
+            for error in response.get('Errors', []):
+                if error['ErrorDetail'].get('ErrorCode') != 'AlreadyExistsException':
+                    raise RuntimeError(
+                        f"Falha ao registrar partição {table_name}{error['PartitionValues']}: "
+                        f"{error['ErrorDetail'].get('ErrorMessage')}"
+                    )
+                existing.append(tuple(error['PartitionValues']))
+            created += len(inputs) - len(existing)
+
+            if existing:
+                by_values = {tuple(partition['Values']): partition for partition in inputs}
+                response = self.glue_client.batch_update_partition(
+                    DatabaseName=self.database_name,
+                    TableName=table_name,
+                    Entries=[
+                        {'PartitionValueList': list(values), 'PartitionInput': by_values[values]}
+                        for values in existing
+                    ],
+                )
+                if response.get('Errors'):
+                    raise RuntimeError(f"Falha ao atualizar partições de {table_name}: {response['Errors']}")
+                updated += len(existing)
+        return created, updated
+
+    def wait_until_queryable(self, partitions: dict[str, list[tuple[str, ...]]], timeout: float = 60.0) -> bool:
+        """Aguarda até todas as partições aparecerem no catálogo (ou até o timeout)."""
+        deadline = time.monotonic() + timeout
+        pending = {table_name: set(values) for table_name, values in partitions.items()}
+        while True:
+            for table_name in list(pending):
+                values = list(pending[table_name])
+                for start in range(0, len(values), 1000):
+                    response = self.glue_client.batch_get_partition(
+                        DatabaseName=self.database_name,
+                        TableName=table_name,
+                        PartitionsToGet=[{'Values': list(v)} for v in values[start:start + 1000]],
+                    )
+                    pending[table_name] -= {tuple(p['Values']) for p in response.get('Partitions', [])}
+                if not pending[table_name]:
+                    del pending[table_name]
+            if not pending:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(f"Partições ainda não visíveis no Glue após {timeout:.0f}s: {pending}")
+                return False
+            time.sleep(1)
+
+    def register_keys(self, s3_keys: list[str], wait: bool = False, timeout: float = 60.0) -> dict[str, list[tuple[str, ...]]]:
+        """Registra as partições correspondentes às chaves S3 enviadas."""
+        partitions: dict[str, set[tuple[str, ...]]] = {}
+        for s3_key in s3_keys:
+            partition = self.partition_from_key(s3_key)
+            if partition:
+                table_name, values = partition
+                partitions.setdefault(table_name, set()).add(values)
+
+        registered = {table_name: sorted(values) for table_name, values in partitions.items()}
+        for table_name, values in registered.items():
+            created, updated = self._register_table(table_name, values)
+            logger.info(f"Glue {table_name}: {created} partições criadas, {updated} atualizadas")
+
+        if wait and registered:
+            self.wait_until_queryable(registered, timeout)
+        return registered
@@ -0,0 +1,204 @@
+"""Índice de identidade dos times: team_id da API-Football <-> nomes de clube dos dados financeiros.
+
+Os financeiros identificam o clube por texto livre (`team` em transfers, `time` em balances),
+com acentos e grafias diferentes das da API. O índice normaliza os nomes (sem acento,
+minúsculas, só letras e dígitos), aplica os apelidos de config/team_aliases.json e guarda
+o resultado em `data/.state/team_identity.json`. Só é reconstruído quando os CSVs ou os
+apelidos mudam; a partir dele os loaders gravam o team_id inteiro nas tabelas financeiras,
+e as junções esporte x finanças viram equi-joins por inteiro.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .utils import CONFIG_DIR, DATA_DIR, list_csv, open_csv, setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_TEAM_ALIASES = os.path.join(CONFIG_DIR, 'team_aliases.json')
+# Muda quando a normalização muda, forçando a reconstrução
+INDEX_VERSION = "1"
+
+
+def normalize_club_name(names: pd.Series) -> pd.Series:
+    """Chave de junção por nome: sem acentos, minúsculas, só letras e dígitos."""
+    ascii_names = names.fillna("").astype(str).str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    return ascii_names.str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
+
+
+def _normalize_one(name: str) -> str:
+    return normalize_club_name(pd.Series([name])).iloc[0]
+
+
+class TeamIdentityIndex:
+    """Mapa nome normalizado -> team_id, resolvido uma vez e persistido.
+
+    Nomes da API (fixtures e players) definem os times; os apelidos ligam grafias
+    dos financeiros ("Atlético Mineiro") ao nome da API ("Atletico-MG") ou direto a um
+    team_id. Nomes financeiros sem correspondência ficam em `unresolved`.
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        index_path: str | Path | None = None,
+        aliases_path: str | Path | None = None,
+    ):
+        self.data_dir = Path(data_dir or DATA_DIR)
+        self.index_path = Path(index_path or self.data_dir / ".state" / "team_identity.json")
+        self.aliases_path = Path(aliases_path or os.getenv("TEAM_ALIASES_PATH") or DEFAULT_TEAM_ALIASES)
+        self.teams: Dict[int, str] = {}
+        self.keys: Dict[str, int] = {}
+        self.unresolved: List[str] = []
+        self._loaded = False
+
+    def _fixture_files(self) -> List[Path]:
+        return list_csv(self.data_dir / "sport" / "seasons", "season_*_league_*_results")
+
+    def _player_files(self) -> List[Path]:
+        return list_csv(self.data_dir / "sport" / "players", "*_league_*_season_*")
+
+    def _financial_files(self) -> Dict[str, List[Path]]:
+        financial_dir = self.data_dir / "financial"
+        return {dataset: sorted((financial_dir / dataset).glob("*.csv")) for dataset in ("transfers", "balances")}
+
+    def _signature(self) -> str:
+        """Assinatura barata das entradas (nome, tamanho e mtime de cada arquivo)."""
+        files = self._fixture_files() + self._player_files() + [path for paths in self._financial_files().values() for path in paths]
+        if self.aliases_path.exists():
+            files.append(self.aliases_path)
+        digest = hashlib.sha256(INDEX_VERSION.encode("ascii"))
+        for path in files:
+            stat = path.stat()
+            digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _api_teams(self) -> pd.DataFrame:
+        frames = []
+        for csv_file in self._fixture_files():
+            with open_csv(csv_file) as f:
+                fixtures = pd.read_csv(f, usecols=["home_team_id", "home_team_name", "away_team_id", "away_team_name"])
+            for side in ("home", "away"):
+                frames.append(fixtures[[f"{side}_team_id", f"{side}_team_name"]].set_axis(["team_id", "team_name"], axis=1))
+        for csv_file in self._player_files():
+            with open_csv(csv_file) as f:
+                frames.append(pd.read_csv(f, usecols=["team_id", "team_name"]))
+        if not frames:
+            return pd.DataFrame({"team_id": pd.Series(dtype="int64"), "team_name": pd.Series(dtype="object")})
+        teams = pd.concat(frames, ignore_index=True).dropna()
+        teams["team_id"] = teams["team_id"].astype("int64")
+        return teams.drop_duplicates(ignore_index=True)
+
+    def _financial_names(self) -> pd.Series:
+        # Só a coluna que identifica o clube dono da linha (from/to incluem clubes de fora)
+        columns = {"transfers": "team", "balances": "time"}
+        names = []
+        for dataset, paths in self._financial_files().items():
+            for csv_file in paths:
+                frame = pd.read_csv(csv_file, dtype=str, keep_default_na=False, encoding='utf-8')
+                if columns[dataset] in frame:
+                    names.append(frame[columns[dataset]])
+        if not names:
+            return pd.Series(dtype="object")
+        names = pd.concat(names, ignore_index=True)
+        return names[names.str.strip() != ""].drop_duplicates()
+
+    def _aliases(self) -> Dict[str, int | str]:
+        if not self.aliases_path.exists():
+            return {}
+        with open(self.aliases_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def build(self) -> "TeamIdentityIndex":
+        """Reconstrói o índice a partir dos CSVs locais e dos apelidos."""
+        teams = self._api_teams()
+        teams["key"] = normalize_club_name(teams["team_name"])
+        # O mesmo nome normalizado para dois team_id (ex.: homônimos em ligas diferentes)
+        # fica com o menor id; o outro só é alcançável por apelido explícito
+        conflicts = teams.groupby("key")["team_id"].nunique()
+        for key in conflicts[conflicts > 1].index:
+            logger.warning(f"Nome de time ambíguo '{key}': {sorted(teams.loc[teams['key'] == key, 'team_id'].unique())}")
+        by_key = teams.sort_values("team_id").drop_duplicates("key")
+        keys = dict(zip(by_key["key"], by_key["team_id"].astype(int)))
+        names = teams.drop_duplicates("team_id", keep="last")
+        self.teams = dict(zip(names["team_id"].astype(int), names["team_name"]))
+
+        for alias, target in self._aliases().items():
+            team_id = target if isinstance(target, int) else keys.get(_normalize_one(str(target)))
+            if team_id is None:
+                # Normal quando o time do apelido não está nas ligas/temporadas extraídas
+                logger.debug(f"Apelido '{alias}' aponta para time desconhecido: {target}")
+                continue
+            keys[_normalize_one(alias)] = int(team_id)
+        self.keys = keys
+
+        financial = self._financial_names()
+        unresolved = financial[~normalize_club_name(financial).isin(keys)]
+        self.unresolved = sorted(unresolved.tolist())
+        if self.unresolved:
+            logger.warning(
+                f"Times financeiros sem team_id: {len(self.unresolved)} "
+                f"(ex.: {', '.join(self.unresolved[:5])}); adicione apelidos em {self.aliases_path.name}"
+            )
+        logger.info(f"Índice de times: {len(self.teams)} times, {len(self.keys)} nomes")
+        self._loaded = True
+        return self
+
+    @property
+    def content_hash(self) -> str:
+        """Hash do mapeamento nome -> team_id; muda só quando a resolução muda."""
+        self.load()
+        return hashlib.sha256(json.dumps(sorted(self.keys.items())).encode("utf-8")).hexdigest()
+
+    def _save(self, signature: str) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "signature": signature,
+            "teams": {str(team_id): name for team_id, name in sorted(self.teams.items())},
+            "keys": dict(sorted(self.keys.items())),
+            "unresolved": self.unresolved,
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def load(self) -> "TeamIdentityIndex":
+        """Usa o índice persistido se as entradas não mudaram; senão reconstrói e salva."""
+        if self._loaded:
+            return self
+        signature = self._signature()
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                payload = {}
+            if payload.get("signature") == signature:
+                self.teams = {int(team_id): name for team_id, name in payload["teams"].items()}
+                self.keys = {key: int(team_id) for key, team_id in payload["keys"].items()}
+                self.unresolved = payload.get("unresolved", [])
+                self._loaded = True
+                return self
+        self.build()
+        self._save(signature)
+        return self
+
+    def resolve(self, names: pd.Series) -> pd.Series:
+        """team_id (Int32, nulo quando não resolvido) para cada nome, vetorizado."""
+        self.load()
+        return normalize_club_name(names).map(self.keys).astype("Int32")
+
+    def team_id(self, name: str) -> Optional[int]:
+        self.load()
+        return self.keys.get(_normalize_one(name))
+
+    def rows(self) -> List[tuple[str, int, str]]:
+        """Linhas (name_key, team_id, team_name) para a tabela team_identity."""
+        self.load()
+        return [(key, team_id, self.teams.get(team_id)) for key, team_id in sorted(self.keys.items())]
@@ -1,25 +1,78 @@
 import csv
+import filecmp
+import gzip
+import io
 import logging
 import os
 import json
-from typing import Any, Dict, Optional, List
+import shutil
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Optional, List, Set
 
 import coloredlogs
 
-from .api_football_models import FixtureResult, PlayerSummary
+if TYPE_CHECKING:
+	# Só anotações: quem não lida com modelos (métricas, relatório) não importa o pydantic
+	from .api_football_models import FixtureResult, PlayerSummary
 
 BASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
-DATA_DIR = os.path.join(BASE_DIR, 'data')
+# PIPELINE_DATA_DIR permite isolar a saída (ex.: benchmarks) sem tocar em data/
+DATA_DIR = os.getenv('PIPELINE_DATA_DIR') or os.path.join(BASE_DIR, 'data')
 CONFIG_DIR = os.path.join(BASE_DIR, 'config')
 DEFAULT_TARGETS_CONFIG = os.path.join(CONFIG_DIR, 'config.json')
 
+PLAYER_FIELDNAMES = [
+	'category', 'player_id', 'player_name', 'team_id', 'team_name',
+	'appearences', 'minutes', 'goals', 'assists', 'shots_total',
+]
+FIXTURE_FIELDNAMES = [
+	'fixture_id', 'date', 'league_name',
+	'home_team_id', 'home_team_name', 'away_team_id', 'away_team_name',
+	'fulltime_home', 'fulltime_away', 'status',
+]
+# Detalhes por partida (fixtures?ids=): um CSV por tipo por temporada-liga
+FIXTURE_DETAIL_FIELDNAMES = {
+	'statistics': [
+		'fixture_id', 'team_id', 'team_name',
+		'shots_on_goal', 'shots_off_goal', 'total_shots', 'blocked_shots',
+		'shots_insidebox', 'shots_outsidebox', 'fouls', 'corner_kicks', 'offsides',
+		'ball_possession', 'yellow_cards', 'red_cards', 'goalkeeper_saves',
+		'total_passes', 'passes_accurate', 'passes_pct', 'expected_goals',
+	],
+	'events': [
+		'fixture_id', 'elapsed', 'extra', 'team_id', 'team_name',
+		'player_id', 'player_name', 'assist_id', 'assist_name', 'type', 'detail', 'comments',
+	],
+	'lineups': [
+		'fixture_id', 'team_id', 'team_name', 'formation', 'coach_id', 'coach_name',
+		'player_id', 'player_name', 'number', 'position', 'grid', 'starter',
+	],
+}
+
+# Compressão dos CSVs gerados -> sufixo acrescentado ao .csv (Athena descomprime pela extensão)
+CSV_COMPRESSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+CSV_EXTENSIONS = tuple(f'.csv{suffix}' for suffix in CSV_COMPRESSIONS.values())
+# Nível 6: quase o tamanho do 9 em uma fração do tempo
+GZIP_LEVEL = 6
+
+
+# Loggers raiz (ex.: 'libs') que já receberam o handler do coloredlogs
+_COLORED_LOGGERS: Set[str] = set()
+
 
 def setup_logger(name: str) -> logging.Logger:
-	"""Configura e retorna um logger com coloredlogs."""
-	logger = logging.getLogger(name)
+	"""Retorna o logger `name`; o coloredlogs é instalado uma vez só, no logger raiz do pacote.
+
+	Os loggers dos módulos (libs.storage, libs.pipeline...) herdam nível e handler do
+	logger 'libs', então importar mais um módulo não reinstala nada.
+	"""
+	root_name = name.split('.')[0]
+	if root_name in _COLORED_LOGGERS:
+		return logging.getLogger(name)
+	_COLORED_LOGGERS.add(root_name)
 	coloredlogs.install(
 		level='INFO',
-		logger=logger,
+		logger=logging.getLogger(root_name),
 		fmt='%(asctime)s [%(levelname)s] %(message)s',
 		level_styles={
 			'debug': {'color': 'cyan'},
@@ -29,13 +82,19 @@ def setup_logger(name: str) -> logging.Logger:
 			'critical': {'color': 'red', 'bold': True, 'background': 'white'},
 		}
 	)
-	return logger
+	return logging.getLogger(name)
 
 logger = setup_logger(__name__)
 
 
 class ConfigLoader:
-	"""Gerencia carregamento de configurações de seasons e leagues."""
+	"""Gerencia carregamento de configurações de seasons e leagues.
+
+	O JSON é lido uma vez por processo e reaproveitado enquanto o mtime do arquivo
+	não mudar; serviços e escritores podem consultar os targets a cada unidade.
+	"""
+
+	_cache: Dict[str, tuple[int, Dict[str, Any]]] = {}
 	
 	@staticmethod
 	def _get_config_path(path: Optional[str] = None) -> str:
@@ -47,13 +106,24 @@ class ConfigLoader:
 	@staticmethod
 	def _load_config(path: Optional[str] = None) -> Dict[str, Any]:
 		config_path = ConfigLoader._get_config_path(path)
-		if not os.path.exists(config_path):
+		try:
+			mtime = os.stat(config_path).st_mtime_ns
+		except OSError:
 			return {}
+		cached = ConfigLoader._cache.get(config_path)
+		if cached is not None and cached[0] == mtime:
+			return cached[1]
 		try:
 			with open(config_path, 'r', encoding='utf-8') as f:
-				return json.load(f)
+				data = json.load(f)
 		except (json.JSONDecodeError, TypeError, ValueError):
-			return {}
+			data = {}
+		ConfigLoader._cache[config_path] = (mtime, data)
+		return data
+
+	@staticmethod
+	def clear_cache() -> None:
+		ConfigLoader._cache.clear()
 
 	@staticmethod
 	def load_seasons(path: Optional[str] = None) -> List[int]:
@@ -80,8 +150,356 @@ class ConfigLoader:
 		return loaded
 
 
+def fixture_to_row(result: "FixtureResult") -> Dict[str, Any]:
+	"""Converte um FixtureResult na linha do CSV de partição."""
+	return {
+		'fixture_id': result.fixture_id,
+		'date': result.date,
+		'league_name': result.league_name,
+		'home_team_id': result.home_team.id,
+		'home_team_name': result.home_team.name,
+		'away_team_id': result.away_team.id,
+		'away_team_name': result.away_team.name,
+		'fulltime_home': result.fulltime_home,
+		'fulltime_away': result.fulltime_away,
+		'status': result.status,
+	}
+
+
+def csv_compression(value: Optional[str] = None) -> str:
+	"""Modo de compressão dos CSVs: o informado, PIPELINE_CSV_COMPRESSION ou 'none'."""
+	mode = (value or os.getenv('PIPELINE_CSV_COMPRESSION') or 'none').lower()
+	if mode not in CSV_COMPRESSIONS:
+		raise ValueError(f"Compressão CSV não suportada: {mode} (use {', '.join(CSV_COMPRESSIONS)})")
+	return mode
+
+
+def compression_of(path: Any) -> str:
+	"""Compressão indicada pela extensão do arquivo (x.csv.gz -> gzip)."""
+	name = os.fspath(path)
+	for mode, suffix in CSV_COMPRESSIONS.items():
+		if suffix and name.endswith(suffix):
+			return mode
+	return 'none'
+
+
+def csv_stem(path: Any) -> str:
+	"""Nome do CSV sem .csv e sem o sufixo de compressão (season_2024_league_71_results)."""
+	name = os.path.basename(os.fspath(path))
+	suffix = CSV_COMPRESSIONS[compression_of(name)]
+	if suffix:
+		name = name[:-len(suffix)]
+	return name[:-len('.csv')] if name.endswith('.csv') else name
+
+
+def compress_bytes(data: bytes, compression: str) -> bytes:
+	"""Comprime um conteúdo inteiro (ex.: no upload); gzip sem mtime, então o resultado é reprodutível."""
+	if compression == 'gzip':
+		return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+	if compression == 'zstd':
+		import pyarrow as pa
+		return pa.Codec('zstd').compress(data, asbytes=True)
+	return data
+
+
+class _GzipWriter(gzip.GzipFile):
+	"""GzipFile sem nome nem mtime no cabeçalho: o mesmo CSV sempre gera os mesmos bytes (e checksums)."""
+
+	def __init__(self, path: str):
+		self._raw = open(path, 'wb')
+		super().__init__(filename='', mode='wb', fileobj=self._raw, compresslevel=GZIP_LEVEL, mtime=0)
+
+	def close(self) -> None:
+		try:
+			super().close()
+		finally:
+			self._raw.close()
+
+
+def open_csv(path: Any, mode: str = 'r', compression: Optional[str] = None) -> IO[str]:
+	"""Abre um CSV em modo texto ('r' ou 'w'), comprimido conforme a extensão (.csv, .csv.gz, .csv.zst)."""
+	compression = compression or compression_of(path)
+	path = os.fspath(path)
+	if compression == 'none':
+		return open(path, mode, newline='', encoding='utf-8')
+	if compression == 'gzip':
+		binary = _GzipWriter(path) if mode == 'w' else gzip.open(path, 'rb')
+	else:
+		# zstd pelo codec do pyarrow (já dependência do projeto)
+		import pyarrow as pa
+		if mode == 'w':
+			binary = pa.CompressedOutputStream(pa.OSFile(path, 'wb'), 'zstd')
+		else:
+			binary = pa.CompressedInputStream(pa.OSFile(path, 'rb'), 'zstd')
+	return io.TextIOWrapper(binary, encoding='utf-8', newline='')
+
+
+def list_csv(directory: Any, pattern: str) -> List[Path]:
+	"""CSVs do diretório cujo nome sem extensão casa com `pattern`, em qualquer compressão.
+
+	Se o mesmo CSV existir em mais de uma compressão (troca de modo), vale o mais recente.
+	"""
+	directory = Path(directory)
+	found: Dict[Path, Path] = {}
+	for extension in CSV_EXTENSIONS:
+		for path in directory.glob(f'{pattern}{extension}'):
+			key = path.parent / csv_stem(path)
+			current = found.get(key)
+			if current is None or path.stat().st_mtime_ns > current.stat().st_mtime_ns:
+				found[key] = path
+	return sorted(found.values())
+
+
+def resolve_csv(directory: Any, stem: str, compression: Optional[str] = None) -> str:
+	"""Caminho do CSV `stem` já gravado (em qualquer compressão) ou, se não existir, o do modo atual."""
+	existing = [
+		path for path in (os.path.join(directory, f'{stem}{extension}') for extension in CSV_EXTENSIONS)
+		if os.path.exists(path)
+	]
+	if existing:
+		return max(existing, key=lambda path: os.stat(path).st_mtime_ns)
+	return os.path.join(directory, f'{stem}.csv{CSV_COMPRESSIONS[csv_compression(compression)]}')
+
+
+class AtomicFile:
+	"""Arquivo gravado em `<destino>.<pid>.tmp` e publicado por rename só em commit().
+
+	Uma execução interrompida no meio da escrita deixa no máximo o .tmp para trás,
+	nunca um CSV parcial que seria tomado por cache válido na execução seguinte.
+	A compressão segue a extensão do destino; ao publicar um CSV, as versões dele
+	em outra compressão são removidas. Conteúdo idêntico ao já publicado não é
+	substituído, então o mtime (comparado pela conversão Parquet) não muda à toa.
+	"""
+
+	def __init__(self, file_path: str):
+		self.file_path = file_path
+		self.tmp_path = f"{file_path}.{os.getpid()}.tmp"
+		self.compression = compression_of(file_path)
+		self.file: IO[str] = open_csv(self.tmp_path, 'w', self.compression)
+
+	def _remove_variants(self) -> None:
+		base = self.file_path[:-len(CSV_COMPRESSIONS[self.compression])] if self.compression != 'none' else self.file_path
+		if not base.endswith('.csv'):
+			return
+		for extension in CSV_EXTENSIONS:
+			variant = base[:-len('.csv')] + extension
+			if variant != self.file_path and os.path.exists(variant):
+				os.remove(variant)
+
+	def _unchanged(self) -> bool:
+		try:
+			if os.path.getsize(self.tmp_path) != os.path.getsize(self.file_path):
+				return False
+		except OSError:
+			return False
+		return filecmp.cmp(self.tmp_path, self.file_path, shallow=False)
+
+	def commit(self) -> None:
+		if self.file.closed:
+			return
+		self.file.flush()
+		if self.compression == 'none':
+			os.fsync(self.file.fileno())
+			self.file.close()
+		else:
+			# O rodapé do stream comprimido só é escrito no close
+			self.file.close()
+			with open(self.tmp_path, 'rb') as f:
+				os.fsync(f.fileno())
+		if self._unchanged():
+			os.remove(self.tmp_path)
+		else:
+			os.replace(self.tmp_path, self.file_path)
+		self._remove_variants()
+
+	def abort(self) -> None:
+		if self.file.closed:
+			return
+		self.file.close()
+		try:
+			os.remove(self.tmp_path)
+		except FileNotFoundError:
+			pass
+
+
+def write_json_gz(path: Any, payload: Any) -> None:
+	"""Grava `payload` como JSON gzip em `<path>.<pid>.tmp` e publica por rename."""
+	tmp_path = f"{path}.{os.getpid()}.tmp"
+	# json.dumps usa o encoder em C; json.dump em stream gzip escreveria token a token
+	data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+	with gzip.open(tmp_path, "wb") as f:
+		f.write(data)
+	os.replace(tmp_path, path)
+
+
+def remove_orphan_tmp(directory: str) -> int:
+	"""Remove .tmp deixados por processos que morreram no meio de uma escrita atômica."""
+	removed = 0
+	if not os.path.isdir(directory):
+		return removed
+	for name in os.listdir(directory):
+		if not name.endswith('.tmp'):
+			continue
+		try:
+			pid = int(name.rsplit('.', 2)[-2])
+		except (IndexError, ValueError):
+			continue
+		if pid == os.getpid():
+			continue
+		try:
+			os.kill(pid, 0)
+			continue  # processo ainda vivo: escrita em andamento
+		except ProcessLookupError:
+			pass
+		except OSError:
+			continue
+		os.remove(os.path.join(directory, name))
+		removed += 1
+	return removed
+
+
+class PlayersCSVStream:
+	"""Grava jogadores em um CSV linha a linha, à medida que são recebidos.
+
+	O arquivo final só aparece no close() sem erro; com exceção o parcial é descartado.
+	"""
+
+	def __init__(self, file_path: str):
+		self.file_path = file_path
+		self.rows_written = 0
+		self._atomic = AtomicFile(file_path)
+		self._file: IO[str] = self._atomic.file
+		self._writer = csv.DictWriter(self._file, fieldnames=PLAYER_FIELDNAMES)
+		self._writer.writeheader()
+
+	def __enter__(self) -> "PlayersCSVStream":
+		return self
+
+	def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+		if exc_type is not None:
+			self.abort()
+		else:
+			self.close()
+
+	def write(self, player: "PlayerSummary") -> None:
+		player_dict = CSVWriter._model_to_dict(player)
+		player_dict.pop('league_id', None)
+		player_dict.pop('season', None)
+		self._writer.writerow(player_dict)
+		self.rows_written += 1
+
+	def write_batch(self, batch: Any) -> None:
+		"""Grava um PlayerBatch inteiro (colunas → tuplas), sem montar dicts por linha."""
+		self._writer.writer.writerows(batch.rows(PLAYER_FIELDNAMES))
+		self.rows_written += len(batch)
+
+	def close(self) -> None:
+		self._atomic.commit()
+
+	def abort(self) -> None:
+		self._atomic.abort()
+
+
+class FixturePartitionStream:
+	"""Grava fixtures em streaming, com um arquivo aberto por partição (season, league).
+
+	Cada partição é truncada na primeira linha recebida nesta execução, então o
+	resultado é o mesmo de agrupar tudo em memória, mas com memória constante.
+	As partições são gravadas em .tmp e só substituem as anteriores no close().
+	"""
+
+	def __init__(self, data_dir: str, compression: Optional[str] = None):
+		self.data_dir = data_dir
+		self.suffix = CSV_COMPRESSIONS[csv_compression(compression)]
+		self.rows_written = 0
+		self.target_seasons = set(ConfigLoader.load_seasons())
+		self.target_leagues = set(ConfigLoader.load_leagues())
+		self._files: Dict[tuple[int, int], AtomicFile] = {}
+		self._writers: Dict[tuple[int, int], csv.DictWriter] = {}
+
+	def __enter__(self) -> "FixturePartitionStream":
+		return self
+
+	def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+		if exc_type is not None:
+			self.abort()
+		else:
+			self.close()
+
+	def _partition_key(self, result: "FixtureResult") -> Optional[tuple[int, int]]:
+		return self._key(result.season, result.league_id)
+
+	def _key(self, season: Any, league_id: Any) -> Optional[tuple[int, int]]:
+		if season is None or league_id is None:
+			return None
+		try:
+			season_key = int(season)
+			league_key = int(league_id)
+		except (TypeError, ValueError):
+			return None
+		if self.target_seasons and season_key not in self.target_seasons:
+			return None
+		if self.target_leagues and league_key not in self.target_leagues:
+			return None
+		return season_key, league_key
+
+	def _open_partition(self, key: tuple[int, int]) -> csv.DictWriter:
+		season, league = key
+		file_path = os.path.join(self.data_dir, f'season_{season}_league_{league}_results.csv{self.suffix}')
+		atomic = AtomicFile(file_path)
+		writer = csv.DictWriter(atomic.file, fieldnames=FIXTURE_FIELDNAMES)
+		writer.writeheader()
+		self._files[key] = atomic
+		self._writers[key] = writer
+		return writer
+
+	def write(self, result: "FixtureResult") -> None:
+		key = self._partition_key(result)
+		if key is None:
+			return
+		writer = self._writers.get(key) or self._open_partition(key)
+		writer.writerow(fixture_to_row(result))
+		self.rows_written += 1
+
+	def write_batch(self, batch: Any) -> None:
+		"""Grava um FixtureBatch inteiro, roteando cada linha (tupla) para sua partição."""
+		columns = batch.columns
+		keys = zip(columns['season'], columns['league_id'])
+		for (season, league_id), row in zip(keys, batch.rows(FIXTURE_FIELDNAMES)):
+			key = self._key(season, league_id)
+			if key is None:
+				continue
+			writer = self._writers.get(key) or self._open_partition(key)
+			writer.writer.writerow(row)
+			self.rows_written += 1
+
+	def close(self) -> None:
+		for atomic in self._files.values():
+			atomic.commit()
+		self._files.clear()
+		self._writers.clear()
+
+	def abort(self) -> None:
+		"""Descarta as partições desta execução; as versões anteriores ficam intactas."""
+		for atomic in self._files.values():
+			atomic.abort()
+		self._files.clear()
+		self._writers.clear()
+
+
 class CSVWriter:
 	"""Escreve CSVs de dados extraídos."""
+
+	# Compressão dos CSVs gravados (none, gzip, zstd); None = PIPELINE_CSV_COMPRESSION
+	compression: Optional[str] = None
+
+	@staticmethod
+	def set_compression(compression: Optional[str]) -> None:
+		CSVWriter.compression = csv_compression(compression)
+
+	@staticmethod
+	def suffix() -> str:
+		return CSV_COMPRESSIONS[csv_compression(CSVWriter.compression)]
 	
 	@staticmethod
 	def _ensure_directory(path: str) -> None:
@@ -100,76 +518,144 @@ class CSVWriter:
 		"""Salva dados em formato JSON."""
 		data_dir = os.path.join(DATA_DIR, subfolder)
 		CSVWriter._ensure_directory(data_dir)
-		file_path = os.path.join(data_dir, filename)
-		with open(file_path, 'w', encoding='utf-8') as f:
-			json.dump(data, f, ensure_ascii=False, indent=2)
+		atomic = AtomicFile(os.path.join(data_dir, filename))
+		try:
+			json.dump(data, atomic.file, ensure_ascii=False, indent=2)
+		except BaseException:
+			atomic.abort()
+			raise
+		atomic.commit()
 
 	@staticmethod
-	def write_players(filename: str, players: List[PlayerSummary]) -> None:
+	def open_players(filename: str) -> PlayersCSVStream:
+		"""Abre um CSV de jogadores para escrita em streaming."""
 		data_dir = os.path.join(DATA_DIR, 'sport/players')
 		CSVWriter._ensure_directory(data_dir)
-		file_path = os.path.join(data_dir, filename)
+		if filename.endswith('.csv'):
+			filename += CSVWriter.suffix()
+		return PlayersCSVStream(os.path.join(data_dir, filename))
 
-		fieldnames = [
-			'category', 'player_id', 'player_name', 'team_id', 'team_name',
-			'appearences', 'minutes', 'goals', 'assists', 'shots_total',
-		]
+	@staticmethod
+	def open_fixtures() -> FixturePartitionStream:
+		"""Abre o escritor particionado de fixtures para escrita em streaming."""
+		data_dir = os.path.join(DATA_DIR, 'sport/seasons')
+		CSVWriter._ensure_directory(data_dir)
+		return FixturePartitionStream(data_dir, CSVWriter.compression)
 
-		with open(file_path, 'w', newline='', encoding='utf-8') as f:
-			writer = csv.DictWriter(f, fieldnames=fieldnames)
+	@staticmethod
+	def fixture_partition_path(season: int, league: int) -> str:
+		"""Partição já gravada (em qualquer compressão) ou o caminho onde ela será gravada."""
+		return resolve_csv(os.path.join(DATA_DIR, 'sport/seasons'), f'season_{season}_league_{league}_results', CSVWriter.compression)
+
+	@staticmethod
+	def read_fixture_partition(season: int, league: int) -> Dict[int, Dict[str, Any]]:
+		"""Lê uma partição de fixtures indexada por fixture_id (vazia se não existir)."""
+		file_path = CSVWriter.fixture_partition_path(season, league)
+		rows: Dict[int, Dict[str, Any]] = {}
+		if not os.path.exists(file_path):
+			return rows
+		with open_csv(file_path) as f:
+			for row in csv.DictReader(f):
+				try:
+					rows[int(row['fixture_id'])] = row
+				except (KeyError, TypeError, ValueError):
+					continue
+		return rows
+
+	@staticmethod
+	def write_fixture_partition(season: int, league: int, rows: List[Dict[str, Any]]) -> None:
+		"""Reescreve uma partição de fixtures a partir de linhas já prontas."""
+		CSVWriter._ensure_directory(os.path.join(DATA_DIR, 'sport/seasons'))
+		# Sempre no modo atual: a versão em outra compressão é removida no commit
+		atomic = AtomicFile(os.path.join(DATA_DIR, 'sport/seasons', f'season_{season}_league_{league}_results.csv{CSVWriter.suffix()}'))
+		try:
+			# Partições antigas não têm a coluna status: ficam com o valor vazio
+			writer = csv.DictWriter(atomic.file, fieldnames=FIXTURE_FIELDNAMES, restval='', extrasaction='ignore')
 			writer.writeheader()
-			for player in players:
-				player_dict = CSVWriter._model_to_dict(player)
-				player_dict.pop('league_id', None)
-				player_dict.pop('season', None)
-				writer.writerow(player_dict)
+			writer.writerows(rows)
+		except BaseException:
+			atomic.abort()
+			raise
+		atomic.commit()
 
 	@staticmethod
-	def write_fixtures(results: List[FixtureResult]) -> None:
-		data_dir = os.path.join(DATA_DIR, 'sport/seasons')
-		CSVWriter._ensure_directory(data_dir)
+	def fixture_details_path(kind: str, season: int, league: int) -> str:
+		"""Partição de detalhes já gravada (em qualquer compressão) ou o caminho onde ela será gravada."""
+		return resolve_csv(os.path.join(DATA_DIR, 'sport/fixture_details', kind), f'season_{season}_league_{league}', CSVWriter.compression)
 
-		target_seasons = set(ConfigLoader.load_seasons())
-		target_leagues = set(ConfigLoader.load_leagues())
-		fieldnames = [
-			'fixture_id', 'date', 'league_name',
-			'home_team_id', 'home_team_name', 'away_team_id', 'away_team_name',
-			'fulltime_home', 'fulltime_away',
-		]
-
-		# Agrupa por (season, league)
-		grouped: Dict[tuple[int, int], List[FixtureResult]] = {}
-		for result in results:
-			if result.season is None or result.league_id is None:
-				continue
-			
-			try:
-				season_key = int(result.season)
-				league_key = int(result.league_id)
-			except (TypeError, ValueError):
-				continue
-			
-			if target_seasons and season_key not in target_seasons:
-				continue
-			if target_leagues and league_key not in target_leagues:
+	@staticmethod
+	def _legacy_fixture_details_dir(kind: str, season: int, league: int) -> str:
+		# Layout anterior, um CSV por partida; incorporado à partição na próxima gravação
+		return os.path.join(DATA_DIR, 'sport/fixture_details', kind, f'season_{season}_league_{league}')
+
+	@staticmethod
+	def read_fixture_details(kind: str, season: int, league: int) -> List[Dict[str, Any]]:
+		"""Linhas de uma partição de detalhes (mais as partidas ainda no layout anterior)."""
+		rows: List[Dict[str, Any]] = []
+		file_path = CSVWriter.fixture_details_path(kind, season, league)
+		if os.path.exists(file_path):
+			with open_csv(file_path) as f:
+				rows.extend(csv.DictReader(f))
+		known = {row.get('fixture_id') for row in rows}
+		for legacy_file in list_csv(CSVWriter._legacy_fixture_details_dir(kind, season, league), 'fixture_*'):
+			if csv_stem(legacy_file)[len('fixture_'):] in known:
 				continue
-			
-			grouped.setdefault((season_key, league_key), []).append(result)
+			with open_csv(legacy_file) as f:
+				rows.extend(csv.DictReader(f))
+		return rows
+
+	@staticmethod
+	def fetched_fixture_details(season: int, league: int) -> Set[int]:
+		"""Fixtures com detalhes já gravados (ids presentes em alguma das partições de detalhes).
+
+		Partidas para as quais a API não devolveu nenhum detalhe não aparecem e voltam a ser pedidas.
+		"""
+		fetched: Set[int] = set()
+		for kind in FIXTURE_DETAIL_FIELDNAMES:
+			for row in CSVWriter.read_fixture_details(kind, season, league):
+				try:
+					fetched.add(int(row['fixture_id']))
+				except (KeyError, TypeError, ValueError):
+					continue
+		return fetched
+
+	@staticmethod
+	def write_fixture_details(season: int, league: int, fixture_ids: Iterable[int], details: Dict[str, List[Dict[str, Any]]]) -> None:
+		"""Acrescenta às partições de detalhes da temporada-liga as linhas das partidas `fixture_ids`.
 
-		for (season, league), season_results in grouped.items():
-			file_path = os.path.join(data_dir, f'season_{season}_league_{league}_results.csv')
-			with open(file_path, 'w', newline='', encoding='utf-8') as f:
-				writer = csv.DictWriter(f, fieldnames=fieldnames)
+		Linhas já gravadas dessas partidas são substituídas. Os três tipos são gravados em
+		.tmp e só então publicados, então uma queda no meio não deixa a partida pela metade.
+		"""
+		replaced = {str(fixture_id) for fixture_id in fixture_ids}
+		atomics: List[AtomicFile] = []
+		try:
+			for kind, fieldnames in FIXTURE_DETAIL_FIELDNAMES.items():
+				kept = [row for row in CSVWriter.read_fixture_details(kind, season, league) if row.get('fixture_id') not in replaced]
+				data_dir = os.path.join(DATA_DIR, 'sport/fixture_details', kind)
+				CSVWriter._ensure_directory(data_dir)
+				atomic = AtomicFile(os.path.join(data_dir, f'season_{season}_league_{league}.csv{CSVWriter.suffix()}'))
+				atomics.append(atomic)
+				writer = csv.DictWriter(atomic.file, fieldnames=fieldnames, restval='', extrasaction='ignore')
 				writer.writeheader()
-				for result in season_results:
-					writer.writerow({
-						'fixture_id': result.fixture_id,
-						'date': result.date,
-						'league_name': result.league_name,
-						'home_team_id': result.home_team.id,
-						'home_team_name': result.home_team.name,
-						'away_team_id': result.away_team.id,
-						'away_team_name': result.away_team.name,
-						'fulltime_home': result.fulltime_home,
-						'fulltime_away': result.fulltime_away,
-					})
+				writer.writerows(kept)
+				writer.writerows(details.get(kind, []))
+		except BaseException:
+			for atomic in atomics:
+				atomic.abort()
+			raise
+		for atomic in atomics:
+			atomic.commit()
+		for kind in FIXTURE_DETAIL_FIELDNAMES:
+			shutil.rmtree(CSVWriter._legacy_fixture_details_dir(kind, season, league), ignore_errors=True)
+
+	@staticmethod
+	def write_players(filename: str, players: List["PlayerSummary"]) -> None:
+		with CSVWriter.open_players(filename) as writer:
+			for player in players:
+				writer.write(player)
+
+	@staticmethod
+	def write_fixtures(results: List["FixtureResult"]) -> None:
+		with CSVWriter.open_fixtures() as writer:
+			for result in results:
+				writer.write(result)
@@ -105,10 +105,12 @@ resource "aws_glue_crawler" "sport_data" {
     }
   })
 
-  # Schema change policy
+  # Schema change policy: seasons e as tabelas de players são declaradas neste arquivo
+  # (schema + OpenCSVSerde); o crawler só roda como fallback do registro de partições e
+  # não pode reescrever schema/SerDe delas (LOG apenas registra a divergência)
   schema_change_policy {
     delete_behavior = "LOG"
-    update_behavior = "UPDATE_IN_DATABASE"
+    update_behavior = "LOG"
   }
 
   tags = {
@@ -134,6 +136,7 @@ resource "aws_glue_catalog_table" "transfers" {
 
   parameters = {
     "classification"         = "csv"
+    "compressionType"        = var.csv_compression
     "skip.header.line.count" = "1"
     "delimiter"              = ","
   }
@@ -208,6 +211,7 @@ resource "aws_glue_catalog_table" "balances" {
 
   parameters = {
     "classification"         = "csv"
+    "compressionType"        = var.csv_compression
     "skip.header.line.count" = "1"
     "delimiter"              = ","
   }
@@ -258,3 +262,410 @@ resource "aws_glue_catalog_table" "balances" {
 # As tabelas transfers e balances são criadas manualmente acima
 # O crawler estava criando tabelas para todas as subpastas dentro de /financial/
 # Agora usamos apenas tabelas manuais apontando para /financial/_data_treated/transfers/ e /balances/
+
+# Tabelas Parquet tipadas para dados esportivos
+# Escritas por ParquetWriter em sport/parquet/ com o mesmo layout season=/league= dos CSVs.
+# Usam partition projection: novas partições ficam consultáveis sem crawler.
+
+locals {
+  fixtures_parquet_columns = [
+    { name = "fixture_id", type = "int" },
+    { name = "date", type = "timestamp" },
+    { name = "league_name", type = "string" },
+    { name = "home_team_id", type = "int" },
+    { name = "home_team_name", type = "string" },
+    { name = "away_team_id", type = "int" },
+    { name = "away_team_name", type = "string" },
+    { name = "fulltime_home", type = "int" },
+    { name = "fulltime_away", type = "int" },
+    { name = "status", type = "string" },
+  ]
+
+  players_parquet_columns = [
+    { name = "category", type = "string" },
+    { name = "player_id", type = "int" },
+    { name = "player_name", type = "string" },
+    { name = "team_id", type = "int" },
+    { name = "team_name", type = "string" },
+    { name = "appearences", type = "int" },
+    { name = "minutes", type = "int" },
+    { name = "goals", type = "int" },
+    { name = "assists", type = "int" },
+    { name = "shots_total", type = "int" },
+  ]
+
+  players_parquet_tables = toset(["top_scorers", "top_assists", "squad_stats"])
+}
+
+resource "aws_glue_catalog_table" "fixtures_parquet" {
+  name          = "fixtures_parquet"
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification"            = "parquet"
+    "projection.enabled"        = "true"
+    "projection.season.type"    = "integer"
+    "projection.season.range"   = var.sport_season_range
+    "projection.league.type"    = "enum"
+    "projection.league.values"  = join(",", var.sport_leagues)
+    "storage.location.template" = "s3://${aws_s3_bucket.data_lake.bucket}/sport/parquet/seasons/season=$${season}/league=$${league}/"
+  }
+
+  partition_keys {
+    name = "season"
+    type = "int"
+  }
+  partition_keys {
+    name = "league"
+    type = "int"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/sport/parquet/seasons/"
+    input_format  = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat"
+
+    ser_de_info {
+      serialization_library = "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe"
+    }
+
+    dynamic "columns" {
+      for_each = local.fixtures_parquet_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
+
+resource "aws_glue_catalog_table" "players_parquet" {
+  for_each = local.players_parquet_tables
+
+  name          = "${each.key}_parquet"
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification"            = "parquet"
+    "projection.enabled"        = "true"
+    "projection.season.type"    = "integer"
+    "projection.season.range"   = var.sport_season_range
+    "projection.league.type"    = "enum"
+    "projection.league.values"  = join(",", var.sport_leagues)
+    "storage.location.template" = "s3://${aws_s3_bucket.data_lake.bucket}/sport/parquet/players/${each.key}/league=$${league}/season=$${season}/"
+  }
+
+  partition_keys {
+    name = "league"
+    type = "int"
+  }
+  partition_keys {
+    name = "season"
+    type = "int"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/sport/parquet/players/${each.key}/"
+    input_format  = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat"
+
+    ser_de_info {
+      serialization_library = "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe"
+    }
+
+    dynamic "columns" {
+      for_each = local.players_parquet_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
+
+# Tabelas CSV esportivas com schema explícito
+# As partições season=/league= são registradas pelo pipeline (GluePartitionRegistrar)
+# logo após o upload; o crawler sport_data fica apenas como fallback.
+
+locals {
+  # date fica como string: o CSV traz ISO 8601 com fuso, fora do formato timestamp do Hive
+  fixtures_csv_columns = [
+    for column in local.fixtures_parquet_columns :
+    column.name == "date" ? { name = "date", type = "string" } : column
+  ]
+}
+
+resource "aws_glue_catalog_table" "seasons" {
+  name          = "seasons"
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification"         = "csv"
+    "compressionType"        = var.csv_compression
+    "skip.header.line.count" = "1"
+    "delimiter"              = ","
+  }
+
+  partition_keys {
+    name = "season"
+    type = "int"
+  }
+  partition_keys {
+    name = "league"
+    type = "int"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/sport/seasons/"
+    input_format  = "org.apache.hadoop.mapred.TextInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat"
+
+    ser_de_info {
+      # OpenCSVSerde, como transfers/balances: o csv.DictWriter põe entre aspas os
+      # campos com vírgula, que o LazySimpleSerDe quebraria em duas colunas
+      serialization_library = "org.apache.hadoop.hive.serde2.OpenCSVSerde"
+      parameters = {
+        "separatorChar"          = ","
+        "quoteChar"              = "\""
+        "escapeChar"             = "\\"
+        "skip.header.line.count" = "1"
+      }
+    }
+
+    dynamic "columns" {
+      for_each = local.fixtures_csv_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
+
+# Detalhes por partida (FixtureDetailsService): um CSV por temporada-liga em
+# sport/fixture_details/fixture_<tipo>/season=/league=, partições registradas pelo pipeline
+locals {
+  fixture_detail_tables = {
+    fixture_statistics = [
+      { name = "fixture_id", type = "int" },
+      { name = "team_id", type = "int" },
+      { name = "team_name", type = "string" },
+      { name = "shots_on_goal", type = "int" },
+      { name = "shots_off_goal", type = "int" },
+      { name = "total_shots", type = "int" },
+      { name = "blocked_shots", type = "int" },
+      { name = "shots_insidebox", type = "int" },
+      { name = "shots_outsidebox", type = "int" },
+      { name = "fouls", type = "int" },
+      { name = "corner_kicks", type = "int" },
+      { name = "offsides", type = "int" },
+      { name = "ball_possession", type = "int" },
+      { name = "yellow_cards", type = "int" },
+      { name = "red_cards", type = "int" },
+      { name = "goalkeeper_saves", type = "int" },
+      { name = "total_passes", type = "int" },
+      { name = "passes_accurate", type = "int" },
+      { name = "passes_pct", type = "int" },
+      { name = "expected_goals", type = "double" },
+    ]
+    fixture_events = [
+      { name = "fixture_id", type = "int" },
+      { name = "elapsed", type = "int" },
+      { name = "extra", type = "int" },
+      { name = "team_id", type = "int" },
+      { name = "team_name", type = "string" },
+      { name = "player_id", type = "int" },
+      { name = "player_name", type = "string" },
+      { name = "assist_id", type = "int" },
+      { name = "assist_name", type = "string" },
+      { name = "type", type = "string" },
+      { name = "detail", type = "string" },
+      { name = "comments", type = "string" },
+    ]
+    fixture_lineups = [
+      { name = "fixture_id", type = "int" },
+      { name = "team_id", type = "int" },
+      { name = "team_name", type = "string" },
+      { name = "formation", type = "string" },
+      { name = "coach_id", type = "int" },
+      { name = "coach_name", type = "string" },
+      { name = "player_id", type = "int" },
+      { name = "player_name", type = "string" },
+      { name = "number", type = "int" },
+      { name = "position", type = "string" },
+      { name = "grid", type = "string" },
+      { name = "starter", type = "boolean" },
+    ]
+  }
+}
+
+resource "aws_glue_catalog_table" "fixture_details" {
+  for_each = local.fixture_detail_tables
+
+  name          = each.key
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification"         = "csv"
+    "compressionType"        = var.csv_compression
+    "skip.header.line.count" = "1"
+    "delimiter"              = ","
+  }
+
+  partition_keys {
+    name = "season"
+    type = "int"
+  }
+  partition_keys {
+    name = "league"
+    type = "int"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/sport/fixture_details/${each.key}/"
+    input_format  = "org.apache.hadoop.mapred.TextInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat"
+
+    ser_de_info {
+      # comments/detail/player_name podem ter vírgula (campo entre aspas no CSV)
+      serialization_library = "org.apache.hadoop.hive.serde2.OpenCSVSerde"
+      parameters = {
+        "separatorChar"          = ","
+        "quoteChar"              = "\""
+        "escapeChar"             = "\\"
+        "skip.header.line.count" = "1"
+      }
+    }
+
+    dynamic "columns" {
+      for_each = each.value
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
+
+resource "aws_glue_catalog_table" "players_csv" {
+  for_each = local.players_parquet_tables
+
+  name          = each.key
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification"         = "csv"
+    "compressionType"        = var.csv_compression
+    "skip.header.line.count" = "1"
+    "delimiter"              = ","
+  }
+
+  partition_keys {
+    name = "league"
+    type = "int"
+  }
+  partition_keys {
+    name = "season"
+    type = "int"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/sport/players/${each.key}/"
+    input_format  = "org.apache.hadoop.mapred.TextInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.HiveIgnoreKeyTextOutputFormat"
+
+    ser_de_info {
+      # OpenCSVSerde pelo mesmo motivo de seasons (campos entre aspas)
+      serialization_library = "org.apache.hadoop.hive.serde2.OpenCSVSerde"
+      parameters = {
+        "separatorChar"          = ","
+        "quoteChar"              = "\""
+        "escapeChar"             = "\\"
+        "skip.header.line.count" = "1"
+      }
+    }
+
+    dynamic "columns" {
+      for_each = local.players_parquet_columns
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
+
+# Tabelas financeiras tipadas (Parquet)
+# Escritas por FinancialNormalizer em financial/parquet/: os números em formato brasileiro
+# são convertidos uma vez na ingestão e as views do Athena viram projeções simples.
+# team_id (id da API-Football, resolvido pelo TeamIdentityIndex) permite juntar com
+# fixtures/top_* por inteiro, sem comparar nomes na consulta.
+
+locals {
+  financial_typed_tables = {
+    transfers = [
+      { name = "team", type = "string" },
+      { name = "player", type = "string" },
+      { name = "from", type = "string" },
+      { name = "to", type = "string" },
+      { name = "type", type = "string" },
+      { name = "date", type = "date" },
+      { name = "date_ano_mes", type = "string" },
+      { name = "fee_eur", type = "double" },
+      { name = "fee_brl", type = "double" },
+      { name = "ipca_rate", type = "double" },
+      { name = "real_value", type = "double" },
+      { name = "team_id", type = "int" },
+    ]
+    balances = [
+      { name = "time", type = "string" },
+      { name = "tipo", type = "string" },
+      { name = "classificacao", type = "string" },
+      { name = "ano_2022", type = "double" },
+      { name = "ano_2023", type = "double" },
+      { name = "ano_2024", type = "double" },
+      { name = "team_id", type = "int" },
+    ]
+  }
+}
+
+resource "aws_glue_catalog_table" "financial_typed" {
+  for_each = local.financial_typed_tables
+
+  name          = "${each.key}_typed"
+  database_name = aws_glue_catalog_database.data_catalog.name
+
+  table_type = "EXTERNAL_TABLE"
+
+  parameters = {
+    "classification" = "parquet"
+  }
+
+  storage_descriptor {
+    location      = "s3://${aws_s3_bucket.data_lake.bucket}/financial/parquet/${each.key}/"
+    input_format  = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat"
+    output_format = "org.apache.hadoop.hive.ql.io.parquet.MapredParquetOutputFormat"
+
+    ser_de_info {
+      serialization_library = "org.apache.hadoop.hive.ql.io.parquet.serde.ParquetHiveSerDe"
+    }
+
+    dynamic "columns" {
+      for_each = each.value
+      content {
+        name = columns.value.name
+        type = columns.value.type
+      }
+    }
+  }
+}
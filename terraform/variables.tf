@@ -60,3 +60,29 @@ variable "enable_vpc" {
   type        = bool
   default     = false
 }
+
+# Partition projection das tabelas Parquet esportivas
+variable "sport_leagues" {
+  description = "IDs de ligas da API-Football extraídas (mesmos de config/config.json)"
+  type        = list(string)
+  default     = ["71", "11", "13", "73"]
+}
+
+variable "sport_season_range" {
+  description = "Intervalo de seasons projetado nas tabelas Parquet (min,max)"
+  type        = string
+  default     = "2020,2030"
+}
+
+# Compressão dos CSVs enviados pelo pipeline (PIPELINE_CSV_COMPRESSION / --csv-compression)
+# O Athena descomprime pela extensão (.csv.gz, .csv.zst); o parâmetro documenta a tabela no catálogo
+variable "csv_compression" {
+  description = "Compressão dos CSVs do data lake: none, gzip ou zstd"
+  type        = string
+  default     = "none"
+
+  validation {
+    condition     = contains(["none", "gzip", "zstd"], var.csv_compression)
+    error_message = "csv_compression deve ser none, gzip ou zstd."
+  }
+}